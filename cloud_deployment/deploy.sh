@@ -206,6 +206,9 @@ deploy_functions() {
     print_step "Deploying extract-website-data function..."
     cd extract_website_data
     
+    # Ortak modülleri fonksiyon kaynağına kopyala
+    rm -rf common && cp -r ../../../scripts/common ./common
+    
     gcloud functions deploy extract-website-data \
         --gen2 \
         --runtime=python311 \
@@ -216,16 +219,33 @@ deploy_functions() {
         --timeout=540s \
         --memory=1GB \
         --service-account=$FUNCTION_SA \
-        --set-env-vars="GCP_PROJECT_ID=$PROJECT_ID,STORAGE_BUCKET_NAME=$BUCKET_NAME,PUBSUB_TOPIC=$PUBSUB_TOPIC" \
+        --set-env-vars="GCP_PROJECT_ID=$PROJECT_ID,STORAGE_BUCKET_NAME=$BUCKET_NAME,PUBSUB_TOPIC=$PUBSUB_TOPIC,CRAWL_SHARDS=${CRAWL_SHARDS:-1}" \
         --allow-unauthenticated
     
     EXTRACT_URL=$(gcloud functions describe extract-website-data --region=$REGION --format="value(serviceConfig.uri)")
+    
+    # Pub/Sub tetiklemeli kopya: parçalı taramanın iş öğelerini (crawl-shard / merge-shards) işler
+    gcloud functions deploy extract-website-data-worker \
+        --gen2 \
+        --runtime=python311 \
+        --region=$REGION \
+        --source=. \
+        --entry-point=extract_website_data_pubsub \
+        --trigger-topic=$PUBSUB_TOPIC \
+        --retry \
+        --timeout=540s \
+        --memory=1GB \
+        --service-account=$FUNCTION_SA \
+        --set-env-vars="GCP_PROJECT_ID=$PROJECT_ID,STORAGE_BUCKET_NAME=$BUCKET_NAME,PUBSUB_TOPIC=$PUBSUB_TOPIC,CRAWL_SHARDS=${CRAWL_SHARDS:-1}"
     cd ..
     
     # Deploy process batches function
     print_step "Deploying process-batches function..."
     cd process_batches
     
+    # Ortak modülleri fonksiyon kaynağına kopyala
+    rm -rf common && cp -r ../../../scripts/common ./common
+    
     gcloud functions deploy process-batches \
         --gen2 \
         --runtime=python311 \
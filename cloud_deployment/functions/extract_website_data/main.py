@@ -6,16 +6,33 @@ Web sitelerinden veri çıkarır ve Cloud Storage'a kaydeder.
 import json
 import logging
 import os
+import sys
 from datetime import datetime
-from typing import Dict, List
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 import functions_framework
+from google.api_core import exceptions as gcs_exceptions
 from google.cloud import storage
 from google.cloud import pubsub_v1
-import requests
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse
-import time
-import re
+
+# Ortak modüller: deploy.sh fonksiyon dizinine kopyalar, yerelde depodaki scripts/ kullanılır
+if not (Path(__file__).parent / 'common').exists():
+    sys.path.append(str(Path(__file__).resolve().parents[3] / 'scripts'))
+from common.crawl_pipeline import CrawlResult, crawl_and_extract
+from common.compression import CODEC_CONTENT_TYPES, codec_for_name, with_codec_suffix
+from common.http_client import CircuitBreaker, HttpClient, create_session
+from common.jsonl import JsonlWriter
+from common.page_parser import is_canonical_rel
+from common.priority_frontier import PriorityFrontier
+from common.rate_limiter import HostRateLimiter, parse_retry_after
+from common.response_gate import ResponseGate
+from common.text_stats import count_words
+from common.object_store import ObjectStore
+from common.robots import RobotsCache
+from common.sharded_crawl import STEP_CRAWL_SHARD, STEP_MERGE_SHARDS, ShardedCrawl, urls_within_time
+from common.url_filter import UrlFilter
 
 # Logging ayarla
 logging.basicConfig(level=logging.INFO)
@@ -25,132 +42,294 @@ logger = logging.getLogger(__name__)
 PROJECT_ID = os.environ.get('GCP_PROJECT_ID')
 BUCKET_NAME = os.environ.get('STORAGE_BUCKET_NAME')
 PUBSUB_TOPIC = os.environ.get('PUBSUB_TOPIC', 'ai-overview-pipeline')
+USER_AGENT = 'AI-Overview-Bot/1.0'
+
+# Rate limiting (host başına token bucket)
+RATE_LIMIT_REQUESTS = int(os.environ.get('RATE_LIMIT_REQUESTS', '100'))
+RATE_LIMIT_WINDOW = float(os.environ.get('RATE_LIMIT_WINDOW', '60'))
+RATE_LIMIT_BURST = int(os.environ.get('RATE_LIMIT_BURST', '10'))
+DEFAULT_RETRY_AFTER = 1.0  # 429/503 yanıtında Retry-After yoksa
+
+# HTTP client: pooled keep-alive connections, jittered exponential retry on 5xx/timeouts, per-host circuit breaker
+REQUEST_TIMEOUT = 30
+HTTP_POOL_CONNECTIONS = int(os.environ.get('HTTP_POOL_CONNECTIONS', '10'))
+HTTP_POOL_MAXSIZE = int(os.environ.get('HTTP_POOL_MAXSIZE', '10'))
+MAX_RETRIES = int(os.environ.get('MAX_RETRIES', '3'))
+RETRY_BACKOFF_FACTOR = float(os.environ.get('RETRY_BACKOFF_FACTOR', '0.5'))
+RETRY_BACKOFF_JITTER = float(os.environ.get('RETRY_BACKOFF_JITTER', '0.5'))
+RETRY_EXPONENTIAL_BACKOFF = os.environ.get('RETRY_EXPONENTIAL_BACKOFF', 'true').lower() == 'true'
+MAX_CONSECUTIVE_ERRORS = int(os.environ.get('MAX_CONSECUTIVE_ERRORS', '10'))
+ERROR_COOLDOWN_SECONDS = float(os.environ.get('ERROR_COOLDOWN_SECONDS', '60'))
+
+# Parse edilecek yanıtlar: bu türler dışındakiler ve boyut sınırını aşanlar okunmaz
+SUPPORTED_CONTENT_TYPES = ['text/html', 'application/xhtml+xml', 'text/plain']
+MAX_RESPONSE_BYTES = int(os.environ.get('MAX_RESPONSE_BYTES', str(5 * 1024 * 1024)))
+
+# Raw output: JSONL streamed to GCS as pages complete ('gzip' -> .jsonl.gz, 'zstd' -> .jsonl.zst, '' -> plain)
+RAW_DATA_COMPRESSION = os.environ.get('RAW_DATA_COMPRESSION', 'gzip')
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024  # Resumable upload chunk (multiple of 256 KiB)
+
+# Sharded crawl: >1 splits the frontier by URL hash, one Pub/Sub work item per shard and round
+CRAWL_SHARDS = int(os.environ.get('CRAWL_SHARDS', '1'))
+SHARD_MAX_URLS = int(os.environ.get('SHARD_MAX_URLS', '100'))  # Upper bound per work item (shard, round)
+FUNCTION_TIMEOUT_SECONDS = float(os.environ.get('FUNCTION_TIMEOUT_SECONDS', '540'))  # deploy.sh --timeout
+# Share of the timeout a work item may spend waiting on the per-shard rate limit; the rest
+# covers response time, retries, parsing and uploads
+SHARD_RATE_TIME_SHARE = 0.5
+STEP_EXTRACT = 'extract-website-data'
+
+# 'fifo' is plain BFS (default); opt-in 'priority' spends max_pages on the highest-value URLs first
+# (depth, in-links, URL patterns) but keeps the whole queue in memory
+FRONTIER_STRATEGY = os.environ.get('FRONTIER_STRATEGY', 'fifo')
+
+# config/settings.py EXCLUDE_PATTERNS ile aynı; modül yüklenirken bir kez derlenir
+EXCLUDE_PATTERNS = [
+    r'.*\.(pdf|doc|docx|xls|xlsx|ppt|pptx)$',
+    r'.*\.(jpg|jpeg|png|gif|svg|ico)$',
+    r'.*\.(zip|rar|tar|gz)$',
+    r'.*\.(mp3|mp4|avi|mov|wmv)$',
+    r'.*/admin/.*',
+    r'.*/wp-admin/.*',
+    r'.*/login.*',
+    r'.*/register.*',
+    r'.*\?.*print.*',
+    r'.*#.*',
+]
+URL_FILTER = UrlFilter(exclude_patterns=EXCLUDE_PATTERNS)
+
+class GcsObjectStore(ObjectStore):
+    """Cloud Storage bucket'ı üzerinde nesne deposu (parçalı tarama durumu)"""
+    
+    def __init__(self, bucket):
+        self.bucket = bucket
+    
+    def read(self, name: str) -> Optional[bytes]:
+        try:
+            return self.bucket.blob(name).download_as_bytes()
+        except gcs_exceptions.NotFound:
+            return None
+    
+    def write(self, name: str, data: bytes):
+        self.bucket.blob(name).upload_from_string(data)
+    
+    def create(self, name: str, data: bytes) -> bool:
+        # if_generation_match=0: nesne yoksa yazılır, varsa 412 (atomik)
+        try:
+            self.bucket.blob(name).upload_from_string(data, if_generation_match=0)
+            return True
+        except gcs_exceptions.PreconditionFailed:
+            return False
+    
+    def list(self, prefix: str) -> List[str]:
+        return sorted(blob.name for blob in self.bucket.list_blobs(prefix=prefix))
+    
+    def open_read(self, name: str):
+        return self.bucket.blob(name).open('rb')
+    
+    def open_write(self, name: str):
+        return self.bucket.blob(name).open('wb', chunk_size=UPLOAD_CHUNK_SIZE, ignore_flush=True)
+    
+    def delete_prefix(self, prefix: str):
+        for blob in self.bucket.list_blobs(prefix=prefix):
+            blob.delete()
 
 class CloudWebsiteDataExtractor:
     """Cloud-based website data extractor"""
     
-    def __init__(self):
+    def __init__(self, num_shards: int = 1):
         self.storage_client = storage.Client()
         self.bucket = self.storage_client.bucket(BUCKET_NAME)
+        # Parçalar aynı host'a paralel istek atar: host bütçesi parçalar arasında bölünür
+        num_shards = max(1, num_shards)
+        shard_requests = max(1, RATE_LIMIT_REQUESTS // num_shards)
+        shard_burst = max(1, RATE_LIMIT_BURST // num_shards)
+        self.rate_limiter = HostRateLimiter(shard_requests, RATE_LIMIT_WINDOW, shard_burst)
+        # Work item size: as many URLs as the per-shard rate allows within the function timeout
+        self.max_urls_per_shard = min(SHARD_MAX_URLS, urls_within_time(
+            shard_requests, RATE_LIMIT_WINDOW, FUNCTION_TIMEOUT_SECONDS * SHARD_RATE_TIME_SHARE, shard_burst))
+        session = create_session(
+            {'User-Agent': USER_AGENT},
+            pool_connections=HTTP_POOL_CONNECTIONS,
+            pool_maxsize=HTTP_POOL_MAXSIZE,
+            max_retries=MAX_RETRIES,
+            backoff_factor=RETRY_BACKOFF_FACTOR if RETRY_EXPONENTIAL_BACKOFF else 0,
+            backoff_jitter=RETRY_BACKOFF_JITTER
+        )
+        self.http = HttpClient(session, REQUEST_TIMEOUT,
+                               CircuitBreaker(MAX_CONSECUTIVE_ERRORS, ERROR_COOLDOWN_SECONDS))
+        self.robots = RobotsCache(self._fetch_text, USER_AGENT)
+        self._robots_checked_hosts = set()
+        self.response_gate = ResponseGate(SUPPORTED_CONTENT_TYPES, MAX_RESPONSE_BYTES)
         
+    def _fetch_text(self, url: str) -> Optional[str]:
+        """robots.txt gibi küçük metin kaynaklarını indir"""
+        response = self.http.get(url)
+        return response.text if response.status_code == 200 else None
+    
+    def _throttle(self, url: str):
+        """Host bütçesi tükendiyse bekle; ilk istekte robots.txt Crawl-delay'i uygula"""
+        host = urlparse(url).netloc
+        if host not in self._robots_checked_hosts:
+            self._robots_checked_hosts.add(host)
+            self.rate_limiter.set_crawl_delay(host, self.robots.crawl_delay(url))
+        self.rate_limiter.wait(host)
+    
+    def _handle_throttling_response(self, url: str, response):
+        """429/503 yanıtlarında Retry-After süresince host'u beklet"""
+        if response.status_code in (429, 503):
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            self.rate_limiter.penalize(urlparse(url).netloc, retry_after or DEFAULT_RETRY_AFTER)
+    
     def discover_urls(self, base_url: str, max_pages: int = 100) -> List[str]:
         """URL'leri keşfet"""
-        discovered_urls = set()
-        to_crawl = [base_url]
-        crawled = set()
+        urls, _ = self.crawl_site(base_url, max_pages)
+        return urls
+    
+    def crawl_site(self, base_url: str, max_pages: int = 100) -> Tuple[List[str], List[Dict]]:
+        """URL keşfi ve içerik çıkarma tek geçişte: her sayfa bir kez indirilir ve parse edilir"""
+        discovered_urls = []
+        extracted_data = []
+        for result in self.iter_site(base_url, max_pages):
+            discovered_urls.append(result.url)
+            if result.record:
+                extracted_data.append(result.record)
         
-        headers = {
-            'User-Agent': 'AI-Overview-Bot/1.0'
-        }
+        return discovered_urls, extracted_data
+    
+    def iter_site(self, base_url: str, max_pages: int = 100) -> Iterator[CrawlResult]:
+        """Siteyi tara; her sayfanın sonucunu tamamlandığı anda üret"""
+        base_netloc = urlparse(base_url).netloc
         
-        while to_crawl and len(discovered_urls) < max_pages:
-            current_url = to_crawl.pop(0)
-            
-            if current_url in crawled:
-                continue
-                
-            try:
-                logger.info(f"Crawling: {current_url}")
-                response = requests.get(current_url, headers=headers, timeout=30)
-                
-                if response.status_code == 200:
-                    soup = BeautifulSoup(response.content, 'html.parser')
-                    
-                    # Bu sayfayı ekle
-                    discovered_urls.add(current_url)
-                    crawled.add(current_url)
-                    
-                    # Link'leri bul
-                    for link in soup.find_all('a', href=True):
-                        href = link['href']
-                        full_url = urljoin(current_url, href)
-                        
-                        # Aynı domain kontrolü
-                        if urlparse(full_url).netloc == urlparse(base_url).netloc:
-                            # Exclusion patterns kontrolü
-                            if not self._should_exclude_url(full_url):
-                                if full_url not in discovered_urls and full_url not in crawled:
-                                    to_crawl.append(full_url)
-                
-                time.sleep(1)  # Rate limiting
+        def link_filter(url: str) -> bool:
+            return urlparse(url).netloc == base_netloc and not self._should_exclude_url(url)
+        
+        frontier = PriorityFrontier() if FRONTIER_STRATEGY == 'priority' else None
+        return crawl_and_extract(base_url, max_pages, self._fetch_page, self._parse_page, link_filter,
+                                 frontier=frontier)
+    
+    def extract_site_to_storage(self, base_url: str, max_pages: int, filename: str) -> Dict:
+        """Siteyi tara ve kayıtları tamamlandıkça Cloud Storage'a akıt; bellek kullanımı sabit kalır"""
+        stats = {'urls_discovered': 0}
+        
+        def records() -> Iterator[Dict]:
+            for result in self.iter_site(base_url, max_pages):
+                stats['urls_discovered'] += 1
+                if result.record:
+                    yield result.record
+        
+        stats['storage_path'], stats['pages_processed'] = self.save_to_cloud_storage(records(), filename)
+        stats['responses_skipped'] = self.response_gate.stats
+        logger.info(f"Discovered {stats['urls_discovered']} URLs, extracted content from "
+                    f"{stats['pages_processed']} pages (skipped responses: {stats['responses_skipped']})")
+        return stats
+    
+    def sharded_crawl(self, publish) -> ShardedCrawl:
+        """Durumu bu bucket'ta tutan parçalı tarama; publish(mesaj) iş öğelerini yayınlar"""
+        return ShardedCrawl(GcsObjectStore(self.bucket), publish, self._fetch_page, self._parse_page,
+                            link_filter=lambda url: not self._should_exclude_url(url),
+                            max_urls_per_shard=self.max_urls_per_shard)
+    
+    def start_sharded_extraction(self, base_url: str, max_pages: int, num_shards: int, filename: str) -> Dict:
+        """Parçalı taramayı başlatır; kayıtlar birleştirme adımında raw_data/<filename>'e yazılır"""
+        crawl_id = self.sharded_crawl(publish_step).start(base_url, max_pages, num_shards, f"raw_data/{filename}",
+                               crawl_id=filename.split('.')[0])
+        logger.info(f"Sharded crawl {crawl_id} started with {num_shards} shards")
+        return {'crawl_id': crawl_id, 'shards': num_shards, 'storage_path': f"gs://{BUCKET_NAME}/raw_data/{filename}"}
+    
+    def _fetch_page(self, url: str) -> Optional[bytes]:
+        """Sayfayı indir; 200 dışındaki yanıtlarda None döndür"""
+        try:
+            self._throttle(url)
+            logger.info(f"Crawling: {url}")
+            with self.http.get(url, stream=True) as response:
+                self._handle_throttling_response(url, response)
                 
-            except Exception as e:
-                logger.warning(f"Error crawling {current_url}: {str(e)}")
-                continue
+                if response.status_code != 200:
+                    return None
+                return self.response_gate.read_requests_response(url, response)
+            
+        except Exception as e:
+            logger.warning(f"Error crawling {url}: {str(e)}")
+            return None
+    
+    def _parse_page(self, url: str, html: bytes) -> Tuple[Optional[Dict], List[str]]:
+        """HTML'i bir kez parse et; kaydı ve sayfadaki bağlantıları döndür"""
+        soup = BeautifulSoup(html, 'html.parser')
+        
+        # Bağlantılar, içerik temizliği etiketleri silmeden önce toplanır
+        links = [urljoin(url, link['href']) for link in soup.find_all('a', href=True)]
+        
+        return self._extract_record(url, soup), links
+    
+    def _extract_record(self, url: str, soup: BeautifulSoup) -> Optional[Dict]:
+        """Parse edilmiş sayfadan kayıt oluştur; içerik çok kısaysa None"""
+        # Title
+        title_tag = soup.find('title')
+        title = title_tag.get_text().strip() if title_tag else ""
+        
+        # Meta description
+        meta_desc = soup.find('meta', attrs={'name': 'description'})
+        description = meta_desc.get('content', '') if meta_desc else ""
         
-        return list(discovered_urls)
+        # <link rel="canonical">: crawl_and_extract kopya sayfaları bununla eler
+        canonical_url = None
+        for link in soup.find_all('link', rel=True, href=True):
+            if is_canonical_rel(link['rel']):
+                canonical_url = urljoin(url, link['href'])
+                break
+        
+        # Main content
+        # Remove script, style, nav, footer
+        for tag in soup(['script', 'style', 'nav', 'footer', 'header']):
+            tag.decompose()
+        
+        # Get text content
+        content = soup.get_text()
+        
+        # Clean content
+        lines = (line.strip() for line in content.splitlines())
+        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+        content = ' '.join(chunk for chunk in chunks if chunk)[:10000]  # Max 10k characters
+        
+        # Word count kontrolü (on the stored text, so word_count matches content)
+        word_count = count_words(content)
+        if word_count < 10:  # Minimum word count
+            return None
+        
+        return {
+            'url': url,
+            'canonical_url': canonical_url,
+            'title': title,
+            'description': description,
+            'content': content,
+            'word_count': word_count,
+            'extracted_at': datetime.now().isoformat(),
+            'content_type': 'text/html'
+        }
     
     def _should_exclude_url(self, url: str) -> bool:
         """URL'yi exclude etmeli mi?"""
-        exclude_patterns = [
-            r'.*\.(pdf|doc|docx|xls|xlsx|ppt|pptx)$',
-            r'.*\.(jpg|jpeg|png|gif|svg|ico)$',
-            r'.*\.(zip|rar|tar|gz)$',
-            r'.*\.(mp3|mp4|avi|mov|wmv)$',
-            r'.*/admin/.*',
-            r'.*/wp-admin/.*',
-            r'.*/login.*',
-            r'.*/register.*',
-            r'.*\?.*print.*',
-            r'.*#.*',
-        ]
-        
-        for pattern in exclude_patterns:
-            if re.match(pattern, url, re.IGNORECASE):
-                return True
-        return False
+        return URL_FILTER.excludes(url)
     
     def extract_content_from_urls(self, urls: List[str]) -> List[Dict]:
         """URL'lerden içerik çıkar"""
         extracted_data = []
         
-        headers = {
-            'User-Agent': 'AI-Overview-Bot/1.0'
-        }
-        
         for url in urls:
             try:
+                self._throttle(url)
                 logger.info(f"Extracting content from: {url}")
-                response = requests.get(url, headers=headers, timeout=30)
-                
-                if response.status_code == 200:
-                    soup = BeautifulSoup(response.content, 'html.parser')
-                    
-                    # Title
-                    title_tag = soup.find('title')
-                    title = title_tag.get_text().strip() if title_tag else ""
-                    
-                    # Meta description
-                    meta_desc = soup.find('meta', attrs={'name': 'description'})
-                    description = meta_desc.get('content', '') if meta_desc else ""
-                    
-                    # Main content
-                    # Remove script, style, nav, footer
-                    for tag in soup(['script', 'style', 'nav', 'footer', 'header']):
-                        tag.decompose()
-                    
-                    # Get text content
-                    content = soup.get_text()
-                    
-                    # Clean content
-                    lines = (line.strip() for line in content.splitlines())
-                    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-                    content = ' '.join(chunk for chunk in chunks if chunk)
-                    
-                    # Word count kontrolü
-                    word_count = len(content.split())
-                    if word_count >= 10:  # Minimum word count
-                        extracted_data.append({
-                            'url': url,
-                            'title': title,
-                            'description': description,
-                            'content': content[:10000],  # Max 10k characters
-                            'word_count': word_count,
-                            'extracted_at': datetime.now().isoformat(),
-                            'content_type': 'text/html'
-                        })
+                with self.http.get(url, stream=True) as response:
+                    self._handle_throttling_response(url, response)
+                    content = None
+                    if response.status_code == 200:
+                        content = self.response_gate.read_requests_response(url, response)
                 
-                time.sleep(1)  # Rate limiting
+                if content is not None:
+                    soup = BeautifulSoup(content, 'html.parser')
+                    record = self._extract_record(url, soup)
+                    if record:
+                        extracted_data.append(record)
                 
             except Exception as e:
                 logger.warning(f"Error extracting content from {url}: {str(e)}")
@@ -158,22 +337,41 @@ class CloudWebsiteDataExtractor:
         
         return extracted_data
     
-    def save_to_cloud_storage(self, data: List[Dict], filename: str) -> str:
-        """Cloud Storage'a kaydet"""
+    def save_to_cloud_storage(self, data: Iterable[Dict], filename: str) -> Tuple[str, int]:
+        """Kayıtları JSONL olarak Cloud Storage'a akış halinde yaz; (yol, kayıt sayısı) döndür"""
         try:
             blob_name = f"raw_data/{filename}"
             blob = self.bucket.blob(blob_name)
+            codec = codec_for_name(filename)  # Sıkıştırma dosya sonekinden seçilir
             
-            json_data = json.dumps(data, ensure_ascii=False, indent=2)
-            blob.upload_from_string(json_data, content_type='application/json')
+            # Resumable upload: yalnızca bir chunk bellekte tutulur
+            stream = blob.open('wb', chunk_size=UPLOAD_CHUNK_SIZE, ignore_flush=True,
+                               content_type=CODEC_CONTENT_TYPES.get(codec, 'application/jsonl'))
+            with JsonlWriter(stream, codec) as writer:
+                writer.write_all(data)
             
-            logger.info(f"Data saved to gs://{BUCKET_NAME}/{blob_name}")
-            return f"gs://{BUCKET_NAME}/{blob_name}"
+            logger.info(f"Data saved to gs://{BUCKET_NAME}/{blob_name} ({writer.count} records)")
+            return f"gs://{BUCKET_NAME}/{blob_name}", writer.count
             
         except Exception as e:
             logger.error(f"Error saving to Cloud Storage: {str(e)}")
             raise
 
+_publisher = None
+
+def publish_step(message: Dict):
+    """Publish a pipeline message; 'step' is also set as an attribute for subscription filters"""
+    global _publisher
+    if _publisher is None:
+        _publisher = pubsub_v1.PublisherClient()
+    topic_path = _publisher.topic_path(PROJECT_ID, PUBSUB_TOPIC)
+    _publisher.publish(topic_path, json.dumps(message).encode('utf-8'), step=message['step'])
+
+def raw_data_filename() -> str:
+    """Zaman damgalı ham veri dosya adı (RAW_DATA_COMPRESSION'a göre .jsonl.gz / .jsonl.zst)"""
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    return with_codec_suffix(f"website_data_{timestamp}.jsonl", RAW_DATA_COMPRESSION)
+
 @functions_framework.http
 def extract_website_data(request):
     """HTTP Cloud Function entry point"""
@@ -203,6 +401,7 @@ def extract_website_data(request):
         
         url = request_json.get('url')
         max_pages = request_json.get('max_pages', 100)
+        shards = int(request_json.get('shards', CRAWL_SHARDS))
         
         if not url:
             return json.dumps({
@@ -212,46 +411,39 @@ def extract_website_data(request):
         logger.info(f"Starting extraction for URL: {url}")
         
         # Extractor'ı başlat
-        extractor = CloudWebsiteDataExtractor()
+        extractor = CloudWebsiteDataExtractor(shards)
+        filename = raw_data_filename()
         
-        # URL'leri keşfet
-        urls = extractor.discover_urls(url, max_pages)
-        logger.info(f"Discovered {len(urls)} URLs")
-        
-        # İçerik çıkar
-        data = extractor.extract_content_from_urls(urls)
-        logger.info(f"Extracted content from {len(data)} pages")
+        if shards > 1:
+            # Parçalı tarama: iş öğeleri Pub/Sub'a gider, birleştirme adımı process-batches'i tetikler
+            stats = extractor.start_sharded_extraction(url, max_pages, shards, filename)
+            return json.dumps({
+                'status': 'accepted',
+                'message': 'Sharded website data extraction started',
+                'stats': stats,
+                'next_step': STEP_MERGE_SHARDS,
+                'data_file': filename
+            }), 202, headers
         
-        # Cloud Storage'a kaydet
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f"website_data_{timestamp}.json"
-        storage_path = extractor.save_to_cloud_storage(data, filename)
+        # URL keşfi ve içerik çıkarma (tek geçiş), kayıtlar Cloud Storage'a akar
+        stats = extractor.extract_site_to_storage(url, max_pages, filename)
         
         # Sonuç
         result = {
             'status': 'success',
             'message': 'Website data extraction completed',
-            'stats': {
-                'urls_discovered': len(urls),
-                'pages_processed': len(data),
-                'storage_path': storage_path
-            },
+            'stats': stats,
             'next_step': 'process-batches',
             'data_file': filename
         }
         
         # PubSub'a mesaj gönder (sonraki step için)
         try:
-            publisher = pubsub_v1.PublisherClient()
-            topic_path = publisher.topic_path(PROJECT_ID, PUBSUB_TOPIC)
-            
-            message_data = {
+            publish_step({
                 'step': 'process-batches',
                 'data_file': filename,
                 'url': url
-            }
-            
-            publisher.publish(topic_path, json.dumps(message_data).encode('utf-8'))
+            })
             logger.info("Message sent to PubSub for next step")
             
         except Exception as e:
@@ -274,8 +466,18 @@ def extract_website_data_pubsub(cloud_event):
     message_data = base64.b64decode(cloud_event.data["message"]["data"]).decode('utf-8')
     message_json = json.loads(message_data)
     
+    # The topic carries every pipeline step; only extraction and shard steps are handled here
+    step = message_json.get('step', STEP_EXTRACT)
+    if step in (STEP_CRAWL_SHARD, STEP_MERGE_SHARDS):
+        handle_shard_message(message_json)
+        return
+    if step != STEP_EXTRACT:
+        logger.info(f"Ignoring message for step: {step}")
+        return
+    
     url = message_json.get('url')
     max_pages = message_json.get('max_pages', 100)
+    shards = int(message_json.get('shards', CRAWL_SHARDS))
     
     if not url:
         logger.error("URL not provided in PubSub message")
@@ -284,28 +486,50 @@ def extract_website_data_pubsub(cloud_event):
     logger.info(f"Starting PubSub-triggered extraction for URL: {url}")
     
     try:
-        extractor = CloudWebsiteDataExtractor()
-        urls = extractor.discover_urls(url, max_pages)
-        data = extractor.extract_content_from_urls(urls)
+        extractor = CloudWebsiteDataExtractor(shards)
+        filename = raw_data_filename()
         
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f"website_data_{timestamp}.json"
-        storage_path = extractor.save_to_cloud_storage(data, filename)
+        if shards > 1:
+            extractor.start_sharded_extraction(url, max_pages, shards, filename)
+            return
         
-        logger.info(f"PubSub extraction completed: {storage_path}")
+        stats = extractor.extract_site_to_storage(url, max_pages, filename)
         
-        # Trigger next step
-        publisher = pubsub_v1.PublisherClient()
-        topic_path = publisher.topic_path(PROJECT_ID, PUBSUB_TOPIC)
+        logger.info(f"PubSub extraction completed: {stats['storage_path']}")
         
-        next_message = {
+        # Trigger next step
+        publish_step({
             'step': 'process-batches',
             'data_file': filename,
             'url': url
-        }
-        
-        publisher.publish(topic_path, json.dumps(next_message).encode('utf-8'))
+        })
         
     except Exception as e:
         logger.error(f"PubSub function error: {str(e)}")
-        raise 
\ No newline at end of file
+        raise
+
+def handle_shard_message(message: Dict):
+    """Process one shard work item, or merge the shard outputs and trigger batch processing"""
+    try:
+        crawl = CloudWebsiteDataExtractor(message.get('shards', CRAWL_SHARDS)).sharded_crawl(publish_step)
+        summary = crawl.handle(message)
+        if summary is None:
+            return
+        
+        data_file = summary['output'][len('raw_data/'):]
+        logger.info(f"Sharded crawl {summary['crawl_id']} merged into gs://{BUCKET_NAME}/{summary['output']} "
+                    f"({summary['pages_processed']} records)")
+        publish_step({
+            'step': 'process-batches',
+            'data_file': data_file,
+            'url': summary['start_url']
+        })
+        crawl.cleanup(summary['crawl_id'])
+        
+    except FileNotFoundError as e:
+        # Redelivered message of a crawl that was already merged and cleaned up
+        logger.warning(f"Ignoring shard message: {str(e)}")
+    except Exception as e:
+        # Raising makes Pub/Sub redeliver; shard results are idempotent per (round, shard)
+        logger.error(f"Shard step error: {str(e)}")
+        raise
@@ -1,17 +1,28 @@
 """
 Cloud Function: Process Batches
-Ham verileri 50'şer URL'lik batch'lere böler ve Cloud Storage'a kaydeder.
+Ham verileri en fazla 50 URL'lik, boyutu sınırlı batch'lere böler ve Cloud Storage'a kaydeder.
 """
 
 import json
 import logging
 import os
+import sys
 from datetime import datetime
-from typing import Dict, List
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List
 import functions_framework
 from google.cloud import storage
 from google.cloud import pubsub_v1
-from math import ceil
+
+# Ortak modüller: deploy.sh fonksiyon dizinine kopyalar, yerelde depodaki scripts/ kullanılır
+if not (Path(__file__).parent / 'common').exists():
+    sys.path.append(str(Path(__file__).resolve().parents[3] / 'scripts'))
+from common.batch_planner import BatchPlanner
+from common.compression import GZIP
+from common.content_manifest import document_id
+from common.jsonl import JsonlWriter, iter_records
+from common.near_duplicates import NearDuplicateIndex
+from common.text_stats import analyze_text
 
 # Logging ayarla
 logging.basicConfig(level=logging.INFO)
@@ -22,6 +33,20 @@ PROJECT_ID = os.environ.get('GCP_PROJECT_ID')
 BUCKET_NAME = os.environ.get('STORAGE_BUCKET_NAME')
 PUBSUB_TOPIC = os.environ.get('PUBSUB_TOPIC', 'ai-overview-pipeline')
 BATCH_SIZE = int(os.environ.get('BATCH_SIZE', '50'))
+# Batches are also capped by uncompressed JSONL size and balanced within a window of batches
+BATCH_MAX_BYTES = int(os.environ.get('BATCH_MAX_BYTES', str(8 * 1024 * 1024)))
+BATCH_PLANNER_WINDOW = int(os.environ.get('BATCH_PLANNER_WINDOW', '8'))
+# Batches are stored gzip'd with Content-Encoding: gzip; GCS serves them decompressed to the Vertex AI import
+VERTEX_UPLOAD_GZIP = os.environ.get('VERTEX_UPLOAD_GZIP', 'true').lower() == 'true'
+
+# Near-duplicate detection (MinHash + LSH): 'drop' removes, 'cluster' keeps and marks duplicate_of
+NEAR_DUPLICATE_DETECTION = os.environ.get('NEAR_DUPLICATE_DETECTION', 'true').lower() == 'true'
+NEAR_DUPLICATE_ACTION = os.environ.get('NEAR_DUPLICATE_ACTION', 'drop')
+NEAR_DUPLICATE_THRESHOLD = float(os.environ.get('NEAR_DUPLICATE_THRESHOLD', '0.8'))
+
+# Content limits (same defaults as CONTENT_OPTIMIZATION_RULES in config/settings.py)
+MIN_WORD_COUNT = int(os.environ.get('MIN_WORD_COUNT', '10'))
+MAX_WORD_COUNT = int(os.environ.get('MAX_WORD_COUNT', '10000'))
 
 class CloudBatchProcessor:
     """Cloud-based batch processor"""
@@ -32,6 +57,12 @@ class CloudBatchProcessor:
         
     def load_raw_data(self, raw_data_file: str) -> List[Dict]:
         """Cloud Storage'dan ham veriyi yükle"""
+        data = list(self.iter_raw_data(raw_data_file))
+        logger.info(f"Loaded {len(data)} records from raw_data/{raw_data_file}")
+        return data
+    
+    def iter_raw_data(self, raw_data_file: str) -> Iterator[Dict]:
+        """Cloud Storage'dan ham veriyi kayıt kayıt oku (tamamı belleğe alınmaz)"""
         try:
             blob_name = f"raw_data/{raw_data_file}"
             blob = self.bucket.blob(blob_name)
@@ -39,11 +70,9 @@ class CloudBatchProcessor:
             if not blob.exists():
                 raise FileNotFoundError(f"Raw data file not found: {blob_name}")
             
-            json_data = blob.download_as_text()
-            data = json.loads(json_data)
-            
-            logger.info(f"Loaded {len(data)} records from {blob_name}")
-            return data
+            # JSONL (.jsonl / .jsonl.gz) is read line by line; legacy JSON arrays item by item
+            with blob.open('rb') as stream:
+                yield from iter_records(stream)
             
         except Exception as e:
             logger.error(f"Error loading raw data: {str(e)}")
@@ -51,28 +80,36 @@ class CloudBatchProcessor:
     
     def validate_data(self, data: List[Dict]) -> List[Dict]:
         """Veri validasyonu ve temizleme"""
-        valid_data = []
+        return list(self.iter_valid_records(data))
+    
+    def iter_valid_records(self, records: Iterable[Dict]) -> Iterator[Dict]:
+        """Kayıtları akış halinde doğrula ve temizle; self.stats'a sayıları yaz"""
+        self.stats = {'input_records': 0, 'valid_records': 0}
+        near_duplicates = NearDuplicateIndex(NEAR_DUPLICATE_THRESHOLD) if NEAR_DUPLICATE_DETECTION else None
         
-        for item in data:
+        for item in records:
+            self.stats['input_records'] += 1
+            
             # Gerekli alanları kontrol et
             if not all(key in item for key in ['url', 'title', 'content']):
                 logger.warning(f"Skipping invalid item: missing required fields")
                 continue
             
-            # Content uzunluğu kontrolü
-            content = item.get('content', '')
-            word_count = len(content.split())
+            # Content uzunluğu kontrolü (single pass: word count, truncation point, description excerpt)
+            stats = analyze_text(item['content'], MAX_WORD_COUNT, excerpt_chars=160)
             
-            if word_count < 10:  # Minimum word count
-                logger.warning(f"Skipping {item['url']}: content too short ({word_count} words)")
+            if stats.word_count < MIN_WORD_COUNT:
+                logger.warning(f"Skipping {item['url']}: content too short ({stats.word_count} words)")
                 continue
                 
-            if word_count > 10000:  # Maximum word count
-                # Truncate content
-                words = content.split()[:10000]
-                item['content'] = ' '.join(words)
+            if stats.truncated:
+                item['content'] = stats.apply(item['content'])
                 item['truncated'] = True
                 logger.info(f"Truncated content for {item['url']}")
+            # Recomputed here; word_count in the raw data may predate truncation
+            item['word_count'] = stats.kept_word_count
+            if not item.get('description'):
+                item['description'] = stats.excerpt
             
             # URL validation
             url = item.get('url', '')
@@ -80,72 +117,77 @@ class CloudBatchProcessor:
                 logger.warning(f"Skipping invalid URL: {url}")
                 continue
             
-            valid_data.append(item)
+            # Near-duplicate check (pagination, print views, tag pages)
+            if near_duplicates:
+                duplicate_of = near_duplicates.check(item['content'], url)
+                if duplicate_of:
+                    if NEAR_DUPLICATE_ACTION == 'drop':
+                        logger.info(f"Skipping near-duplicate {url} (similar to {duplicate_of})")
+                        continue
+                    item['duplicate_of'] = duplicate_of
+            
+            self.stats['valid_records'] += 1
+            yield item
         
-        logger.info(f"Validated {len(valid_data)} out of {len(data)} records")
-        return valid_data
+        if near_duplicates:
+            logger.info(f"Near-duplicate stats: {near_duplicates.stats}")
+        logger.info(f"Validated {self.stats['valid_records']} out of {self.stats['input_records']} records")
     
-    def create_batches(self, data: List[Dict]) -> List[str]:
-        """Verileri batch'lere böl ve Cloud Storage'a kaydet"""
-        
-        if not data:
-            logger.warning("No data to process")
-            return []
-        
-        # Validate data first
-        valid_data = self.validate_data(data)
-        
-        if not valid_data:
-            logger.warning("No valid data after validation")
-            return []
+    def to_vertex_documents(self, records: Iterable[Dict]) -> Iterator[Dict]:
+        """Doğrulanmış kayıtları Vertex AI dokümanlarına çevir"""
+        for item in self.iter_valid_records(records):
+            yield {
+                # Stable id derived from the URL: re-imports update the same document
+                "id": document_id(item['url']),
+                "structData": {
+                    "url": item['url'],
+                    "title": item['title'],
+                    "content": item['content'],
+                    "description": item.get('description', ''),
+                    "word_count": item['word_count'],
+                    "extracted_at": item.get('extracted_at', datetime.now().isoformat())
+                },
+                "content": {
+                    "mimeType": "text/plain",
+                    "uri": item['url']
+                }
+            }
+    
+    def create_batches(self, data: Iterable[Dict]) -> List[str]:
+        """Verileri batch'lere böl ve Cloud Storage'a kaydet
         
-        # Calculate number of batches
-        num_batches = ceil(len(valid_data) / BATCH_SIZE)
+        Kayıtlar akış halinde doğrulanır; BatchPlanner her pencereyi BATCH_SIZE
+        ve BATCH_MAX_BYTES sınırlarına göre boyutları dengelenmiş batch'lere
+        böler, bellekte en fazla bir pencere tutulur.
+        """
+        planner = BatchPlanner(BATCH_SIZE, BATCH_MAX_BYTES, BATCH_PLANNER_WINDOW)
         batch_files = []
         
-        logger.info(f"Creating {num_batches} batches from {len(valid_data)} records")
-        
-        for batch_idx in range(num_batches):
-            start_idx = batch_idx * BATCH_SIZE
-            end_idx = min(start_idx + BATCH_SIZE, len(valid_data))
-            
-            batch_data = valid_data[start_idx:end_idx]
-            
+        for batch_data in planner.plan(self.to_vertex_documents(data)):
             # Create batch file
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            batch_filename = f"batch_{batch_idx + 1:03d}_{timestamp}.json"
-            
-            # Prepare batch content for Vertex AI
-            vertex_ai_batch = []
-            for item in batch_data:
-                vertex_ai_item = {
-                    "id": f"doc_{start_idx + i}",
-                    "structData": {
-                        "url": item['url'],
-                        "title": item['title'],
-                        "content": item['content'],
-                        "description": item.get('description', ''),
-                        "word_count": item.get('word_count', len(item['content'].split())),
-                        "extracted_at": item.get('extracted_at', datetime.now().isoformat())
-                    },
-                    "content": {
-                        "mimeType": "text/plain",
-                        "uri": item['url']
-                    }
-                }
-                vertex_ai_batch.append(vertex_ai_item)
+            batch_filename = f"batch_{len(batch_files) + 1:03d}_{timestamp}.jsonl"
             
             # Save to Cloud Storage
-            batch_path = self.save_batch_to_storage(vertex_ai_batch, batch_filename)
+            batch_path = self.save_batch_to_storage(batch_data, batch_filename)
             batch_files.append(batch_path)
             
-            logger.info(f"Created batch {batch_idx + 1}/{num_batches}: {batch_filename} ({len(batch_data)} items)")
+            logger.info(f"Created batch {len(batch_files)}: {batch_filename} ({len(batch_data)} items)")
+        
+        if not batch_files:
+            logger.warning("No valid data after validation")
+            return []
+        
+        logger.info(f"Batch plan: {planner.stats}")
         
         # Save batch metadata
         metadata = {
-            'total_batches': num_batches,
-            'total_items': len(valid_data),
+            'total_batches': len(batch_files),
+            'total_items': planner.stats['records'],
             'batch_size': BATCH_SIZE,
+            'batch_max_bytes': BATCH_MAX_BYTES,
+            'largest_batch_bytes': planner.stats['largest_batch_bytes'],
+            'smallest_batch_bytes': planner.stats['smallest_batch_bytes'],
             'created_at': datetime.now().isoformat(),
             'batch_files': batch_files
         }
@@ -161,9 +203,11 @@ class CloudBatchProcessor:
             blob_name = f"batches/{filename}"
             blob = self.bucket.blob(blob_name)
             
-            # Convert to JSONL format for Vertex AI
-            jsonl_content = '\n'.join(json.dumps(item, ensure_ascii=False) for item in batch_data)
-            blob.upload_from_string(jsonl_content, content_type='application/jsonl')
+            # JSONL for Vertex AI; stored compressed, read back as plain JSONL
+            blob.content_encoding = GZIP if VERTEX_UPLOAD_GZIP else None
+            stream = blob.open('wb', ignore_flush=True, content_type='application/jsonl')
+            with JsonlWriter(stream, GZIP if VERTEX_UPLOAD_GZIP else None) as writer:
+                writer.write_all(batch_data)
             
             storage_path = f"gs://{BUCKET_NAME}/{blob_name}"
             logger.info(f"Batch saved to {storage_path}")
@@ -227,18 +271,16 @@ def process_batches(request):
         # Processor'ı başlat
         processor = CloudBatchProcessor()
         
-        # Ham verileri yükle
-        raw_data = processor.load_raw_data(data_file)
-        
-        # Batch'lere böl
-        batch_files = processor.create_batches(raw_data)
+        # Ham verileri akış halinde oku ve batch'lere böl
+        batch_files = processor.create_batches(processor.iter_raw_data(data_file))
         
         # Sonuç
         result = {
             'status': 'success',
             'message': 'Batch processing completed',
             'stats': {
-                'input_records': len(raw_data),
+                'input_records': processor.stats['input_records'],
+                'valid_records': processor.stats['valid_records'],
                 'batches_created': len(batch_files),
                 'batch_size': BATCH_SIZE
             },
@@ -290,8 +332,7 @@ def process_batches_pubsub(cloud_event):
     
     try:
         processor = CloudBatchProcessor()
-        raw_data = processor.load_raw_data(data_file)
-        batch_files = processor.create_batches(raw_data)
+        batch_files = processor.create_batches(processor.iter_raw_data(data_file))
         
         logger.info(f"PubSub batch processing completed: {len(batch_files)} batches created")
         
@@ -34,6 +34,10 @@ PROCESS_FUNCTION_URL = os.environ.get('PROCESS_FUNCTION_URL', '')
 VERTEX_FUNCTION_URL = os.environ.get('VERTEX_FUNCTION_URL', '')
 ANALYZE_FUNCTION_URL = os.environ.get('ANALYZE_FUNCTION_URL', '')
 
+# Ham veri dosyaları: scripts/common/compression.py CODEC_SUFFIXES ile aynı sıkıştırma sonekleri
+COMPRESSION_SUFFIXES = ('.gz', '.zst')
+RAW_DATA_SUFFIXES = tuple(base + suffix for base in ('.json', '.jsonl') for suffix in ('', *COMPRESSION_SUFFIXES))
+
 class CloudDashboard:
     """Cloud dashboard manager"""
     
@@ -50,7 +54,7 @@ class CloudDashboard:
             recent_extractions = []
             
             for blob in blobs:
-                if blob.name.endswith('.json'):
+                if blob.name.endswith(RAW_DATA_SUFFIXES):
                     recent_extractions.append({
                         'file': blob.name.split('/')[-1],
                         'created': blob.time_created.isoformat(),
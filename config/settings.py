@@ -52,12 +52,99 @@ SEARCH_ENGINE_SOLUTION_TYPE = "SOLUTION_TYPE_SEARCH"
 BATCH_SIZE = 50  # Vertex AI'ın önerdiği maksimum URL sayısı
 MAX_CONTENT_LENGTH = 10000  # Karakterle maksimum içerik uzunluğu
 MIN_CONTENT_LENGTH = 100    # Minimum içerik uzunluğu
+MAX_URLS_PER_BATCH = BATCH_SIZE
+BATCH_FILE_FORMAT = 'jsonl'
+# Boyut farkında batch planlama: her batch MAX_URLS_PER_BATCH kayıt ve BATCH_MAX_BYTES
+# (sıkıştırılmamış JSONL) sınırının altında kalır; BATCH_PLANNER_WINDOW batch'lik
+# pencerelerde boyutlar dengelenir (bellekte bir pencere tutulur). 0 = bayt sınırı yok
+BATCH_MAX_BYTES = int(os.getenv('BATCH_MAX_BYTES', str(8 * 1024 * 1024)))
+BATCH_PLANNER_WINDOW = int(os.getenv('BATCH_PLANNER_WINDOW', '8'))
+
+# Sıkıştırma Ayarları ('gzip', 'zstd' ya da '' = sıkıştırmasız). Okurken biçim
+# dosya imzasından tanınır; yazarken dosyaya .gz / .zst soneki eklenir.
+RAW_DATA_COMPRESSION = os.getenv('RAW_DATA_COMPRESSION', 'gzip')  # data/raw ham veri dosyaları
+BATCH_COMPRESSION = os.getenv('BATCH_COMPRESSION', 'gzip')        # data/batches batch dosyaları
+# Vertex AI'a import edilecek batch'ler GCS'ye Content-Encoding: gzip ile yüklenir;
+# GCS bunları okuyucuya açarak verir, import düz JSONL görür (zstd desteklenmez)
+VERTEX_UPLOAD_GZIP = os.getenv('VERTEX_UPLOAD_GZIP', 'true').lower() == 'true'
+CONTENT_OPTIMIZATION_RULES = {
+    'min_word_count': 10,     # Bundan kısa içerikler atlanır
+    'max_word_count': 10000   # Bundan uzun içerikler kısaltılır
+}
+
+# Yakın Kopya Tespiti (MinHash + LSH)
+NEAR_DUPLICATE_SETTINGS = {
+    'enabled': os.getenv('NEAR_DUPLICATE_DETECTION', 'true').lower() == 'true',
+    'similarity_threshold': float(os.getenv('NEAR_DUPLICATE_THRESHOLD', '0.8')),  # 3 kelimelik shingle'larda Jaccard benzerliği
+    'action': os.getenv('NEAR_DUPLICATE_ACTION', 'drop')  # 'drop': at, 'cluster': tut ve duplicate_of ile işaretle
+}
 
 # Web Scraping Ayarları
 USER_AGENT = os.getenv('USER_AGENT', 'AI-Overview-Bot/1.0')
-REQUEST_DELAY = 1.0  # Saniye cinsinden istek arası gecikme
+REQUEST_DELAY = 1.0  # 429/503 yanıtında Retry-After yoksa host'un bekletileceği süre (saniye)
 REQUEST_TIMEOUT = 30  # Saniye cinsinden timeout
+MAX_RESPONSE_BYTES = int(os.getenv('MAX_RESPONSE_BYTES', str(5 * 1024 * 1024)))  # Bu boyutu aşan yanıtlar okunmadan kesilir
 MAX_RETRIES = 3
+HTTP_POOL_CONNECTIONS = int(os.getenv('HTTP_POOL_CONNECTIONS', '10'))  # Keep-alive bağlantısı tutulan host sayısı
+HTTP_POOL_MAXSIZE = int(os.getenv('HTTP_POOL_MAXSIZE', '10'))  # Host başına açık tutulan bağlantı
+RETRY_BACKOFF_FACTOR = 0.5  # Yeniden deneme bekleme: 0.5, 1, 2 ... sn (+ jitter)
+RETRY_BACKOFF_JITTER = 0.5
+HTML_PARSER_BACKEND = os.getenv('HTML_PARSER_BACKEND', 'lxml')  # 'lxml' (hızlı) ya da 'bs4' (referans)
+# Parse işlem havuzu boyutu (1: havuz yok, 0: CPU çekirdeği sayısı). Küçük taramalarda işlem
+# başlatma maliyeti kazançtan büyük olduğundan havuz isteğe bağlıdır (--parse-workers)
+PARSE_WORKERS = int(os.getenv('PARSE_WORKERS', '1'))
+PARSE_QUEUE_SIZE = int(os.getenv('PARSE_QUEUE_SIZE', '0'))  # Parse için bekleyebilecek en fazla sayfa (0: işlem sayısının 2 katı)
+
+# Site Şablonu Tespiti: ana içerik seçicisi bulunamayan sayfalarda sitede tekrarlanan bloklar atlanır
+BOILERPLATE_DETECTION = os.getenv('BOILERPLATE_DETECTION', 'true').lower() == 'true'
+BOILERPLATE_SAMPLE_PAGES = 10  # Şablonun öğrenildiği ilk sayfa sayısı
+BOILERPLATE_MIN_PAGE_RATIO = 0.6  # Bir blok örnek sayfaların en az bu oranında görülürse şablondur
+BOILERPLATE_MAX_AGE_DAYS = 30  # Saklanan şablon bu süreden eskiyse yeniden öğrenilir
+BOILERPLATE_DIR = DATA_DIR / "boilerplate"  # Site başına şablon dosyaları
+
+# Async Tarama Ayarları
+ASYNC_MAX_CONCURRENCY = int(os.getenv('ASYNC_MAX_CONCURRENCY', '20'))        # Global eşzamanlı istek
+ASYNC_PER_HOST_CONCURRENCY = int(os.getenv('ASYNC_PER_HOST_CONCURRENCY', '4'))  # Host başına eşzamanlı istek (adaptif modda başlangıç)
+# Adaptif (AIMD) host eşzamanlılığı: gecikme sabitken +1, 429/503 ya da gecikme sıçramasında yarıya
+ASYNC_ADAPTIVE_CONCURRENCY = os.getenv('ASYNC_ADAPTIVE_CONCURRENCY', 'true').lower() == 'true'
+ASYNC_PER_HOST_MAX_CONCURRENCY = int(os.getenv('ASYNC_PER_HOST_MAX_CONCURRENCY', '16'))
+AIMD_DECREASE_FACTOR = 0.5  # Aşırı yük sinyalinde sınırın çarpanı
+AIMD_LATENCY_FACTOR = 2.0  # Gecikme ortalamanın bu katını aşarsa aşırı yük sayılır
+
+# Tarama Kuyruğu (Frontier) Ayarları
+FRONTIER_MEMORY_LIMIT = int(os.getenv('FRONTIER_MEMORY_LIMIT', '100000'))  # Bellekte tutulacak maksimum URL (0: sınırsız)
+FRONTIER_SPILL_DIR = DATA_DIR / "frontier"  # Sınır aşılınca URL'lerin taşacağı dizin
+# 'fifo': BFS, FRONTIER_MEMORY_LIMIT aşılınca diske taşar; 'priority' (isteğe bağlı): derinlik,
+# gelen bağlantı, sitemap önceliği ve URL kalıbına göre, tüm kuyruk bellekte tutulur
+FRONTIER_STRATEGY = os.getenv('FRONTIER_STRATEGY', 'fifo')
+FRONTIER_PRIORITY_WEIGHTS = {
+    'depth': 1.0,      # Her bağlantı adımı için ceza
+    'inlinks': 1.0,    # log(1 + site içi gelen bağlantı) başına bonus
+    'sitemap': 2.0,    # Sitemap <priority> başına bonus
+    'low_value': 3.0,  # Etiket/arşiv/sayfalama gibi URL kalıplarına ceza
+}
+# Öncelikli frontier'da taramadan önce sitemap <priority> değerleri okunur (en fazla FRONTIER_SITEMAP_MAX_URLS)
+FRONTIER_SITEMAP_PRIORITY = os.getenv('FRONTIER_SITEMAP_PRIORITY', 'false').lower() == 'true'
+FRONTIER_SITEMAP_MAX_URLS = 50000
+
+# Checkpoint Ayarları (yarıda kalan taramaya --resume ile devam)
+CHECKPOINT_DIR = DATA_DIR / "checkpoints"
+# Kayıt dosyası yalnızca eklenerek yazılır; varsayılan açık, böylece çöken uzun tarama --resume ile sürer
+CHECKPOINT_ENABLED = os.getenv('CHECKPOINT_ENABLED', 'true').lower() == 'true'
+CHECKPOINT_INTERVAL = int(os.getenv('CHECKPOINT_INTERVAL', '50'))  # Kaç sayfada bir durum diske yazılır
+
+# Artımlı Çalıştırma Ayarları (run_project.py --incremental)
+MANIFEST_DIR = DATA_DIR / "manifests"  # Site başına URL -> içerik özeti manifest'leri
+
+# Parçalı Tarama Ayarları (frontier URL hash'ine göre parçalara bölünür)
+CRAWL_SHARDS = int(os.getenv('CRAWL_SHARDS', '1'))  # 1: parçasız tarama
+SHARD_MAX_URLS = int(os.getenv('SHARD_MAX_URLS', '100'))  # Bir iş öğesinde (parça, tur) en fazla URL
+SHARD_STATE_DIR = DATA_DIR / "shards"  # Yerel modda parça durumu ve çıktıları
+
+# Site İçi Bağlantı Grafı (tarama sırasında toplanır; PageRank ve gelen bağlantı analizi)
+LINK_GRAPH_ENABLED = os.getenv('LINK_GRAPH_ENABLED', 'true').lower() == 'true'
+LINK_GRAPH_TOP_N = 20  # Analiz raporundaki liste uzunlukları
+LINK_GRAPH_WEAK_IN_LINKS = 1  # En fazla bu kadar sayfadan bağlantı alan sayfalar zayıf bağlantılı sayılır
 
 # URL Keşif Ayarları
 INCLUDE_PATTERNS = [
@@ -155,13 +242,15 @@ ENABLE_AI_OVERVIEW_TRACKING = os.getenv('ENABLE_AI_OVERVIEW_TRACKING', 'true').l
 ENABLE_DETAILED_LOGGING = os.getenv('ENABLE_DETAILED_LOGGING', 'false').lower() == 'true'
 ENABLE_CACHE = os.getenv('ENABLE_CACHE', 'true').lower() == 'true'
 
-# Cache Ayarları
-CACHE_TTL = 3600  # 1 saat
-CACHE_MAX_SIZE = 1000  # Maksimum cache entry sayısı
+# Cache Ayarları (HTTP koşullu GET önbelleği)
+CACHE_TTL = int(os.getenv('CACHE_TTL', '3600'))  # Bu süre içinde sayfa hiç istenmez, sonra koşullu GET ile doğrulanır
+CACHE_MAX_SIZE = int(os.getenv('CACHE_MAX_SIZE', '1000'))  # Maksimum cache entry (URL) sayısı
+HTTP_CACHE_PATH = DATA_DIR / "cache" / "http_cache.sqlite3"
 
 # Rate Limiting
-RATE_LIMIT_REQUESTS = 100  # 1 dakikada maksimum istek sayısı
+RATE_LIMIT_REQUESTS = 100  # Host başına window içinde maksimum istek sayısı
 RATE_LIMIT_WINDOW = 60     # Saniye cinsinden window
+RATE_LIMIT_BURST = 10      # Host başına beklemeden gönderilebilecek istek sayısı
 
 # Debug Ayarları
 DEBUG_MODE = os.getenv('DEBUG_MODE', 'false').lower() == 'true'
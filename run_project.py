@@ -9,7 +9,7 @@ import sys
 import argparse
 import logging
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 
 # Proje kök dizinini sys.path'e ekle
 project_root = Path(__file__).parent
@@ -21,6 +21,8 @@ try:
     from scripts.batch_processor import BatchProcessor
     from scripts.vertex_ai_setup import VertexAISetup
     from scripts.search_engine_builder import SearchEngineBuilder
+    from scripts.common.content_manifest import ManifestDelta, ManifestStore
+    from scripts.common.jsonl import read_records
     from config.settings import *
 except ImportError as e:
     print(f"❌ Proje modülleri yüklenemedi: {e}")
@@ -39,8 +41,13 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def step_1_extract_website_data(url: str, max_pages: int = 100) -> bool:
-    """Adım 1: Web sitesinden veri çıkarma"""
+def step_1_extract_website_data(url: str, max_pages: int = 100,
+                                manifest_store: Optional[ManifestStore] = None) -> Optional[Path]:
+    """Adım 1: Web sitesinden veri çıkarma; ham veri dosyasını döndürür
+    
+    manifest_store verilirse (artımlı mod) yalnızca önceki çalıştırmaya göre
+    eklenen, değişen ve silinen sayfalar kaydedilir.
+    """
     print("🚀 ADIM 1: Web Sitesi Veri Çıkarma")
     print(f"Hedef URL: {url}")
     print(f"Maksimum sayfa: {max_pages}")
@@ -52,25 +59,49 @@ def step_1_extract_website_data(url: str, max_pages: int = 100) -> bool:
         # Sitemap analizi
         print("📋 Sitemap analizi yapılıyor...")
         urls = extractor.discover_urls()
-        print(f"✅ {len(urls)} URL keşfedildi")
         
         # İçerik çıkarma
-        print("📄 İçerik çıkarılıyor...")
-        data = extractor.extract_content_from_urls(urls)
-        
-        # Verileri kaydet
-        output_file = extractor.save_extracted_data(data)
+        if urls is None:
+            # Sitemap yok: sayfalar bağlantı taramasında bir kez indirilip kaydedilir
+            print("🕸️ Sitemap bulunamadı, bağlantı taramasıyla içerik çıkarılıyor...")
+            data = extractor.iter_website_data(url)
+        else:
+            print(f"✅ {len(urls)} URL keşfedildi")
+            print("📄 İçerik çıkarılıyor...")
+            data = extractor.iter_content_from_urls(urls)
+        
+        delta = None
+        if manifest_store:
+            delta = ManifestDelta(manifest_store.load())
+            # Yalnızca 404/410 dönen ya da eksiksiz keşifte artık listelenmeyen sayfalar silinir
+            data = delta.iter_changes(data, max_pages, extractor.gone_urls,
+                                      lambda: extractor.discovered_urls)
+        
+        # Verileri kaydet (kayıtlar çıkarıldıkça dosyaya akar)
+        output_file = extractor.save_raw_data(data)
         print(f"✅ Veriler kaydedildi: {output_file}")
         
-        return True
+        # Sitemap bulunamayıp bağlantı taramasına dönüldüyse iç bağlantı grafı da vardır
+        link_analysis_file = extractor.save_link_graph()
+        if link_analysis_file:
+            print(f"🔗 İç bağlantı analizi: {link_analysis_file}")
+        
+        if delta:
+            # Import başarılı olunca commit edilir
+            manifest_store.stage(delta.current)
+            stats = delta.stats
+            print(f"🔁 Eklenen: {stats['added']}, değişen: {stats['changed']}, "
+                  f"silinen: {stats['deleted']}, değişmeyen: {stats['unchanged']}")
+        
+        return output_file
         
     except Exception as e:
         logger.error(f"Veri çıkarma hatası: {str(e)}")
         print(f"❌ Hata: {str(e)}")
-        return False
+        return None
 
-def step_2_process_batches(raw_data_file: Path) -> List[Path]:
-    """Adım 2: Verileri batch'lere böl"""
+def step_2_process_batches(raw_data_file: Path) -> Tuple[List[Path], List[str]]:
+    """Adım 2: Verileri batch'lere böl; batch dosyaları ve dokümanı silinecek URL'ler döner"""
     print("\n🔄 ADIM 2: Batch İşleme")
     print(f"Ham veri dosyası: {raw_data_file}")
     print("-" * 50)
@@ -78,22 +109,20 @@ def step_2_process_batches(raw_data_file: Path) -> List[Path]:
     try:
         processor = BatchProcessor()
         
-        # Ham verileri yükle
-        print("📂 Ham veriler yükleniyor...")
-        raw_data = processor.load_raw_data(raw_data_file)
-        print(f"✅ {len(raw_data)} kayıt yüklendi")
-        
-        # Batch'lere böl
-        print("✂️ Batch'lere bölünüyor...")
-        batch_files = processor.create_batches(raw_data)
-        print(f"✅ {len(batch_files)} batch oluşturuldu")
+        # Ham verileri yükle, temizle ve batch dosyalarına böl
+        print("✂️ Ham veriler batch'lere bölünüyor...")
+        summary = processor.process_data_to_batches(raw_data_file)
+        batch_files = [Path(f) for f in summary['batch_files']]
+        print(f"✅ {summary['total_pages_processed']} kayıt, {len(batch_files)} batch oluşturuldu")
+        if summary['deleted_urls']:
+            print(f"🗑️ {len(summary['deleted_urls'])} sayfanın dokümanı silinecek")
         
-        return batch_files
+        return batch_files, summary['deleted_urls']
         
     except Exception as e:
         logger.error(f"Batch işleme hatası: {str(e)}")
         print(f"❌ Hata: {str(e)}")
-        return []
+        return [], []
 
 def step_3_setup_vertex_ai(batch_files: List[Path]) -> Dict[str, str]:
     """Adım 3: Vertex AI kurulumu"""
@@ -144,8 +173,8 @@ def step_3_setup_vertex_ai(batch_files: List[Path]) -> Dict[str, str]:
         return {}
 
 def step_4_import_and_analyze(engine_id: str, data_store_id: str, batch_files: List[Path], 
-                             query: str, keywords: List[str]) -> bool:
-    """Adım 4: Import ve AI Overview analizi"""
+                             query: str, keywords: List[str], deleted_urls: List[str] = None) -> bool:
+    """Adım 4: Import (ve artımlı modda silinen sayfaların dokümanlarını silme) ve AI Overview analizi"""
     print("\n🤖 ADIM 4: Import ve AI Overview Analizi")
     print(f"Search Engine ID: {engine_id}")
     print(f"Data Store ID: {data_store_id}")
@@ -157,11 +186,19 @@ def step_4_import_and_analyze(engine_id: str, data_store_id: str, batch_files: L
         builder = SearchEngineBuilder()
         
         # Dokümanları import et
-        print("📥 Dokümanlar import ediliyor...")
-        import_success = builder.import_documents_to_datastore(data_store_id, batch_files)
-        if not import_success:
-            print("❌ Import başarısız!")
-            return False
+        if batch_files:
+            print("📥 Dokümanlar import ediliyor...")
+            import_success = builder.import_documents_to_datastore(data_store_id, batch_files)
+            if not import_success:
+                print("❌ Import başarısız!")
+                return False
+        
+        # Silinen sayfaların dokümanlarını kaldır
+        if deleted_urls:
+            print(f"🗑️ {len(deleted_urls)} doküman siliniyor...")
+            if not builder.delete_documents_from_datastore(data_store_id, deleted_urls):
+                print("❌ Doküman silme başarısız!")
+                return False
         
         print("⏳ Import işleminin tamamlanması bekleniyor (5 dakika)...")
         import time
@@ -217,8 +254,14 @@ def main():
     parser.add_argument('--raw-data-file', help='Mevcut ham veri dosyası (veri çıkarma atlanırsa)')
     parser.add_argument('--engine-id', help='Mevcut search engine ID (Vertex AI kurulumu atlanırsa)')
     parser.add_argument('--data-store-id', help='Mevcut data store ID (Vertex AI kurulumu atlanırsa)')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Yalnızca önceki çalıştırmaya göre eklenen, değişen ve silinen sayfaları işle '
+                             '(mevcut data store\'a; --engine-id ve --data-store-id gerekli)')
     
     args = parser.parse_args()
+    # Artımlı değişiklikler yalnızca tüm sayfaları içeren mevcut data store'a uygulanabilir
+    if args.incremental and not (args.engine_id and args.data_store_id):
+        parser.error("--incremental için --engine-id ve --data-store-id gerekli (değişiklikler mevcut data store'a uygulanır)")
     
     print("🎯 AI OVERVIEW OPTİMİZASYON PROJESİ")
     print("=" * 60)
@@ -226,21 +269,26 @@ def main():
     print(f"Arama sorgusu: {args.query}")
     print(f"Hedef kelimeler: {', '.join(args.keywords)}")
     print(f"Maksimum sayfa: {args.max_pages}")
+    if args.incremental:
+        print("Mod: artımlı")
     print("=" * 60)
     
+    # Artımlı mod: URL başına içerik özetleri; import başarılı olunca güncellenir
+    manifest_store = ManifestStore.for_site(MANIFEST_DIR, args.url) if args.incremental else None
+    
     try:
         # Adım 1: Veri çıkarma
         raw_data_file = None
         if not args.skip_extract:
-            success = step_1_extract_website_data(args.url, args.max_pages)
-            if not success:
+            raw_data_file = step_1_extract_website_data(args.url, args.max_pages, manifest_store)
+            if not raw_data_file:
                 print("❌ Proje durduruldu: Veri çıkarma başarısız")
                 return
             
-            # En son oluşturulan ham veri dosyasını bul
-            raw_data_files = list(RAW_DATA_DIR.glob("website_data_*.json"))
-            if raw_data_files:
-                raw_data_file = max(raw_data_files, key=lambda f: f.stat().st_mtime)
+            if manifest_store and next(read_records(raw_data_file), None) is None:
+                manifest_store.commit()
+                print("\n✅ Önceki çalıştırmadan beri değişen sayfa yok, import gerekmiyor")
+                return
         else:
             if args.raw_data_file:
                 raw_data_file = Path(args.raw_data_file)
@@ -249,7 +297,7 @@ def main():
                     return
             else:
                 # En son oluşturulan dosyayı bul
-                raw_data_files = list(RAW_DATA_DIR.glob("website_data_*.json"))
+                raw_data_files = list(RAW_DATA_DIR.glob("*website_data_*.json*"))
                 if raw_data_files:
                     raw_data_file = max(raw_data_files, key=lambda f: f.stat().st_mtime)
                 else:
@@ -257,8 +305,8 @@ def main():
                     return
         
         # Adım 2: Batch işleme
-        batch_files = step_2_process_batches(raw_data_file)
-        if not batch_files:
+        batch_files, deleted_urls = step_2_process_batches(raw_data_file)
+        if not batch_files and not deleted_urls:
             print("❌ Proje durduruldu: Batch işleme başarısız")
             return
         
@@ -266,7 +314,8 @@ def main():
         engine_id = args.engine_id
         data_store_id = args.data_store_id
         
-        if not args.skip_vertex:
+        # Artımlı modda yeni data store kurulmaz: yalnızca değişen sayfaları içerirdi
+        if not args.skip_vertex and not args.incremental:
             vertex_result = step_3_setup_vertex_ai(batch_files)
             if not vertex_result:
                 print("❌ Proje durduruldu: Vertex AI kurulumu başarısız")
@@ -282,10 +331,12 @@ def main():
         # Adım 4: Import ve analiz
         success = step_4_import_and_analyze(
             engine_id, data_store_id, batch_files, 
-            args.query, args.keywords
+            args.query, args.keywords, deleted_urls
         )
         
         if success:
+            if manifest_store and manifest_store.commit():
+                print("🔁 Manifest güncellendi; sonraki artımlı çalıştırma bu sürümle karşılaştırılır")
             print("\n🎉 PROJE BAŞARIYLA TAMAMLANDI!")
             print("=" * 50)
             print(f"Search Engine ID: {engine_id}")
@@ -1,6 +1,7 @@
 """
 Batch İşleme Modülü - AI Overview Projesi
-Ham web sitesi verilerini 50'şer URL'lik batch'lere böler ve işler.
+Ham web sitesi verilerini en fazla 50 URL'lik ve bayt sınırlı, boyutları
+dengelenmiş batch'lere böler ve işler; kayıtlar akış halinde okunur.
 """
 
 import os
@@ -8,13 +9,18 @@ import sys
 import json
 import time
 from pathlib import Path
-from typing import List, Dict
+from typing import Dict, Iterable, Iterator, List, Optional
 import logging
-from math import ceil
 
 # Proje kök dizinini sys.path'e ekle
 sys.path.append(str(Path(__file__).parent.parent))
 from config.settings import *
+from scripts.common.batch_planner import BatchPlanner
+from scripts.common.compression import with_codec_suffix
+from scripts.common.content_manifest import CHANGE_FIELD, CHANGED, DELETED, document_id
+from scripts.common.jsonl import open_jsonl_writer, read_records
+from scripts.common.near_duplicates import NearDuplicateIndex
+from scripts.common.text_stats import analyze_text, count_words
 
 # Loglama konfigürasyonu
 logging.basicConfig(level=LOG_LEVEL, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -26,66 +32,85 @@ class BatchProcessor:
     def __init__(self):
         self.batches = []
         self.metadata = {}
+        self.near_duplicates = None
+        if NEAR_DUPLICATE_SETTINGS['enabled']:
+            self.near_duplicates = NearDuplicateIndex(NEAR_DUPLICATE_SETTINGS['similarity_threshold'])
+        self.planner = BatchPlanner(MAX_URLS_PER_BATCH, BATCH_MAX_BYTES, BATCH_PLANNER_WINDOW)
         
     def load_raw_data(self, raw_data_file: Path) -> List[Dict]:
-        """Ham veri dosyasını yükler"""
+        """Ham veri dosyasını (JSONL, .jsonl.gz ya da JSON dizisi) yükler"""
         logger.info(f"Ham veri yükleniyor: {raw_data_file}")
         
-        with open(raw_data_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = list(self.iter_raw_data(raw_data_file))
         
         logger.info(f"{len(data)} kayıt yüklendi")
         return data
     
+    def iter_raw_data(self, raw_data_file: Path) -> Iterator[Dict]:
+        """Ham veri kayıtlarını bellekte biriktirmeden, dosyadan okundukça üretir"""
+        return read_records(raw_data_file)
+    
+    def clean_record(self, item: Dict) -> Optional[Dict]:
+        """Tek kaydı temizler ve doğrular; atlanacaksa None döndürür"""
+        # Temel alanları kontrol et
+        if not item.get('url') or not item.get('content'):
+            logger.warning(f"Eksik veri atlanıyor: {item.get('url', 'URL yok')}")
+            return None
+        
+        # Kelime sayısı, kısaltma noktası ve açıklama özeti tek taramada
+        stats = analyze_text(item['content'], CONTENT_OPTIMIZATION_RULES['max_word_count'], excerpt_chars=160)
+        
+        # İçerik uzunluğu kontrolü
+        if stats.word_count < CONTENT_OPTIMIZATION_RULES['min_word_count']:
+            logger.warning(f"Çok kısa içerik atlanıyor: {item['url']} ({stats.word_count} kelime)")
+            return None
+        
+        # Çok uzun içerikleri kısalt
+        if stats.truncated:
+            item['content'] = stats.apply(item['content'])
+            logger.info(f"İçerik kısaltıldı: {item['url']} ({stats.word_count} -> {stats.kept_word_count} kelime)")
+        # Ham veriden gelen word_count'a güvenilmez; metadata bu değeri kullanır
+        item['word_count'] = stats.kept_word_count
+        
+        # Başlık kontrolü
+        if not item.get('title'):
+            item['title'] = f"Sayfa - {item['url'].split('/')[-1]}"
+        
+        # Meta açıklama kontrolü
+        if not item.get('meta_description'):
+            # İçeriğin ilk 160 karakterini kullan
+            item['meta_description'] = stats.excerpt
+        
+        # Yakın kopya kontrolü (sayfalama, print, etiket sayfaları)
+        if self.near_duplicates:
+            duplicate_of = self.near_duplicates.check(item['content'], item['url'])
+            if duplicate_of:
+                if NEAR_DUPLICATE_SETTINGS['action'] == 'drop':
+                    logger.info(f"Yakın kopya atlanıyor: {item['url']} (benzer: {duplicate_of})")
+                    return None
+                item['duplicate_of'] = duplicate_of
+        
+        return item
+    
     def clean_and_validate_data(self, data: List[Dict]) -> List[Dict]:
         """Veriyi temizler ve doğrular"""
-        cleaned_data = []
-        
-        for item in data:
-            # Temel alanları kontrol et
-            if not item.get('url') or not item.get('content'):
-                logger.warning(f"Eksik veri atlanıyor: {item.get('url', 'URL yok')}")
-                continue
-            
-            # İçerik uzunluğu kontrolü
-            word_count = len(item['content'].split())
-            if word_count < CONTENT_OPTIMIZATION_RULES['min_word_count']:
-                logger.warning(f"Çok kısa içerik atlanıyor: {item['url']} ({word_count} kelime)")
-                continue
-            
-            # Çok uzun içerikleri kısalt
-            if word_count > CONTENT_OPTIMIZATION_RULES['max_word_count']:
-                words = item['content'].split()[:CONTENT_OPTIMIZATION_RULES['max_word_count']]
-                item['content'] = ' '.join(words)
-                item['word_count'] = len(words)
-                logger.info(f"İçerik kısaltıldı: {item['url']} ({word_count} -> {len(words)} kelime)")
-            
-            # Başlık kontrolü
-            if not item.get('title'):
-                item['title'] = f"Sayfa - {item['url'].split('/')[-1]}"
-            
-            # Meta açıklama kontrolü
-            if not item.get('meta_description'):
-                # İçeriğin ilk 160 karakterini kullan
-                item['meta_description'] = item['content'][:160] + "..." if len(item['content']) > 160 else item['content']
-            
-            cleaned_data.append(item)
+        cleaned_data = [item for item in map(self.clean_record, data) if item is not None]
         
+        if self.near_duplicates:
+            logger.info(f"Yakın kopya istatistikleri: {self.near_duplicates.stats}")
         logger.info(f"Veri temizleme tamamlandı: {len(data)} -> {len(cleaned_data)} kayıt")
         return cleaned_data
     
     def create_batches(self, data: List[Dict]) -> List[List[Dict]]:
         """Veriyi batch'lere böler"""
-        batches = []
-        total_batches = ceil(len(data) / MAX_URLS_PER_BATCH)
-        
-        logger.info(f"Veri {total_batches} batch'e bölünüyor (her batch'te {MAX_URLS_PER_BATCH} URL)")
+        logger.info(f"Veri batch'lere bölünüyor (batch başına en fazla {MAX_URLS_PER_BATCH} URL, "
+                    f"{BATCH_MAX_BYTES or 'sınırsız'} bayt)")
         
-        for i in range(0, len(data), MAX_URLS_PER_BATCH):
-            batch = data[i:i + MAX_URLS_PER_BATCH]
-            batches.append(batch)
-        
-        return batches
+        return list(self.iter_batches(data))
+    
+    def iter_batches(self, records: Iterable[Dict]) -> Iterator[List[Dict]]:
+        """Kayıt akışını kayıt sayısı ve JSONL boyutu sınırlarına göre dengelenmiş batch'lere böler"""
+        return self.planner.plan(records)
     
     def optimize_content_for_ai(self, content: str, title: str = "") -> str:
         """İçeriği AI Overview için optimize eder"""
@@ -103,7 +128,7 @@ class BatchProcessor:
         current_paragraph = ""
         
         for paragraph in paragraphs:
-            if len(paragraph.split()) < 20 and current_paragraph:
+            if count_words(paragraph) < 20 and current_paragraph:
                 current_paragraph += " " + paragraph
             else:
                 if current_paragraph:
@@ -128,29 +153,33 @@ class BatchProcessor:
             'total_words': total_words,
             'average_words_per_page': total_words // len(batch_data) if batch_data else 0,
             'file_format': BATCH_FILE_FORMAT,
+            'compression': BATCH_COMPRESSION or None,
             'processing_status': 'created'
         }
         
         return metadata
     
+    def prepare_document(self, item: Dict) -> Dict:
+        """Temizlenmiş kaydı batch'e yazılacak dokümana çevirir"""
+        # AI Overview için optimize et
+        optimized_item = item.copy()
+        optimized_item.pop(CHANGE_FIELD, None)
+        # Kararlı kimlik: yeniden import aynı dokümanı günceller
+        optimized_item['id'] = document_id(item['url'])
+        optimized_item['content'] = self.optimize_content_for_ai(
+            item['content'], 
+            item.get('title', '')
+        )
+        return optimized_item
+    
     def save_batch_as_jsonl(self, batch_data: List[Dict], batch_id: str) -> Path:
-        """Batch'i JSONL formatında kaydeder"""
-        filename = f"batch_{batch_id}.{BATCH_FILE_FORMAT}"
+        """prepare_document ile hazırlanmış batch'i JSONL formatında (BATCH_COMPRESSION ile sıkıştırarak) kaydeder"""
+        filename = with_codec_suffix(f"batch_{batch_id}.{BATCH_FILE_FORMAT}", BATCH_COMPRESSION)
         filepath = BATCHES_DIR / filename
-        filepath.parent.mkdir(parents=True, exist_ok=True)
-        
-        with open(filepath, 'w', encoding='utf-8') as f:
-            for item in batch_data:
-                # AI Overview için optimize et
-                optimized_item = item.copy()
-                optimized_item['content'] = self.optimize_content_for_ai(
-                    item['content'], 
-                    item.get('title', '')
-                )
-                
-                # JSONL formatında yaz (her satırda bir JSON)
-                json.dump(optimized_item, f, ensure_ascii=False)
-                f.write('\n')
+        
+        with open_jsonl_writer(filepath) as writer:
+            # JSONL formatında yaz (her satırda bir JSON)
+            writer.write_all(batch_data)
         
         logger.info(f"Batch kaydedildi: {filepath}")
         return filepath
@@ -166,26 +195,42 @@ class BatchProcessor:
         return metadata_file
     
     def process_data_to_batches(self, raw_data_file: Path) -> Dict:
-        """Ana işleme fonksiyonu"""
-        logger.info("Batch işleme başlıyor...")
+        """Ana işleme fonksiyonu
         
-        # Ham veriyi yükle
-        raw_data = self.load_raw_data(raw_data_file)
-        
-        # Veriyi temizle ve doğrula
-        cleaned_data = self.clean_and_validate_data(raw_data)
+        Kayıtlar dosyadan akış halinde okunur, temizlenir, dokümana çevrilir ve
+        BatchPlanner'ın her penceresi dolunca boyutları dengelenmiş batch'ler
+        olarak diske yazılır; bellekte en fazla bir pencere bulunur (yakın kopya
+        imzaları ve URL listeleri hariç).
+        """
+        logger.info("Batch işleme başlıyor...")
+        logger.info(f"Ham veri akış halinde okunuyor: {raw_data_file}")
         
-        if not cleaned_data:
-            raise ValueError("İşlenecek geçerli veri bulunamadı")
+        counts = {'raw': 0, 'cleaned': 0}
+        deleted_urls = []
         
-        # Batch'lere böl
-        batches = self.create_batches(cleaned_data)
+        def cleaned_records() -> Iterator[Dict]:
+            for item in self.iter_raw_data(raw_data_file):
+                counts['raw'] += 1
+                # Artımlı çalıştırmada silinen sayfalar batch'e girmez, dokümanları import adımında silinir
+                change = item.get(CHANGE_FIELD)
+                if change == DELETED:
+                    deleted_urls.append(item['url'])
+                    continue
+                cleaned = self.clean_record(item)
+                if cleaned is None:
+                    # Değişip artık geçersiz olan (ör. çok kısalan) sayfaların eski dokümanları da silinir
+                    if change == CHANGED:
+                        deleted_urls.append(item['url'])
+                    continue
+                counts['cleaned'] += 1
+                yield cleaned
         
-        # Her batch'i işle ve kaydet
+        # Her batch planlandığında kaydet
         batch_files = []
         all_metadata = []
+        documents = map(self.prepare_document, cleaned_records())
         
-        for i, batch_data in enumerate(batches, 1):
+        for i, batch_data in enumerate(self.iter_batches(documents), 1):
             batch_id = f"{int(time.time())}_{i:03d}"
             
             # Batch dosyasını kaydet
@@ -196,19 +241,31 @@ class BatchProcessor:
             metadata = self.create_batch_metadata(batch_id, batch_data)
             all_metadata.append(metadata)
             
-            logger.info(f"Batch {i}/{len(batches)} işlendi: {len(batch_data)} URL")
+            logger.info(f"Batch {i} işlendi: {len(batch_data)} URL")
+        
+        if self.near_duplicates:
+            logger.info(f"Yakın kopya istatistikleri: {self.near_duplicates.stats}")
+        logger.info(f"Veri temizleme tamamlandı: {counts['raw']} -> {counts['cleaned']} kayıt")
+        logger.info(f"Batch planı: {self.planner.stats}")
+        
+        if not batch_files and not deleted_urls:
+            raise ValueError("İşlenecek geçerli veri bulunamadı")
         
         # Metadata'yı kaydet
         metadata_file = self.save_metadata(all_metadata)
         
         # Özet rapor
         summary = {
-            'total_pages_processed': len(cleaned_data),
-            'total_batches_created': len(batches),
+            'total_pages_processed': counts['cleaned'],
+            'total_batches_created': len(batch_files),
+            'near_duplicates_found': self.near_duplicates.stats['near_duplicates'] if self.near_duplicates else 0,
             'batch_files': [str(f) for f in batch_files],
+            'deleted_urls': deleted_urls,
             'metadata_file': str(metadata_file),
             'processing_date': time.strftime('%Y-%m-%d %H:%M:%S'),
-            'average_pages_per_batch': len(cleaned_data) / len(batches) if batches else 0
+            'average_pages_per_batch': counts['cleaned'] / len(batch_files) if batch_files else 0,
+            'largest_batch_bytes': self.planner.stats['largest_batch_bytes'],
+            'smallest_batch_bytes': self.planner.stats['smallest_batch_bytes']
         }
         
         logger.info("Batch işleme tamamlandı!")
@@ -243,6 +300,8 @@ def main():
         print(f"\n✅ Batch işleme tamamlandı!")
         print(f"📊 İşlenen sayfa sayısı: {summary['total_pages_processed']}")
         print(f"📦 Oluşturulan batch sayısı: {summary['total_batches_created']}")
+        if summary['deleted_urls']:
+            print(f"🗑️ Silinecek doküman sayısı: {len(summary['deleted_urls'])}")
         print(f"📄 Ortalama batch büyüklüğü: {summary['average_pages_per_batch']:.1f} sayfa")
         print(f"📁 Batch dosyaları: {BATCHES_DIR}")
         print(f"📋 Metadata dosyası: {summary['metadata_file']}")
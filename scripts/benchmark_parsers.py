@@ -0,0 +1,155 @@
+"""
+Parser Benchmark - AI Overview Projesi
+HTML parser backend'lerinin saniyedeki sayfa sayısını ölçer ve kayıtların
+referans (bs4) backend ile aynı olduğunu doğrular. --workers ile parse işlem
+havuzunun çekirdek sayısıyla ölçeklenmesi de ölçülür.
+"""
+
+import sys
+import time
+import random
+from collections import deque
+from pathlib import Path
+from typing import Dict, List
+
+# Proje kök dizinini sys.path'e ekle
+sys.path.append(str(Path(__file__).parent.parent))
+from scripts.common.page_parser import PARSER_BACKENDS, get_parser_backend
+from scripts.common.parse_pool import ParsePool
+
+
+def generate_synthetic_pages(count: int, seed: int = 42) -> List[bytes]:
+    """Gerçekçi yapıda (nav, makale, footer, bağlantılar) örnek sayfalar üretir"""
+    rng = random.Random(seed)
+    words = ['analiz', 'içerik', 'arama', 'google', 'vertex', 'optimizasyon', 'site',
+             'sayfa', 'veri', 'model', 'kullanıcı', 'cevap', 'soru', 'liste', 'rehber']
+    pages = []
+    for i in range(count):
+        paragraphs = ''.join(
+            f"<p>{' '.join(rng.choice(words) for _ in range(rng.randint(20, 80)))}</p>"
+            for _ in range(rng.randint(5, 30))
+        )
+        nav = ''.join(f'<li><a href="/kategori/{j}">Kategori {j}</a></li>' for j in range(20))
+        links = ''.join(f'<a href="/sayfa/{rng.randint(0, 5000)}">Sayfa {j}</a> ' for j in range(30))
+        headings = ''.join(f'<h{level}>Başlık {j}</h{level}><p>{rng.choice(words)} {rng.choice(words)}</p>'
+                           for j, level in enumerate(rng.choices([2, 3, 4], k=rng.randint(2, 8))))
+        # Sayfaların bir kısmında ana içerik seçicisi yok: body fallback yolu
+        main = (f'<article class="post"><h1>Sayfa {i}</h1>{headings}{paragraphs}</article>'
+                if i % 4 else f'<div class="wrapper"><h1>Sayfa {i}</h1>{headings}{paragraphs}</div>')
+        html = (
+            f'<!DOCTYPE html><html><head><meta charset="utf-8"><title>Sayfa {i} &amp; Test</title>'
+            f'<meta name="description" content="Açıklama {i}"><style>body {{ color: red; }}</style>'
+            f'<script>var x = {i};</script></head><body>'
+            f'<header><h2>Site</h2><nav><ul>{nav}</ul></nav></header>{main}'
+            f'<aside><h3>Yan</h3>{links}</aside><!-- yorum -->'
+            f'<footer><a href="https://example.com/iletisim">İletişim</a></footer></body></html>'
+        )
+        pages.append(html.encode('utf-8'))
+    return pages
+
+
+def load_html_pages(html_dir: Path) -> List[bytes]:
+    """Dizindeki .html dosyalarını yükler"""
+    return [path.read_bytes() for path in sorted(html_dir.glob('*.html'))]
+
+
+def _comparable(record: Dict) -> Dict:
+    return {key: value for key, value in record.items() if key != 'extracted_at'}
+
+
+def benchmark(pages: List[bytes], repeat: int = 3) -> Dict[str, Dict]:
+    """Her backend için sayfa/sn ve bs4 ile aynı kayıt oranını ölçer"""
+    url = 'https://example.com/sayfa'
+    reference = get_parser_backend('bs4')
+    reference_records = [_comparable(reference.parse(url, page)[0]) for page in pages]
+
+    results = {}
+    for name in PARSER_BACKENDS:
+        backend = get_parser_backend(name)
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for page in pages:
+                backend.parse(url, page)
+            best = min(best, time.perf_counter() - start)
+
+        identical = sum(
+            _comparable(backend.parse(url, page)[0]) == expected
+            for page, expected in zip(pages, reference_records)
+        )
+        results[backend.name] = {
+            'pages_per_second': len(pages) / best if best else 0,
+            'identical_records': identical,
+            'total_pages': len(pages)
+        }
+    return results
+
+
+def benchmark_pool(pages: List[bytes], backend_name: str, workers: int) -> Dict:
+    """Sayfaları tarama hattı gibi sınırlı pencereyle havuza verir, sırayla toplar"""
+    url = 'https://example.com/sayfa'
+    reference = get_parser_backend(backend_name)
+    expected = [_comparable(reference.parse(url, page)[0]) for page in pages]
+
+    with ParsePool(backend_name, workers) as pool:
+        pool.submit(url, pages[0]).result()  # İşlemleri ısıt
+        start = time.perf_counter()
+        in_flight = deque()
+        records = []
+        for page in pages:
+            if len(in_flight) >= pool.max_pending:
+                records.append(in_flight.popleft().result()[0])
+            in_flight.append(pool.submit(url, page))
+        records.extend(pending.result()[0] for pending in in_flight)
+        elapsed = time.perf_counter() - start
+
+    return {
+        'pages_per_second': len(pages) / elapsed if elapsed else 0,
+        'identical_records': sum(_comparable(record) == reference_record
+                                 for record, reference_record in zip(records, expected)),
+        'total_pages': len(pages)
+    }
+
+
+def main():
+    """Ana fonksiyon - komut satırından çalıştırma"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='HTML parser backend benchmark')
+    parser.add_argument('--html-dir', help='Ölçümde kullanılacak .html dosyalarının dizini')
+    parser.add_argument('--pages', type=int, default=200, help='Sentetik sayfa sayısı (varsayılan: 200)')
+    parser.add_argument('--repeat', type=int, default=3, help='Tekrar sayısı, en iyi süre raporlanır')
+    parser.add_argument('--workers', type=int, nargs='+', help='Parse havuzunu bu işlem sayılarıyla ölç (ör. 1 2 4)')
+
+    args = parser.parse_args()
+
+    pages = load_html_pages(Path(args.html_dir)) if args.html_dir else generate_synthetic_pages(args.pages)
+    if not pages:
+        print("❌ Ölçülecek sayfa bulunamadı")
+        return
+
+    results = benchmark(pages, args.repeat)
+
+    print(f"\n📊 Parser benchmark ({len(pages)} sayfa, en iyi {args.repeat} tekrar)")
+    print("-" * 60)
+    baseline = results['bs4']['pages_per_second']
+    for name, result in results.items():
+        speedup = result['pages_per_second'] / baseline if baseline else 0
+        print(f"{name:6s} {result['pages_per_second']:10.1f} sayfa/sn  "
+              f"x{speedup:4.1f}  aynı kayıt: {result['identical_records']}/{result['total_pages']}")
+
+    if args.workers:
+        print("\n⚙️  Parse havuzu ölçeklenmesi")
+        print("-" * 60)
+        for name in PARSER_BACKENDS:
+            single = None
+            for workers in args.workers:
+                result = benchmark_pool(pages, name, workers)
+                single = single or result['pages_per_second']
+                print(f"{name:6s} {workers:3d} işlem {result['pages_per_second']:10.1f} sayfa/sn  "
+                      f"x{result['pages_per_second'] / single:4.1f}  "
+                      f"aynı kayıt: {result['identical_records']}/{result['total_pages']}")
+
+
+if __name__ == "__main__":
+    main()
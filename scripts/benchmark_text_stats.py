@@ -0,0 +1,126 @@
+"""
+Metin İstatistikleri Benchmark - AI Overview Projesi
+Batch temizlemenin metin adımlarını (kelime sayımı, kısaltma, meta açıklama
+özeti) eski split tabanlı uygulamayla ve text_stats çekirdeğiyle ölçer; iki
+yolun aynı kayıtları ürettiğini doğrular.
+"""
+
+import sys
+import time
+import random
+from pathlib import Path
+from typing import Callable, Dict, List
+
+# Proje kök dizinini sys.path'e ekle
+sys.path.append(str(Path(__file__).parent.parent))
+from scripts.common.text_stats import analyze_text
+
+MIN_WORDS = 10
+MAX_WORDS = 10000
+EXCERPT_CHARS = 160
+
+
+def generate_corpus(count: int, distinct: int = 2000, seed: int = 42) -> List[Dict]:
+    """Parser çıktısına benzer kayıtlar; metinler ``distinct`` örnekten paylaşılır
+
+    Çoğu metin tek boşlukla ayrılmıştır; bir kısmı satır sonu ve çoklu boşluk
+    içerir, bir kısmı çok kısa ya da max kelime sınırından uzundur. Uzun
+    metinler tek boşlukludur (kısaltılan parser çıktısı): çok boşluklu metinde
+    yeni yol boşlukları korur, özet eski yoldan farklı yerden kesilir.
+    """
+    rng = random.Random(seed)
+    words = ['analiz', 'içerik', 'arama', 'google', 'vertex', 'optimizasyon', 'site',
+             'sayfa', 'veri', 'model', 'kullanıcı', 'cevap', 'soru', 'liste', 'rehber']
+    texts = []
+    for i in range(distinct):
+        roll = rng.random()
+        if roll < 0.05:
+            length = rng.randint(1, MIN_WORDS - 1)
+        elif roll < 0.08:
+            length = rng.randint(MAX_WORDS + 1, MAX_WORDS * 2)
+        else:
+            length = rng.randint(50, 800)
+        tokens = [rng.choice(words) for _ in range(length)]
+        if i % 10 == 0 and length <= MAX_WORDS:
+            texts.append(''.join(token + rng.choice([' ', ' ', '  ', '\n']) for token in tokens))
+        else:
+            texts.append(' '.join(tokens))
+    return [{'url': f'https://example.com/sayfa/{i}', 'content': texts[i % distinct]} for i in range(count)]
+
+
+def legacy_clean(item: Dict) -> Dict:
+    """text_stats öncesi BatchProcessor temizleme adımları"""
+    word_count = len(item['content'].split())
+    if word_count < MIN_WORDS:
+        return None
+    if word_count > MAX_WORDS:
+        words = item['content'].split()[:MAX_WORDS]
+        item['content'] = ' '.join(words)
+        item['word_count'] = len(words)
+    else:
+        item['word_count'] = word_count
+    item['meta_description'] = item['content'][:EXCERPT_CHARS] + "..." if len(item['content']) > EXCERPT_CHARS else item['content']
+    return item
+
+
+def text_stats_clean(item: Dict) -> Dict:
+    """text_stats ile aynı adımlar: metin bir kez taranır"""
+    stats = analyze_text(item['content'], MAX_WORDS, excerpt_chars=EXCERPT_CHARS)
+    if stats.word_count < MIN_WORDS:
+        return None
+    item['content'] = stats.apply(item['content'])
+    item['word_count'] = stats.kept_word_count
+    item['meta_description'] = stats.excerpt
+    return item
+
+
+def benchmark(records: List[Dict], cleaners: Dict[str, Callable], repeat: int = 3) -> Dict[str, Dict]:
+    """Her temizleyici için kayıt/sn ve eski yolla aynı kayıt sayısı"""
+    reference = [legacy_clean(dict(record)) for record in records]
+
+    results = {}
+    for name, clean in cleaners.items():
+        best = float('inf')
+        for _ in range(repeat):
+            copies = [dict(record) for record in records]
+            start = time.perf_counter()
+            for record in copies:
+                clean(record)
+            best = min(best, time.perf_counter() - start)
+
+        identical = sum(
+            clean(dict(record)) == expected
+            for record, expected in zip(records, reference)
+        )
+        results[name] = {
+            'records_per_second': len(records) / best if best else 0,
+            'identical_records': identical,
+            'total_records': len(records)
+        }
+    return results
+
+
+def main():
+    """Ana fonksiyon - komut satırından çalıştırma"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Metin istatistikleri benchmark')
+    parser.add_argument('--records', type=int, default=100000, help='Kayıt sayısı (varsayılan: 100000)')
+    parser.add_argument('--repeat', type=int, default=3, help='Tekrar sayısı, en iyi süre raporlanır')
+
+    args = parser.parse_args()
+
+    records = generate_corpus(args.records)
+    results = benchmark(records, {'split': legacy_clean, 'text_stats': text_stats_clean}, args.repeat)
+
+    print(f"\n📊 Metin istatistikleri benchmark ({len(records)} kayıt, en iyi {args.repeat} tekrar)")
+    print("-" * 60)
+    baseline = results['split']['records_per_second']
+    for name, result in results.items():
+        speedup = result['records_per_second'] / baseline if baseline else 0
+        print(f"{name:10s} {result['records_per_second']:10.1f} kayıt/sn  "
+              f"x{speedup:4.1f}  aynı kayıt: {result['identical_records']}/{result['total_records']}")
+
+
+if __name__ == "__main__":
+    main()
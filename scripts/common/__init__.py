@@ -0,0 +1,4 @@
+"""
+Ortak Modüller - AI Overview Projesi
+Yerel script'ler ve Cloud Function'lar tarafından paylaşılan tarama yardımcıları.
+"""
@@ -0,0 +1,251 @@
+"""
+Asenkron Tarama Motoru - AI Overview Projesi
+Sayfaları asyncio ile, global ve host başına sınırlı eşzamanlılıkla tarar.
+"""
+
+import asyncio
+import heapq
+import inspect
+import logging
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple, Union
+from urllib.parse import urlparse
+
+from .frontier import UrlSeenIndex
+from .http_cache import HttpCache, body_digest
+from .host_concurrency import AimdHostConcurrency, FixedHostConcurrency
+from .http_client import CircuitBreaker
+from .link_graph import LinkGraph
+from .rate_limiter import HostRateLimiter, parse_retry_after
+from .response_gate import ResponseGate
+from .url_canonicalizer import canonicalize_url, resolve_page_url
+
+try:
+    import aiohttp
+except ImportError:  # Opsiyonel bağımlılık: sadece async modda gerekli
+    aiohttp = None
+
+logger = logging.getLogger(__name__)
+
+# (url, içerik) -> (sayfa kaydı, giden bağlantılar) ya da None; işlem havuzunda
+# parse için (ör. ParsePool.async_parse) aynı sonucu veren awaitable da olabilir
+PageResult = Optional[Tuple[Dict, List[str]]]
+PageHandler = Callable[[str, bytes], Union[PageResult, Awaitable[PageResult]]]
+
+
+class AsyncCrawler:
+    """Asyncio tabanlı tarayıcı
+
+    Her URL bir kez indirilir ve ``page_handler``'a verilir. Handler'ın
+    döndürdüğü bağlantılar ``link_filter``'dan geçerse kuyruğa eklenir.
+    Sonuçlar tamamlanma değil keşif sırasına göre döndürülür. Keşif sırası
+    isteklerin bitiş sırasına bağlıdır: max_pages siteden küçükse taranan
+    sayfa kümesi senkron taramadan ve çalıştırmadan çalıştırmaya farklı
+    olabilir. URL'ler kanonik biçimde tutulur;
+    <link rel=canonical> ile zaten üretilmiş sayfayı gösteren kopyalar atlanır.
+    """
+
+    def __init__(self, max_concurrency: int = 20, per_host_concurrency: int = 4,
+                 rate_limiter: Optional[HostRateLimiter] = None, timeout: float = 30,
+                 headers: Optional[Dict[str, str]] = None, default_retry_after: float = 1.0,
+                 http_cache: Optional[HttpCache] = None,
+                 response_gate: Optional[ResponseGate] = None,
+                 canonicalize: Optional[Callable[[str], str]] = canonicalize_url,
+                 circuit_breaker: Optional[CircuitBreaker] = None,
+                 host_concurrency: Union[FixedHostConcurrency, AimdHostConcurrency, None] = None):
+        if aiohttp is None:
+            raise ImportError("Async tarama için aiohttp gerekli: pip install aiohttp")
+
+        self.max_concurrency = max(1, max_concurrency)
+        # Host başına sınır: verilmezse per_host_concurrency ile sabit
+        self.host_concurrency = host_concurrency or FixedHostConcurrency(per_host_concurrency)
+        self.per_host_concurrency = self.host_concurrency.max_per_host
+        self.rate_limiter = rate_limiter
+        self.default_retry_after = default_retry_after
+        self.http_cache = http_cache
+        self.response_gate = response_gate
+        self.circuit_breaker = circuit_breaker
+        self.canonicalize = canonicalize or (lambda url: url)
+        self.timeout = timeout
+        self.headers = headers or {}
+
+    def crawl(self, start_url: str, max_pages: int, page_handler: PageHandler,
+              link_filter: Optional[Callable[[str], bool]] = None,
+              link_graph: Optional[LinkGraph] = None) -> List[Dict]:
+        """Başlangıç URL'inden itibaren en fazla max_pages sayfa tarar
+
+        link_graph verilirse taranan sayfaların filtreden geçen bağlantıları eklenir.
+        """
+        return asyncio.run(self._crawl(start_url, max_pages, page_handler, link_filter, link_graph))
+
+    async def _crawl(self, start_url: str, max_pages: int, page_handler: PageHandler,
+                     link_filter: Optional[Callable[[str], bool]],
+                     link_graph: Optional[LinkGraph] = None) -> List[Dict]:
+        queue = asyncio.Queue()
+        start_url = self.canonicalize(start_url)
+        seen = UrlSeenIndex()
+        seen.add(start_url)
+        state = {
+            'seen': seen,
+            'emitted': UrlSeenIndex(),
+            'next_seq': 1,
+            'claimed': 0,
+            'in_flight': 0,
+            'parked': [],
+            'results': [],
+            'link_graph': link_graph,
+        }
+        queue.put_nowait((0, start_url))
+
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        connector = aiohttp.TCPConnector(limit=self.max_concurrency,
+                                         limit_per_host=self.per_host_concurrency)
+
+        async with aiohttp.ClientSession(headers=self.headers, timeout=timeout,
+                                         connector=connector) as session:
+            workers = [
+                asyncio.create_task(self._worker(session, queue, state, max_pages, page_handler, link_filter))
+                for _ in range(self.max_concurrency)
+            ]
+            await queue.join()
+
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+        state['results'].sort(key=lambda item: item[0])
+        return [record for _, record in state['results']]
+
+    async def _worker(self, session, queue: asyncio.Queue, state: Dict,
+                      max_pages: int, page_handler: PageHandler,
+                      link_filter: Optional[Callable[[str], bool]]):
+        while True:
+            seq, url = await queue.get()
+            try:
+                if state['claimed'] >= max_pages:
+                    # Süren istekler başarısız olursa bütçe geri verilir; o zamana kadar URL bekletilir
+                    if state['in_flight']:
+                        heapq.heappush(state['parked'], (seq, url))
+                    continue
+
+                # Sayfa bütçesini istek başlamadan ayır, hata olursa geri ver
+                state['claimed'] += 1
+                state['in_flight'] += 1
+                try:
+                    result = await self._fetch_and_handle(session, url, page_handler)
+                finally:
+                    state['in_flight'] -= 1
+                if result is None:
+                    self._refund(queue, state)
+                    continue
+
+                record, links = result
+                page_url = resolve_page_url(url, record.get('canonical_url') if record else None,
+                                            self.canonicalize, link_filter)
+                if not state['emitted'].add(page_url):
+                    logger.info(f"Kopya sayfa atlandı: {url} (canonical: {page_url})")
+                    self._refund(queue, state)
+                    continue
+                # Canonical URL ayrıca indirilmesin
+                state['seen'].add(page_url)
+                if record:
+                    record['url'] = page_url
+                state['results'].append((seq, record))
+
+                internal_links = []
+                for link in map(self.canonicalize, links):
+                    # Görülmüş URL'ler filtreden zaten geçmiştir
+                    if link not in state['seen']:
+                        if link_filter and not link_filter(link):
+                            continue
+                        state['seen'].add(link)
+                        queue.put_nowait((state['next_seq'], link))
+                        state['next_seq'] += 1
+                    internal_links.append(link)
+                if state['link_graph'] is not None:
+                    state['link_graph'].add_page(page_url, internal_links)
+            finally:
+                queue.task_done()
+
+    @staticmethod
+    def _refund(queue: asyncio.Queue, state: Dict):
+        """Ayrılan sayfa bütçesini geri verir; bekletilen ilk URL tekrar kuyruğa girer"""
+        state['claimed'] -= 1
+        if state['parked']:
+            queue.put_nowait(heapq.heappop(state['parked']))
+
+    async def _fetch_and_handle(self, session, url: str,
+                                page_handler: PageHandler) -> Optional[Tuple[Dict, List[str]]]:
+        host = urlparse(url).netloc
+        entry = self.http_cache.lookup(url) if self.http_cache else None
+        if entry and entry.is_fresh:
+            return entry.record, entry.links
+
+        breaker = self.circuit_breaker
+        try:
+            async with self.host_concurrency.slot(host) as slot:
+                if breaker and not breaker.allow(host):
+                    logger.warning(f"Devre açık, sayfa atlandı: {url}")
+                    return None
+                if self.rate_limiter:
+                    await self.rate_limiter.async_wait(host)
+
+                logger.info(f"Sayfa taranıyor (async): {url}")
+                request_headers = entry.conditional_headers() if entry else None
+                slot.begin()
+                try:
+                    response = await session.get(url, headers=request_headers)
+                except (aiohttp.ClientError, asyncio.TimeoutError):
+                    if breaker:
+                        breaker.record_failure(host)
+                    raise
+                slot.observe(response.status)
+                if breaker:
+                    if response.status >= 500:
+                        breaker.record_failure(host)
+                    else:
+                        breaker.record_success(host)
+                async with response:
+                    if response.status == 304 and entry:
+                        entry = self.http_cache.revalidated(entry)
+                        return entry.record, entry.links
+                    if response.status in (429, 503) and self.rate_limiter:
+                        retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                        self.rate_limiter.penalize(host, retry_after or self.default_retry_after)
+                    response.raise_for_status()
+                    response_headers = response.headers
+                    if self.response_gate is None:
+                        content = await response.read()
+                    elif self.response_gate.accepts_headers(url, response_headers):
+                        content = await self.response_gate.async_read_body(
+                            url, response.content.iter_chunked(self.response_gate.chunk_size))
+                    else:
+                        content = None
+
+            if content is None:
+                return None
+
+            if not self.http_cache:
+                return await self._handle_page(page_handler, url, content)
+
+            # Gövde değişmediyse parse etmeden önceki kaydı kullan
+            digest = body_digest(content)
+            if entry and entry.digest == digest:
+                entry = self.http_cache.revalidated(entry, not_modified=False)
+                return entry.record, entry.links
+
+            result = await self._handle_page(page_handler, url, content)
+            if result is not None:
+                self.http_cache.store(url, response_headers, digest, *result)
+            return result
+
+        except Exception as e:
+            logger.error(f"Async sayfa çıkarma hatası {url}: {str(e)}")
+            return None
+
+    @staticmethod
+    async def _handle_page(page_handler: PageHandler, url: str, content: bytes) -> PageResult:
+        """Handler'ı çağırır; awaitable döndürdüyse (havuzda parse) event loop'u bloklamadan bekler"""
+        result = page_handler(url, content)
+        if inspect.isawaitable(result):
+            result = await result
+        return result
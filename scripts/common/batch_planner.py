@@ -0,0 +1,108 @@
+"""
+Batch Planlayıcı - AI Overview Projesi
+Kayıtları yalnızca sayıya göre değil, JSONL satır boyutuna göre de batch'lere
+böler: her batch kayıt ve bayt sınırının altında kalır, aynı penceredeki
+batch'lerin boyutları dengelenir (paralel import'lar birlikte biter).
+"""
+
+import heapq
+import json
+import logging
+from math import ceil
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def jsonl_size(record: Dict) -> int:
+    """Kaydın sıkıştırılmamış JSONL satır boyutu (JsonlWriter ile aynı kodlama)"""
+    return len(json.dumps(record, ensure_ascii=False).encode('utf-8')) + 1
+
+
+class _Bin:
+    __slots__ = ('bytes', 'items')
+
+    def __init__(self):
+        self.bytes = 0
+        self.items: List = []
+
+
+class BatchPlanner:
+    """Boyut farkında batch planlayıcı
+
+    Kayıtlar ``window_batches`` batch'lik pencereler halinde toplanır; pencere
+    sınırların izin verdiği en az sayıda batch'e, büyükten küçüğe sırayla en
+    hafif batch'e eklenerek (LPT) dağıtılır. Sığmayan kayıt için yeni batch
+    açılır. Tek başına ``max_bytes``'ı aşan kayıt kendi batch'ine konur.
+    Bellekte en fazla bir pencere tutulur; batch içinde kayıtların geliş
+    sırası korunur.
+    """
+
+    def __init__(self, max_records: int, max_bytes: Optional[int] = None, window_batches: int = 8,
+                 size_of: Callable[[Dict], int] = jsonl_size):
+        self.max_records = max(1, max_records)
+        self.max_bytes = max_bytes or None
+        self.window_batches = max(1, window_batches)
+        self.size_of = size_of
+        self.stats = {'batches': 0, 'records': 0, 'bytes': 0, 'largest_batch_bytes': 0,
+                      'smallest_batch_bytes': 0, 'oversize_records': 0}
+
+    def plan(self, records: Iterable[Dict]) -> Iterator[List[Dict]]:
+        """Kayıt akışından batch'ler üretir (her pencere dolunca)"""
+        window = []
+        window_bytes = 0
+        max_window_records = self.window_batches * self.max_records
+        max_window_bytes = self.window_batches * self.max_bytes if self.max_bytes else None
+
+        for record in records:
+            size = self.size_of(record)
+            if self.max_bytes and size > self.max_bytes:
+                self.stats['oversize_records'] += 1
+                logger.warning(f"Kayıt batch bayt sınırından büyük, tek başına gönderilecek: "
+                               f"{record.get('url', record.get('id', '?'))} ({size} bayt)")
+            window.append((size, record))
+            window_bytes += size
+            if len(window) >= max_window_records or (max_window_bytes and window_bytes >= max_window_bytes):
+                yield from self._pack(window, window_bytes)
+                window = []
+                window_bytes = 0
+
+        if window:
+            yield from self._pack(window, window_bytes)
+
+    def _pack(self, window: List, window_bytes: int) -> Iterator[List[Dict]]:
+        bin_count = ceil(len(window) / self.max_records)
+        if self.max_bytes:
+            bin_count = max(bin_count, ceil(window_bytes / self.max_bytes))
+        bins = [_Bin() for _ in range(bin_count)]
+        # (yük, sıra no): en hafif batch önce; kayıt sınırına ulaşan batch heap'ten çıkar
+        heap = [(0, index) for index in range(bin_count)]
+
+        for position in sorted(range(len(window)), key=lambda i: window[i][0], reverse=True):
+            size = window[position][0]
+            target = None
+            if heap:
+                load, index = heap[0]
+                # En hafif batch'e sığmıyorsa hiçbirine sığmaz
+                if not self.max_bytes or load + size <= self.max_bytes or not bins[index].items:
+                    heapq.heappop(heap)
+                    target = bins[index]
+            if target is None:
+                index = len(bins)
+                target = _Bin()
+                bins.append(target)
+            target.bytes += size
+            target.items.append(position)
+            if len(target.items) < self.max_records and (not self.max_bytes or target.bytes < self.max_bytes):
+                heapq.heappush(heap, (target.bytes, index))
+
+        for batch in bins:
+            if not batch.items:
+                continue
+            self.stats['batches'] += 1
+            self.stats['records'] += len(batch.items)
+            self.stats['bytes'] += batch.bytes
+            self.stats['largest_batch_bytes'] = max(self.stats['largest_batch_bytes'], batch.bytes)
+            smallest = self.stats['smallest_batch_bytes']
+            self.stats['smallest_batch_bytes'] = min(smallest, batch.bytes) if smallest else batch.bytes
+            yield [window[position][1] for position in sorted(batch.items)]
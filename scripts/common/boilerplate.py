@@ -0,0 +1,198 @@
+"""
+Site Şablonu Tespiti - AI Overview Projesi
+Bir sitenin ilk sayfalarındaki DOM bloklarının parmak izlerini çıkarır; çoğu
+sayfada tekrarlanan blokları (menü, çerez bildirimi, footer) sitenin şablonu
+olarak saklar. Ana içerik seçicisi bulunamayan sayfalarda bu bloklar atlanır.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+from collections import Counter
+from pathlib import Path
+from typing import AbstractSet, Callable, Iterable, List, Optional, Tuple
+
+from bs4 import CData, NavigableString
+
+logger = logging.getLogger(__name__)
+
+# Şablon adayı olan blok elemanları; satır içi elemanlar (span, b, a) tek başına atlanmaz
+BLOCK_TAGS = frozenset([
+    'div', 'section', 'nav', 'header', 'footer', 'aside', 'form',
+    'ul', 'ol', 'li', 'dl', 'table', 'p', 'blockquote', 'figure',
+])
+
+# Metni okunmayan elemanlar (page_parser ile aynı)
+_NON_TEXT_TAGS = frozenset(['script', 'style', 'template'])
+
+
+def _fingerprint(tag: str, parts: List[str]) -> str:
+    return hashlib.blake2b('\x1f'.join([tag, *parts]).encode('utf-8'), digest_size=8).hexdigest()
+
+
+class _Frame:
+    __slots__ = ('element', 'children', 'parts', 'has_text')
+
+    def __init__(self, element, children):
+        self.element = element
+        self.children = children
+        self.parts: List[str] = []
+        self.has_text = False
+
+    def add_text(self, text: Optional[str]):
+        if text:
+            text = ' '.join(text.split())
+            if text:
+                self.parts.append(text)
+                self.has_text = True
+
+    def finish(self, tag: str, blocks: List, parent: Optional['_Frame']) -> str:
+        fingerprint = _fingerprint(tag, self.parts)
+        if self.has_text and tag in BLOCK_TAGS:
+            blocks.append((self.element, fingerprint))
+        if parent is not None:
+            parent.parts.append(fingerprint)
+            parent.has_text |= self.has_text
+        return fingerprint
+
+
+def lxml_block_fingerprints(root) -> List[Tuple]:
+    """lxml ağacındaki metin içeren blokların (eleman, parmak izi) çiftleri
+
+    İz, etiketin, normalize edilmiş metin parçalarının ve alt elemanların
+    izlerinin özetidir (Merkle); öznitelikler (ör. aktif menü sınıfı) katılmaz.
+    Ağaç tek geçişte, özyinelemesiz dolaşılır.
+    """
+    blocks = []
+    stack = [_Frame(root, iter(root))]
+    stack[0].add_text(root.text)
+    while stack:
+        frame = stack[-1]
+        child = next(frame.children, None)
+        if child is None:
+            stack.pop()
+            frame.finish(frame.element.tag, blocks, stack[-1] if stack else None)
+            if stack:
+                stack[-1].add_text(frame.element.tail)
+            continue
+        if isinstance(child.tag, str) and child.tag not in _NON_TEXT_TAGS:
+            child_frame = _Frame(child, iter(child))
+            child_frame.add_text(child.text)
+            stack.append(child_frame)
+        else:
+            # Yorum, script, style: içerik atlanır, kardeş metin korunur
+            frame.add_text(child.tail)
+    return blocks
+
+
+def bs4_block_fingerprints(root) -> List[Tuple]:
+    """BeautifulSoup ağacı için lxml_block_fingerprints karşılığı (iyi biçimli HTML'de aynı izler)"""
+    blocks = []
+    stack = [_Frame(root, iter(root.contents))]
+    while stack:
+        frame = stack[-1]
+        child = next(frame.children, None)
+        if child is None:
+            stack.pop()
+            frame.finish(frame.element.name, blocks, stack[-1] if stack else None)
+            continue
+        if isinstance(child, NavigableString):
+            if type(child) in (NavigableString, CData):  # Yorum, doctype vb. atlanır
+                frame.add_text(child)
+        elif child.name not in _NON_TEXT_TAGS:
+            stack.append(_Frame(child, iter(child.contents)))
+    return blocks
+
+
+def template_blocks(blocks: List[Tuple], template: AbstractSet[str],
+                    parent_of: Callable) -> List:
+    """Şablona ait en dıştaki bloklar (içlerindeki bloklar ayrıca listelenmez)
+
+    Elemanlar id ile karşılaştırılır: bs4 Tag'leri içeriğe göre eşit sayılır.
+    """
+    matched = {id(element): element for element, fingerprint in blocks if fingerprint in template}
+    outermost = []
+    for element in matched.values():
+        parent = parent_of(element)
+        while parent is not None and id(parent) not in matched:
+            parent = parent_of(parent)
+        if parent is None:
+            outermost.append(element)
+    return outermost
+
+
+class BoilerplateLearner:
+    """Sitenin ilk ``sample_pages`` sayfasından şablon bloklarını öğrenir
+
+    Bir blok, örnek sayfaların en az ``min_page_ratio`` oranında görülürse
+    şablona girer. Şablon hazır olunca ``template`` (parmak izi kümesi) döner;
+    ``save``/``load`` ile site başına saklanır, sonraki taramalarda yeniden
+    öğrenilmez.
+    """
+
+    def __init__(self, sample_pages: int = 10, min_page_ratio: float = 0.6):
+        self.sample_pages = max(2, sample_pages)
+        self.min_page_ratio = min_page_ratio
+        self.template: Optional[frozenset] = None
+        self.learned_at: Optional[float] = None
+        self._counts = Counter()
+        self._pages = 0
+
+    @property
+    def ready(self) -> bool:
+        return self.template is not None
+
+    def observe(self, fingerprints: Iterable[str]):
+        """Örnek sayfanın blok izlerini sayar; yeterli sayfa görülünce şablonu oluşturur"""
+        if self.ready:
+            return
+        self._counts.update(set(fingerprints))
+        self._pages += 1
+        if self._pages >= self.sample_pages:
+            min_pages = self.min_page_ratio * self._pages
+            self.template = frozenset(fp for fp, count in self._counts.items() if count >= min_pages)
+            self.learned_at = time.time()
+            self._counts.clear()
+            logger.info(f"Site şablonu öğrenildi: {len(self.template)} blok ({self._pages} sayfadan)")
+
+    def save(self, path: Path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        state = {
+            'learned_at': self.learned_at,
+            'sample_pages': self._pages,
+            'min_page_ratio': self.min_page_ratio,
+            'template': sorted(self.template or ()),
+        }
+        temp_path = path.with_suffix('.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path: Path, max_age_seconds: Optional[float] = None,
+             sample_pages: int = 10, min_page_ratio: float = 0.6) -> 'BoilerplateLearner':
+        """Saklanan şablonu yükler; yoksa ya da eskidiyse öğrenmeye baştan başlar"""
+        learner = cls(sample_pages, min_page_ratio)
+        path = Path(path)
+        if not path.exists():
+            return learner
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            learned_at = float(state['learned_at'])
+            template = frozenset(state['template'])
+            pages = int(state['sample_pages'])
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            # Bozuk ya da eksik alanlı dosya: şablon yeniden öğrenilir
+            logger.warning(f"Site şablonu okunamadı {path}: {e!r}")
+            return learner
+        if max_age_seconds is not None and time.time() - learned_at > max_age_seconds:
+            logger.info(f"Site şablonu eski, yeniden öğrenilecek: {path}")
+            return learner
+        learner.template = template
+        learner.learned_at = learned_at
+        learner._pages = pages
+        return learner
@@ -0,0 +1,178 @@
+"""
+Tarama Checkpoint'i - AI Overview Projesi
+Uzun taramalarda frontier'ı, görülmüş URL indekslerini, tamamlanan kayıtları ve
+bağlantı grafını periyodik olarak diske yazar; yarıda kalan tarama kaldığı yerden sürdürülür.
+"""
+
+import base64
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from .frontier import CrawlFrontier, UrlSeenIndex
+from .link_graph import LinkGraph
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_VERSION = 1
+
+
+class CrawlCheckpoint:
+    """Durum dosyası + kayıt dosyası (JSONL) çifti
+
+    Kayıtlar tamamlandıkça kayıt dosyasına eklenir. Durum dosyası her
+    ``interval`` sayfada bir atomik olarak yazılır ve o andaki kayıt dosyası
+    boyutunu içerir; devam ederken bu boyutun ötesindeki (durumu kaydedilmemiş)
+    kayıtlar kesilir, böylece hiçbir sayfa iki kez yazılmaz. Bağlantı grafı
+    verilirse her kayıtta ayrı bir .npz dosyasına yazılır; durum dosyası o
+    kayda ait grafı gösterir, eskisi durum yazıldıktan sonra silinir.
+    """
+
+    def __init__(self, state_path: Path, interval: int = 50):
+        self.state_path = Path(state_path)
+        self.records_path = self.state_path.with_suffix('.records.jsonl')
+        self.interval = max(1, interval)
+        self._records_file = None
+        self._pages_since_save = 0
+
+    def exists(self) -> bool:
+        return self.state_path.exists()
+
+    def load(self, start_url: str, max_memory_urls: int = 0,
+             spill_dir: Optional[Path] = None, frontier_factory=CrawlFrontier.from_state) -> Optional[Dict]:
+        """Kaydedilmiş durumu yükler; kayıt dosyası kaydedilen boyuta kesilir
+
+        Checkpoint yoksa ya da başka bir başlangıç URL'ine aitse None döner.
+        Tamamlanan kayıtlar iter_saved_records() ile akış halinde okunur.
+        frontier_factory(pending, seen, max_memory_urls=, spill_dir=, entries=)
+        kuyruğu kurar (ör. PriorityFrontier.from_state).
+        """
+        if not self.exists():
+            return None
+        with open(self.state_path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        if state.get('version') != CHECKPOINT_VERSION or state.get('start_url') != start_url:
+            logger.warning(f"Checkpoint bu tarama ile uyumsuz, yok sayılıyor: {self.state_path}")
+            return None
+
+        if self.records_path.exists():
+            with open(self.records_path, 'r+b') as f:
+                f.truncate(state['records_offset'])
+
+        frontier = frontier_factory(
+            state['pending'], UrlSeenIndex.from_bytes(base64.b64decode(state['seen'])),
+            max_memory_urls=max_memory_urls, spill_dir=spill_dir, entries=state.get('frontier_entries')
+        )
+        link_graph = None
+        if state.get('link_graph'):
+            try:
+                link_graph = LinkGraph.load(self.state_path.parent / state['link_graph'])
+            except (ImportError, OSError, ValueError, KeyError) as e:
+                logger.warning(f"Checkpoint bağlantı grafı okunamadı: {str(e)}")
+        logger.info(f"Checkpoint yüklendi: {state['completed_pages']} sayfa tamamlanmış, "
+                    f"{len(frontier)} URL kuyrukta ({self.state_path})")
+        return {
+            'frontier': frontier,
+            'emitted': UrlSeenIndex.from_bytes(base64.b64decode(state['emitted'])),
+            'completed_pages': state['completed_pages'],
+            'link_graph': link_graph,
+        }
+
+    def iter_saved_records(self) -> Iterator[Dict]:
+        """load() sonrası kayıt dosyasındaki tamamlanmış kayıtlar, satır satır"""
+        if not self.records_path.exists():
+            return
+        with open(self.records_path, 'rb') as f:
+            for line in f:
+                yield json.loads(line)
+
+    def open(self, resume: bool):
+        """Kayıt dosyasını açar; devam edilmiyorsa eski checkpoint silinir"""
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        if not resume:
+            self.clear()
+        self._records_file = open(self.records_path, 'ab')
+        self._pages_since_save = 0
+
+    def record_page(self, record: Optional[Dict]):
+        """Tamamlanan sayfanın kaydını kayıt dosyasına ekler"""
+        if record is not None:
+            self._records_file.write(json.dumps(record, ensure_ascii=False).encode('utf-8') + b'\n')
+        self._pages_since_save += 1
+
+    def maybe_save(self, start_url: str, frontier: CrawlFrontier, emitted: UrlSeenIndex,
+                   completed_pages: int, link_graph: Optional[LinkGraph] = None):
+        if self._pages_since_save >= self.interval:
+            self.save(start_url, frontier, emitted, completed_pages, link_graph)
+
+    def save(self, start_url: str, frontier: CrawlFrontier, emitted: UrlSeenIndex,
+             completed_pages: int, link_graph: Optional[LinkGraph] = None):
+        """Durumu geçici dosyaya yazıp atomik olarak yerine taşır"""
+        self._records_file.flush()
+        os.fsync(self._records_file.fileno())
+        state = {
+            'version': CHECKPOINT_VERSION,
+            'start_url': start_url,
+            'saved_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'completed_pages': completed_pages,
+            'records_offset': self._records_file.tell(),
+            'pending': self._pending_urls(frontier),
+            'seen': base64.b64encode(frontier.seen.to_bytes()).decode('ascii'),
+            'emitted': base64.b64encode(emitted.to_bytes()).decode('ascii'),
+        }
+        if hasattr(frontier, 'export_entries'):
+            # Öncelikli frontier: derinlik ve gelen bağlantılar devamda puanları korur
+            state['frontier_entries'] = frontier.export_entries()
+        if link_graph is not None:
+            state['link_graph'] = self._save_link_graph(link_graph, completed_pages)
+        temp_path = self.state_path.with_suffix('.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.state_path)
+        self._remove_link_graphs(keep=state.get('link_graph'))
+        self._pages_since_save = 0
+        logger.info(f"Checkpoint kaydedildi: {completed_pages} sayfa ({self.state_path})")
+
+    def _save_link_graph(self, link_graph: LinkGraph, completed_pages: int) -> Optional[str]:
+        """Grafı bu kayda özel dosyaya yazar; dosya adını (numpy yoksa None) döndürür"""
+        name = f"{self.state_path.stem}.graph.{completed_pages}.npz"
+        try:
+            link_graph.save(self.state_path.parent / name)
+        except ImportError as e:
+            logger.warning(f"Bağlantı grafı checkpoint'e yazılamadı: {str(e)}")
+            return None
+        return name
+
+    def _remove_link_graphs(self, keep: Optional[str] = None):
+        for path in self.state_path.parent.glob(f"{self.state_path.stem}.graph.*.npz"):
+            if path.name != keep:
+                path.unlink()
+
+    @staticmethod
+    def _pending_urls(frontier: CrawlFrontier) -> List[str]:
+        """Kuyruk + işlenirken kesilmiş URL'ler (indirilmekte ya da parse edilmekte)
+
+        Devamda bu URL'ler önce indirilir; tamamlanmış olsalar bile üretilmiş
+        sayfalar indeksi sayesinde kayıtları tekrar yazılmaz.
+        """
+        pending = frontier.in_progress
+        pending.extend(frontier.pending_urls())
+        return pending
+
+    def close(self):
+        if self._records_file:
+            self._records_file.close()
+            self._records_file = None
+
+    def clear(self):
+        """Tarama başarıyla bitince checkpoint dosyalarını siler"""
+        self.close()
+        for path in (self.state_path, self.records_path):
+            if path.exists():
+                path.unlink()
+        self._remove_link_graphs()
@@ -0,0 +1,156 @@
+"""
+Sıkıştırma Yardımcıları - AI Overview Projesi
+Ham veri ve batch dosyalarını dosya sonekine göre (.gz / .zst) sıkıştırarak
+yazar; okurken biçimi imzadan tanıyıp şeffaf olarak açar.
+"""
+
+import gzip
+import io
+from pathlib import Path
+from typing import BinaryIO, Optional, Union
+
+try:
+    import zstandard
+except ImportError:  # Opsiyonel bağımlılık: yoksa yalnızca gzip kullanılabilir
+    zstandard = None
+
+GZIP = 'gzip'
+ZSTD = 'zstd'
+
+CODEC_SUFFIXES = {GZIP: '.gz', ZSTD: '.zst'}
+CODEC_CONTENT_TYPES = {GZIP: 'application/gzip', ZSTD: 'application/zstd'}
+
+GZIP_MAGIC = b'\x1f\x8b'
+ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+
+
+def codec_for_name(name: Union[str, Path]) -> Optional[str]:
+    """Dosya adının sonekinden sıkıştırma biçimi ('gzip', 'zstd' ya da None)"""
+    name = str(name)
+    for codec, suffix in CODEC_SUFFIXES.items():
+        if name.endswith(suffix):
+            return codec
+    return None
+
+
+def with_codec_suffix(name: str, codec: Optional[str]) -> str:
+    """Ada biçimin sonekini ekler: 'a.jsonl' + 'zstd' -> 'a.jsonl.zst'"""
+    if not codec or codec_for_name(name) == codec:
+        return name
+    return strip_codec_suffix(name) + CODEC_SUFFIXES[_checked(codec)]
+
+
+def strip_codec_suffix(name: str) -> str:
+    codec = codec_for_name(name)
+    return name[:-len(CODEC_SUFFIXES[codec])] if codec else name
+
+
+def _checked(codec: str) -> str:
+    if codec not in CODEC_SUFFIXES:
+        raise ValueError(f"Bilinmeyen sıkıştırma biçimi: {codec} (seçenekler: {', '.join(CODEC_SUFFIXES)})")
+    if codec == ZSTD and zstandard is None:
+        raise ImportError("zstd sıkıştırma için zstandard gerekli: pip install zstandard")
+    return codec
+
+
+class _ClosingWriter(io.RawIOBase):
+    """Sıkıştırıcıyı kapatınca alttaki akışı da kapatan yazıcı"""
+
+    def __init__(self, compressor, raw: BinaryIO):
+        self._compressor = compressor
+        self._raw = raw
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._compressor.write(data)
+        return len(data)
+
+    def close(self):
+        if not self.closed:
+            self._compressor.close()  # Çerçeve/trailer yazılır
+            self._raw.close()
+        super().close()
+
+
+def compressing_writer(stream: BinaryIO, codec: Optional[str]) -> BinaryIO:
+    """codec verilirse akışa sıkıştırarak yazan sarmalayıcı; close() alttaki akışı da kapatır"""
+    if not codec:
+        return stream
+    if _checked(codec) == GZIP:
+        compressor = gzip.GzipFile(fileobj=stream, mode='wb', compresslevel=GZIP_LEVEL)
+    else:
+        compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL).stream_writer(stream, closefd=False)
+    return _ClosingWriter(compressor, stream)
+
+
+class _PeekedStream:
+    """Baştan okunmuş byte'ları akışın önüne geri ekleyen sarmalayıcı"""
+
+    def __init__(self, stream: BinaryIO, head: bytes):
+        self._stream = stream
+        self._head = head
+
+    def read(self, size: int = -1) -> bytes:
+        if not self._head:
+            return self._stream.read(size)
+        if size is None or size < 0:
+            data, self._head = self._head + self._stream.read(), b''
+            return data
+        data, self._head = self._head[:size], self._head[size:]
+        if len(data) < size:
+            data += self._stream.read(size - len(data))
+        return data
+
+
+def decompressing_reader(stream: BinaryIO) -> BinaryIO:
+    """gzip ya da zstd imzası varsa akışı açarak döndürür; yoksa olduğu gibi"""
+    head = stream.read(len(ZSTD_MAGIC))
+    peeked = _PeekedStream(stream, head)
+    if head.startswith(GZIP_MAGIC):
+        return gzip.GzipFile(fileobj=peeked)
+    if head == ZSTD_MAGIC:
+        _checked(ZSTD)
+        return zstandard.ZstdDecompressor().stream_reader(peeked, read_across_frames=True)
+    return peeked
+
+
+def gzip_for_transcoding(path: Path) -> bytes:
+    """Dosyanın içeriği gzip'li olarak (Content-Encoding: gzip ile yüklemek için)
+
+    Cloud Storage yalnızca gzip için okuyucuya açarak servis eder; zstd ya da
+    sıkıştırmasız dosyalar gzip'e çevrilir.
+    """
+    path = Path(path)
+    if codec_for_name(path) == GZIP:
+        return path.read_bytes()
+    with open(path, 'rb') as f:
+        return gzip.compress(decompressing_reader(f).read(), compresslevel=GZIP_LEVEL)
+
+
+def import_object_name(path: Path) -> str:
+    """Vertex'e import edilecek nesnenin adı: sıkıştırma soneki atılır (batch_x.jsonl)"""
+    return strip_codec_suffix(Path(path).name)
+
+
+def upload_for_import(blob, path: Path, gzip_encoding: bool = True,
+                      content_type: str = 'application/jsonl'):
+    """Yerel batch dosyasını import yolunun okuyabileceği biçimde GCS'ye yükler
+
+    gzip_encoding=True ise gzip'li gövde Content-Encoding: gzip ile yüklenir
+    (depolama ve aktarım sıkıştırılmış, okuyan düz JSONL görür); değilse dosya
+    açılıp sıkıştırmasız yüklenir.
+    """
+    path = Path(path)
+    if gzip_encoding:
+        blob.content_encoding = 'gzip'
+        blob.upload_from_string(gzip_for_transcoding(path), content_type=content_type)
+    elif codec_for_name(path):
+        with open(path, 'rb') as f:
+            blob.upload_from_string(decompressing_reader(f).read(), content_type=content_type)
+    else:
+        blob.upload_from_filename(str(path), content_type=content_type)
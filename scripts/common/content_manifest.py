@@ -0,0 +1,168 @@
+"""
+İçerik Manifest'i - AI Overview Projesi
+URL başına içerik özetini çalıştırmalar arasında saklar. Artımlı modda yalnızca
+eklenen, değişen ve silinen sayfalar batch ve import adımlarına aktarılır.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from pathlib import Path
+from typing import Callable, Container, Dict, Iterable, Iterator, Optional
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+
+# Kayıttaki değişiklik türü alanı
+CHANGE_FIELD = 'change'
+ADDED = 'added'
+CHANGED = 'changed'
+DELETED = 'deleted'
+
+# İndekslenen alanlar; extracted_at gibi her çalıştırmada değişenler özete katılmaz
+HASHED_FIELDS = ('title', 'meta_description', 'content', 'headings')
+
+
+def content_hash(record: Dict) -> str:
+    """Kaydın indekslenen alanlarının özeti"""
+    payload = json.dumps([record.get(field) for field in HASHED_FIELDS],
+                         ensure_ascii=False, sort_keys=True)
+    return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def document_id(url: str) -> str:
+    """URL'den türetilen kararlı Vertex AI doküman kimliği (güncelleme ve silme aynı dokümanı bulur)"""
+    return hashlib.sha256(url.encode('utf-8')).hexdigest()[:32]
+
+
+class ContentManifest:
+    """URL -> içerik özeti eşlemesi"""
+
+    def __init__(self, hashes: Optional[Dict[str, str]] = None):
+        self.hashes: Dict[str, str] = dict(hashes or {})
+
+    def __len__(self) -> int:
+        return len(self.hashes)
+
+    def __contains__(self, url: str) -> bool:
+        return url in self.hashes
+
+    @classmethod
+    def load(cls, path: Path) -> 'ContentManifest':
+        """Manifest dosyasını okur; dosya yoksa boş manifest döner"""
+        path = Path(path)
+        if not path.exists():
+            return cls()
+        with open(path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        if state.get('version') != MANIFEST_VERSION:
+            logger.warning(f"Manifest sürümü uyumsuz, yok sayılıyor: {path}")
+            return cls()
+        return cls(state['pages'])
+
+    def save(self, path: Path):
+        """Geçici dosyaya yazıp atomik olarak yerine taşır"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        state = {
+            'version': MANIFEST_VERSION,
+            'saved_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'pages': self.hashes,
+        }
+        temp_path = path.with_suffix('.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+
+
+class ManifestStore:
+    """Site başına manifest dosyası ve henüz import edilmemiş (bekleyen) sürümü
+
+    Yeni manifest önce bekleyen dosyaya yazılır; import başarıyla bitince
+    ``commit`` ile asıl manifest olur. Böylece yarıda kalan bir çalıştırmanın
+    değişiklikleri sonraki çalıştırmada yeniden gönderilir.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.pending_path = self.path.with_suffix('.pending.json')
+
+    @classmethod
+    def for_site(cls, directory: Path, start_url: str) -> 'ManifestStore':
+        name = re.sub(r'[^A-Za-z0-9._-]+', '_', urlparse(start_url).netloc) or 'site'
+        return cls(Path(directory) / f"manifest_{name}.json")
+
+    def load(self) -> ContentManifest:
+        return ContentManifest.load(self.path)
+
+    def stage(self, manifest: ContentManifest):
+        manifest.save(self.pending_path)
+        logger.info(f"Yeni manifest import sonrası için hazırlandı: {self.pending_path} ({len(manifest)} URL)")
+
+    def commit(self) -> bool:
+        """Bekleyen manifest'i asıl manifest yapar"""
+        if not self.pending_path.exists():
+            return False
+        os.replace(self.pending_path, self.path)
+        logger.info(f"Manifest güncellendi: {self.path}")
+        return True
+
+
+class ManifestDelta:
+    """Kayıt akışını önceki manifest'le karşılaştırır
+
+    ``iter_changes`` eklenen ve değişen kayıtları ``change`` alanıyla işaretleyip
+    üretir, değişmeyenleri atlar. Akış bitince önceki manifest'te olup bu
+    çalıştırmada görülmeyen URL'ler yalnızca kesin olarak kaldırılmışsa
+    ``{'url', 'change': 'deleted'}`` olarak üretilir: sayfa 404/410 döndüyse
+    (``gone_urls``) ya da tarama max_pages'e ulaşmadan bittiği halde keşif
+    (sitemap ya da bağlantılar) artık URL'i listelemiyorsa. ``discovered_urls``
+    akış bitince çağrılır ve eksiksiz keşfin URL kümesini (eksikse None)
+    döndürür. Zaman aşımı, 5xx/429, devre kesici gibi geçici hatalarla
+    görülmeyen sayfaların özetleri yeni manifest'e taşınır.
+    """
+
+    def __init__(self, previous: ContentManifest):
+        self.previous = previous
+        self.current = ContentManifest()
+        self.stats = {ADDED: 0, CHANGED: 0, 'unchanged': 0, DELETED: 0, 'kept': 0}
+
+    def iter_changes(self, records: Iterable[Dict], max_pages: Optional[int] = None,
+                     gone_urls: Container[str] = (),
+                     discovered_urls: Optional[Callable[[], Optional[Container[str]]]] = None) -> Iterator[Dict]:
+        for record in records:
+            url = record['url']
+            digest = content_hash(record)
+            self.current.hashes[url] = digest
+            previous = self.previous.hashes.get(url)
+            if previous == digest:
+                self.stats['unchanged'] += 1
+                continue
+            change = ADDED if previous is None else CHANGED
+            self.stats[change] += 1
+            record[CHANGE_FIELD] = change
+            yield record
+
+        complete = max_pages is None or len(self.current) < max_pages
+        discovered = discovered_urls() if discovered_urls and complete else None
+        for url, digest in self.previous.hashes.items():
+            if url in self.current:
+                continue
+            if url in gone_urls or (discovered is not None and url not in discovered):
+                self.stats[DELETED] += 1
+                yield {'url': url, CHANGE_FIELD: DELETED}
+            else:
+                self.stats['kept'] += 1
+                self.current.hashes[url] = digest
+
+        if self.stats['kept']:
+            logger.info(f"{self.stats['kept']} sayfa bu çalıştırmada alınamadı ya da keşif eksik kaldı; "
+                        f"silinmiş sayılmadı")
+        logger.info(f"Artımlı değişiklikler: {self.stats}")
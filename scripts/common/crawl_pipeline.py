@@ -0,0 +1,128 @@
+"""
+Tek Geçişli Tarama Hattı - AI Overview Projesi
+Her URL'i bir kez indirir, bir kez parse eder; bağlantıları ve sayfa kaydını birlikte üretir.
+"""
+
+import logging
+from collections import deque
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+from .frontier import CrawlFrontier, UrlSeenIndex
+from .parse_pool import PendingParse
+from .url_canonicalizer import canonicalize_url, resolve_page_url
+
+logger = logging.getLogger(__name__)
+
+
+class CrawlResult(NamedTuple):
+    """Taranan tek bir sayfanın sonucu"""
+    url: str
+    record: Optional[Dict]  # Kayıt üretilmediyse None (ör. çok kısa içerik)
+    links: List[str]
+
+
+class CachedPage(NamedTuple):
+    """Önbellekten gelen, yeniden parse edilmesi gerekmeyen sayfa"""
+    record: Optional[Dict]
+    links: List[str]
+
+
+# url -> ham içerik, önbellekteki sayfa ya da başarısızsa None
+FetchFunc = Callable[[str], Union[bytes, CachedPage, None]]
+# (url, içerik) -> (kayıt, giden bağlantılar) ya da havuzda parse edilen PendingParse
+ParseFunc = Callable[[str, bytes], Union[Tuple[Optional[Dict], List[str]], PendingParse]]
+
+
+def crawl_and_extract(start_url: str, max_pages: int, fetch_page: FetchFunc,
+                      parse_page: ParseFunc,
+                      link_filter: Optional[Callable[[str], bool]] = None,
+                      frontier: Optional[CrawlFrontier] = None,
+                      canonicalize: Optional[Callable[[str], str]] = canonicalize_url,
+                      emitted: Optional[UrlSeenIndex] = None,
+                      completed_pages: int = 0,
+                      parse_window: int = 1) -> Iterator[CrawlResult]:
+    """Frontier sırasıyla tarama: başarıyla indirilen her mantıksal sayfa için bir CrawlResult üretir
+
+    max_pages başarıyla indirilen sayfa sayısını sınırlar. Keşif ve içerik
+    çıkarma aynı indirme ve aynı parse üzerinden yapılır. Tüm URL'ler kanonik
+    biçimde kuyruğa girer; <link rel=canonical> ile daha önce üretilmiş bir
+    sayfayı gösteren kopyalar atlanır. Varsayılan frontier FIFO'dur (BFS);
+    PriorityFrontier verilirse bütçe önce en değerli sayfalara harcanır.
+
+    parse_page PendingParse döndürüyorsa (işlem havuzu) indirme, önceki
+    sayfalar parse edilirken sürer; en fazla ``parse_window`` sayfa bekler.
+    Sonuçlar her zaman indirme sırasıyla işlenir ve pencere yalnızca dolunca
+    ya da kuyruk boşalınca beklenir, bu yüzden FIFO frontier'da sayfa sırası
+    ve kayıtlar sıralı taramayla aynıdır (öncelikli frontier'da bekleyen
+    sayfaların bağlantıları sıralamaya biraz geç katılır).
+
+    Kaldığı yerden devam için checkpoint'teki frontier, üretilmiş sayfaların
+    indeksi (emitted) ve tamamlanan sayfa sayısı verilebilir.
+    """
+    if canonicalize is None:
+        canonicalize = _identity
+    if frontier is None:
+        frontier = CrawlFrontier()
+    frontier.add(canonicalize(start_url))
+    if emitted is None:
+        emitted = UrlSeenIndex()
+    pages_fetched = completed_pages
+    in_flight = deque()  # (url, CachedPage | parse sonucu | PendingParse), indirme sırasıyla
+
+    while pages_fetched < max_pages:
+        # İndirme aşaması: pencerede yer varsa ve bütçe bekleyenlerle dolmadıysa
+        if frontier and len(in_flight) < parse_window and pages_fetched + len(in_flight) < max_pages:
+            url = frontier.pop()
+            content = fetch_page(url)
+            if content is None:
+                frontier.done(url)
+                continue
+            if isinstance(content, CachedPage):
+                in_flight.append((url, content))
+                continue
+            try:
+                in_flight.append((url, parse_page(url, content)))
+            except Exception as e:
+                logger.error(f"Sayfa parse hatası {url}: {str(e)}")
+                frontier.done(url)
+            continue
+
+        if not in_flight:
+            break
+
+        # Parse aşaması: en eski sayfanın sonucu
+        url, parsed = in_flight.popleft()
+        try:
+            record, links = parsed.result() if isinstance(parsed, PendingParse) else parsed
+        except Exception as e:
+            logger.error(f"Sayfa parse hatası {url}: {str(e)}")
+            frontier.done(url)
+            continue
+
+        page_url = resolve_page_url(url, record.get('canonical_url') if record else None,
+                                    canonicalize, link_filter)
+        if not emitted.add(page_url):
+            logger.info(f"Kopya sayfa atlandı: {url} (canonical: {page_url})")
+            frontier.done(url)
+            continue
+        if page_url != url:
+            # Canonical URL ayrıca indirilmesin
+            frontier.mark_seen(page_url)
+        if record:
+            record['url'] = page_url
+
+        pages_fetched += 1
+
+        links = [canonicalize(link) for link in links]
+        # Kuyruktaki URL'lere de bildirilir: öncelikli frontier gelen bağlantıları sayar
+        for link in dict.fromkeys(links):
+            if link not in frontier and link_filter and not link_filter(link):
+                continue
+            frontier.add(link, parent=url)
+        frontier.done(url)
+
+        yield CrawlResult(page_url, record, links)
+
+
+def _identity(url: str) -> str:
+    return url
@@ -0,0 +1,174 @@
+"""
+Tarama Sınırı (Frontier) - AI Overview Projesi
+O(1) ekleme/çıkarma yapan FIFO kuyruk, hash tabanlı görülmüş URL indeksi ve
+isteğe bağlı diske taşma desteği.
+"""
+
+import hashlib
+import tempfile
+from collections import deque
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+
+class UrlSeenIndex:
+    """Görülmüş URL'lerin hash indeksi
+
+    URL'ler 8 byte'lık blake2b özetleri olarak tutulur; yüz binlerce URL'de
+    bellek kullanımı URL uzunluğundan bağımsız kalır.
+    """
+
+    def __init__(self):
+        self._digests = set()
+
+    @staticmethod
+    def _key(url: str) -> bytes:
+        return hashlib.blake2b(url.encode('utf-8'), digest_size=8).digest()
+
+    def add(self, url: str) -> bool:
+        """URL yeni ise ekler ve True döndürür"""
+        key = self._key(url)
+        if key in self._digests:
+            return False
+        self._digests.add(key)
+        return True
+
+    def __contains__(self, url: str) -> bool:
+        return self._key(url) in self._digests
+
+    def __len__(self) -> int:
+        return len(self._digests)
+
+    def to_bytes(self) -> bytes:
+        """Özetlerin ardışık ikili dökümü (checkpoint için)"""
+        return b''.join(self._digests)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'UrlSeenIndex':
+        index = cls()
+        index._digests = {data[i:i + 8] for i in range(0, len(data), 8)}
+        return index
+
+
+class CrawlFrontier:
+    """FIFO tarama kuyruğu
+
+    Her URL kuyruğa en fazla bir kez girer. ``max_memory_urls`` verilirse bu
+    sayıyı aşan URL'ler geçici bir dosyaya yazılır ve bellek kuyruğu boşaldıkça
+    sırayla geri okunur; FIFO sırası korunur.
+    """
+
+    def __init__(self, start_urls: Iterable[str] = (), max_memory_urls: int = 0,
+                 spill_dir: Optional[Path] = None):
+        self.max_memory_urls = max_memory_urls
+        self.spill_dir = spill_dir
+        self.seen = UrlSeenIndex()
+        self._in_progress: Dict[str, None] = {}  # Pop edilmiş, henüz tamamlanmamış URL'ler
+
+        self._queue = deque()
+        self._spill_file = None
+        self._spill_read_pos = 0
+        self._spill_count = 0
+
+        for url in start_urls:
+            self.add(url)
+
+    def add(self, url: str, parent: Optional[str] = None) -> bool:
+        """URL daha önce görülmediyse kuyruğa ekler (parent FIFO sırasını etkilemez)"""
+        if not self.seen.add(url):
+            return False
+        self._enqueue(url)
+        return True
+
+    @classmethod
+    def from_state(cls, pending: Iterable[str], seen: UrlSeenIndex, max_memory_urls: int = 0,
+                   spill_dir: Optional[Path] = None, entries: Optional[Dict] = None) -> 'CrawlFrontier':
+        """Checkpoint'ten kuyruk sırasını ve görülmüş URL indeksini geri yükler
+
+        entries (öncelikli frontier'ın URL bilgileri) FIFO sırası için kullanılmaz.
+        """
+        frontier = cls(max_memory_urls=max_memory_urls, spill_dir=spill_dir)
+        frontier.seen = seen
+        for url in pending:
+            frontier._enqueue(url)
+        return frontier
+
+    def pending_urls(self) -> Iterator[str]:
+        """Kuyruktaki URL'ler, sırayla ve kuyruğu tüketmeden"""
+        yield from list(self._queue)
+        if self._spill_count:
+            self._spill_file.seek(self._spill_read_pos)
+            for _ in range(self._spill_count):
+                yield self._spill_file.readline().rstrip(b'\n').decode('utf-8')
+
+    def _enqueue(self, url: str):
+        # Taşma başladıysa sıra bozulmasın diye yeni URL'ler de dosyaya gider
+        if self._spill_count or (self.max_memory_urls and len(self._queue) >= self.max_memory_urls):
+            self._spill(url)
+        else:
+            self._queue.append(url)
+
+    def mark_seen(self, url: str) -> bool:
+        """URL'i kuyruğa eklemeden görülmüş sayar"""
+        return self.seen.add(url)
+
+    def pop(self) -> str:
+        """Sıradaki URL'i döndürür; kuyruk boşsa IndexError"""
+        if not self._queue and self._spill_count:
+            self._refill()
+        url = self._queue.popleft()
+        self._in_progress[url] = None
+        return url
+
+    def done(self, url: str):
+        """Pop edilen URL'in işlenmesi bitti (başarılı ya da değil)"""
+        self._in_progress.pop(url, None)
+
+    @property
+    def in_progress(self) -> List[str]:
+        """Pop edilmiş ama henüz tamamlanmamış URL'ler, pop sırasıyla"""
+        return list(self._in_progress)
+
+    def __contains__(self, url: str) -> bool:
+        return url in self.seen
+
+    def __len__(self) -> int:
+        return len(self._queue) + self._spill_count
+
+    def __bool__(self) -> bool:
+        return bool(self._queue) or self._spill_count > 0
+
+    def close(self):
+        """Taşma dosyasını kapatır (geçici dosya otomatik silinir)"""
+        if self._spill_file:
+            self._spill_file.close()
+            self._spill_file = None
+        self._spill_read_pos = 0
+        self._spill_count = 0
+
+    def _spill(self, url: str):
+        if self._spill_file is None:
+            if self.spill_dir:
+                Path(self.spill_dir).mkdir(parents=True, exist_ok=True)
+            self._spill_file = tempfile.TemporaryFile(dir=self.spill_dir)
+        self._spill_file.seek(0, 2)
+        self._spill_file.write(url.encode('utf-8') + b'\n')
+        self._spill_count += 1
+
+    def _refill(self):
+        """Taşma dosyasından bellek kuyruğunu doldurur"""
+        batch_size = self.max_memory_urls or self._spill_count
+        self._spill_file.seek(self._spill_read_pos)
+
+        while self._spill_count and len(self._queue) < batch_size:
+            line = self._spill_file.readline()
+            self._queue.append(line.rstrip(b'\n').decode('utf-8'))
+            self._spill_count -= 1
+
+        self._spill_read_pos = self._spill_file.tell()
+
+        # Dosya tamamen tüketildiyse baştan kullan
+        if not self._spill_count:
+            self._spill_file.seek(0)
+            self._spill_file.truncate()
+            self._spill_read_pos = 0
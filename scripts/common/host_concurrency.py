@@ -0,0 +1,209 @@
+"""
+Host Başına Eşzamanlılık - AI Overview Projesi
+Async tarayıcının host başına eşzamanlı istek sınırı: sabit (semaphore) ya da
+sunucu gecikmesine ve 429/503 yanıtlarına göre AIMD ile uyarlanan.
+"""
+
+import asyncio
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+# Bu durum kodları sunucunun yük altında olduğunu bildirir
+THROTTLE_STATUS_CODES = (429, 503)
+
+
+class HostSlot:
+    """Host için alınmış bir istek hakkı; ``observe`` yanıtı bildirir"""
+
+    __slots__ = ('host', 'started_at', 'status', 'latency')
+
+    def __init__(self, host: str):
+        self.host = host
+        self.started_at = time.monotonic()
+        self.status = None
+        self.latency = None
+
+    def begin(self):
+        """İstek gönderilmeden hemen önce çağrılır (hız sınırı beklemesi gecikmeye katılmaz)"""
+        self.started_at = time.monotonic()
+
+    def observe(self, status: int):
+        """Yanıt başlıkları geldiğinde çağrılır; gecikme begin()'den ölçülür"""
+        self.status = status
+        self.latency = time.monotonic() - self.started_at
+
+
+class FixedHostConcurrency:
+    """Her host için sabit eşzamanlılık sınırı"""
+
+    def __init__(self, per_host: int = 4):
+        self.per_host = max(1, per_host)
+        self.max_per_host = self.per_host
+        self._semaphores = None
+
+    def slot(self, host: str) -> '_SlotContext':
+        return _SlotContext(self, host)
+
+    async def _acquire(self, host: str):
+        if self._semaphores is None:  # Semaphore'lar çalışan event loop'ta oluşturulur
+            self._semaphores = defaultdict(lambda: asyncio.Semaphore(self.per_host))
+        await self._semaphores[host].acquire()
+
+    async def _release(self, slot: HostSlot, failed: bool):
+        self._semaphores[slot.host].release()
+
+    @property
+    def stats(self) -> Dict:
+        return {}
+
+
+class _HostState:
+    __slots__ = ('limit', 'in_flight', 'baseline', 'samples', 'last_decrease', 'condition',
+                 'requests', 'increases', 'decreases', 'peak')
+
+    def __init__(self, limit: float):
+        self.limit = limit
+        self.in_flight = 0
+        self.baseline = None  # Yanıt gecikmesinin EWMA'sı (sn)
+        self.samples = 0
+        self.last_decrease = 0.0
+        self.condition = asyncio.Condition()
+        self.requests = 0
+        self.increases = 0
+        self.decreases = 0
+        self.peak = limit
+
+
+class AimdHostConcurrency:
+    """Additive increase / multiplicative decrease ile host başına sınır
+
+    Her normal yanıtta sınır 1/sınır kadar artar (her tam pencerede +1).
+    429/503, zaman aşımı/bağlantı hatası ya da gecikmenin ortalamanın
+    ``latency_factor`` katını (ve en az ``min_latency_increase`` sn fazlasını)
+    aşması sınırı ``decrease_factor`` ile çarpar.
+    Azaltmadan önce başlamış isteklerin sinyalleri yok sayılır; böylece aynı
+    aşırı yük bir kez cezalandırılır. Karar değişiklikleri ``decisions``'a,
+    host özetleri ``stats``'a kaydedilir.
+    """
+
+    def __init__(self, initial: int = 4, min_limit: int = 1, max_limit: int = 16,
+                 decrease_factor: float = 0.5, latency_factor: float = 2.0,
+                 min_latency_increase: float = 0.05, ewma_alpha: float = 0.1,
+                 warmup_samples: int = 3, max_decisions: int = 1000):
+        self.min_limit = max(1, min_limit)
+        self.max_per_host = max(self.min_limit, max_limit)
+        self.initial = min(max(initial, self.min_limit), self.max_per_host)
+        self.decrease_factor = decrease_factor
+        self.latency_factor = latency_factor
+        self.min_latency_increase = min_latency_increase
+        self.ewma_alpha = ewma_alpha
+        self.warmup_samples = warmup_samples  # Gecikme sinyali bu kadar örnekten sonra kullanılır
+        self.max_decisions = max_decisions
+        self.decisions: List[Dict] = []
+        self._hosts: Dict[str, _HostState] = {}
+        self._started_at = time.monotonic()
+
+    def slot(self, host: str) -> '_SlotContext':
+        return _SlotContext(self, host)
+
+    def _state(self, host: str) -> _HostState:
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = _HostState(float(self.initial))
+        return state
+
+    async def _acquire(self, host: str):
+        state = self._state(host)
+        async with state.condition:
+            await state.condition.wait_for(lambda: state.in_flight < int(state.limit))
+            state.in_flight += 1
+            state.requests += 1
+
+    async def _release(self, slot: HostSlot, failed: bool):
+        state = self._hosts[slot.host]
+        async with state.condition:
+            state.in_flight -= 1
+            if failed or slot.status is not None:  # İstek gönderilmediyse sinyal yok
+                self._adjust(state, slot, failed)
+            state.condition.notify_all()  # Sınır artmış olabilir
+
+    def _adjust(self, state: _HostState, slot: HostSlot, failed: bool):
+        reason = None
+        if failed:
+            reason = 'error'
+        elif slot.status in THROTTLE_STATUS_CODES:
+            reason = f'status {slot.status}'
+        else:
+            baseline = state.baseline
+            if state.samples >= self.warmup_samples and \
+                    slot.latency > max(baseline * self.latency_factor, baseline + self.min_latency_increase):
+                reason = f'latency {slot.latency:.2f}s > {self.latency_factor:g}x{baseline:.2f}s'
+            # Ortalama yavaşlamaları da izler; kalıcı yavaşlamada sınır tabanda takılı kalmaz
+            state.baseline = slot.latency if baseline is None else \
+                baseline + self.ewma_alpha * (slot.latency - baseline)
+            state.samples += 1
+
+        if reason is None:
+            if state.limit < self.max_per_host:
+                old = int(state.limit)
+                state.limit = min(self.max_per_host, state.limit + 1 / state.limit)
+                state.increases += 1
+                state.peak = max(state.peak, state.limit)
+                if int(state.limit) != old:
+                    self._record(slot.host, old, int(state.limit), 'increase')
+            return
+
+        if slot.started_at < state.last_decrease:
+            return  # Aynı yük dalgası zaten cezalandırıldı
+        old = int(state.limit)
+        state.limit = max(self.min_limit, state.limit * self.decrease_factor)
+        state.last_decrease = time.monotonic()
+        state.decreases += 1
+        self._record(slot.host, old, int(state.limit), reason)
+
+    def _record(self, host: str, old: int, new: int, reason: str):
+        if len(self.decisions) < self.max_decisions:
+            self.decisions.append({
+                'host': host,
+                'at': round(time.monotonic() - self._started_at, 3),
+                'from': old,
+                'to': new,
+                'reason': reason,
+            })
+
+    @property
+    def stats(self) -> Dict:
+        """Host başına son sınır, en yüksek sınır, istek/artış/azaltma sayıları ve ortalama gecikme"""
+        return {
+            host: {
+                'limit': int(state.limit),
+                'peak': int(state.peak),
+                'requests': state.requests,
+                'increases': state.increases,
+                'decreases': state.decreases,
+                'latency_avg': round(state.baseline, 3) if state.baseline is not None else None,
+            }
+            for host, state in self._hosts.items()
+        }
+
+
+class _SlotContext:
+    """``async with concurrency.slot(host) as slot`` ile istek hakkı"""
+
+    __slots__ = ('_owner', '_host', '_slot')
+
+    def __init__(self, owner, host: str):
+        self._owner = owner
+        self._host = host
+        self._slot: Optional[HostSlot] = None
+
+    async def __aenter__(self) -> HostSlot:
+        await self._owner._acquire(self._host)
+        self._slot = HostSlot(self._host)
+        return self._slot
+
+    async def __aexit__(self, exc_type, exc, tb):
+        # Yanıt alınmadan hatayla çıkılırsa (zaman aşımı, bağlantı hatası) aşırı yük sinyalidir
+        await self._owner._release(self._slot, failed=exc_type is not None and self._slot.status is None)
+        return False
@@ -0,0 +1,142 @@
+"""
+HTTP Önbelleği - AI Overview Projesi
+URL başına ETag/Last-Modified ve içerik özetini saklayarak koşullu GET yapar.
+304 yanıtında önceden çıkarılmış kayıt parse edilmeden yeniden kullanılır.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional
+
+
+class CacheEntry(NamedTuple):
+    """Önbellekteki tek bir URL kaydı"""
+    url: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    digest: str
+    record: Optional[Dict]
+    links: List[str]
+    fetched_at: float
+    is_fresh: bool  # TTL dolmadı: istek göndermeden kullanılabilir
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """If-None-Match / If-Modified-Since başlıkları"""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+def body_digest(content: bytes) -> str:
+    """Yanıt gövdesinin özeti; 200 yanıtında içerik değişmediyse parse atlanır"""
+    return hashlib.sha256(content).hexdigest()
+
+
+class HttpCache:
+    """SQLite tabanlı, TTL ve maksimum kayıt sayısı sınırlı HTTP önbelleği
+
+    TTL içindeki kayıtlar istek gönderilmeden kullanılır. TTL dolmuş kayıtlar
+    koşullu GET ile doğrulanır. Kayıt sayısı max_size'ı aşınca en uzun süredir
+    kullanılmayanlar silinir.
+    """
+
+    EVICTION_CHECK_INTERVAL = 100  # Her N yazmada bir boyut kontrolü
+
+    def __init__(self, path: Path, ttl: float = 3600, max_size: int = 1000):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.max_size = max_size
+        self.stats = {'fresh_hits': 0, 'not_modified': 0, 'unchanged_body': 0, 'misses': 0}
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._writes_since_check = 0
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS http_cache (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                digest TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        ''')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_accessed ON http_cache(accessed_at)')
+        self._conn.commit()
+
+    def lookup(self, url: str) -> Optional[CacheEntry]:
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT etag, last_modified, digest, payload, fetched_at FROM http_cache WHERE url = ?',
+                (url,)
+            ).fetchone()
+        if row is None:
+            self.stats['misses'] += 1
+            return None
+
+        etag, last_modified, digest, payload, fetched_at = row
+        payload = json.loads(payload)
+        is_fresh = (time.time() - fetched_at) < self.ttl
+        if is_fresh:
+            self.stats['fresh_hits'] += 1
+            self._mark_accessed(url)
+
+        return CacheEntry(url, etag, last_modified, digest, payload['record'],
+                          payload['links'], fetched_at, is_fresh)
+
+    def revalidated(self, entry: CacheEntry, not_modified: bool = True) -> CacheEntry:
+        """304 (ya da aynı gövde) sonrası kaydın tazelik süresini yeniler"""
+        self.stats['not_modified' if not_modified else 'unchanged_body'] += 1
+        now = time.time()
+        with self._lock:
+            self._conn.execute('UPDATE http_cache SET fetched_at = ?, accessed_at = ? WHERE url = ?',
+                               (now, now, entry.url))
+            self._conn.commit()
+        return entry._replace(fetched_at=now, is_fresh=True)
+
+    def store(self, url: str, headers, digest: str, record: Optional[Dict], links: List[str]):
+        """200 yanıtından çıkarılan kaydı doğrulayıcılarıyla birlikte saklar"""
+        now = time.time()
+        payload = json.dumps({'record': record, 'links': links}, ensure_ascii=False)
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO http_cache VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (url, headers.get('ETag'), headers.get('Last-Modified'), digest, payload, now, now)
+            )
+            self._writes_since_check += 1
+            if self._writes_since_check >= self.EVICTION_CHECK_INTERVAL:
+                self._evict()
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._evict()
+            self._conn.commit()
+            self._conn.close()
+
+    def _mark_accessed(self, url: str):
+        with self._lock:
+            self._conn.execute('UPDATE http_cache SET accessed_at = ? WHERE url = ?', (time.time(), url))
+            self._conn.commit()
+
+    def _evict(self):
+        """max_size üzerindeki en eski erişilen kayıtları siler (kilit altında çağrılır)"""
+        self._writes_since_check = 0
+        count = self._conn.execute('SELECT COUNT(*) FROM http_cache').fetchone()[0]
+        overflow = count - self.max_size
+        if overflow > 0:
+            self._conn.execute(
+                'DELETE FROM http_cache WHERE url IN '
+                '(SELECT url FROM http_cache ORDER BY accessed_at LIMIT ?)',
+                (overflow,)
+            )
@@ -0,0 +1,154 @@
+"""
+HTTP İstemcisi - AI Overview Projesi
+Yerel ve Cloud extractor'ların ortak HTTP katmanı: keep-alive bağlantı havuzu,
+5xx/zaman aşımı için jitter'lı üstel geri çekilmeli yeniden deneme ve host
+başına devre kesici (circuit breaker).
+"""
+
+import logging
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+# 429/503 yeniden denenmez: Retry-After süresini host'un hız sınırlayıcısı uygular
+RETRY_STATUS_CODES = (500, 502, 504)
+RETRY_METHODS = frozenset(['GET', 'HEAD'])
+
+
+class CircuitOpenError(requests.RequestException):
+    """Host'un devresi açık: istek gönderilmeden reddedildi"""
+
+
+class _HostCircuit:
+    __slots__ = ('failures', 'open_until', 'probing')
+
+    def __init__(self):
+        self.failures = 0
+        self.open_until = 0.0
+        self.probing = False
+
+
+class CircuitBreaker:
+    """Host başına devre kesici
+
+    Bir host art arda ``max_consecutive_errors`` kez başarısız olursa devre
+    ``cooldown_seconds`` boyunca açılır ve istekler gönderilmeden reddedilir.
+    Süre dolunca tek bir deneme isteğine izin verilir (yarı açık); başarılı
+    olursa devre kapanır, başarısız olursa yeniden açılır. Thread-safe'tir.
+    """
+
+    def __init__(self, max_consecutive_errors: int = 10, cooldown_seconds: float = 60):
+        self.max_consecutive_errors = max_consecutive_errors
+        self.cooldown_seconds = cooldown_seconds
+        self._hosts: Dict[str, _HostCircuit] = {}
+        self._lock = threading.Lock()
+        self.stats = {'opened': 0, 'rejected': 0}
+
+    def allow(self, host: str) -> bool:
+        """İstek gönderilebilir mi; yarı açık devrede yalnızca ilk çağrı True alır"""
+        if self.max_consecutive_errors <= 0:
+            return True
+        with self._lock:
+            circuit = self._hosts.get(host)
+            if circuit is None or circuit.failures < self.max_consecutive_errors:
+                return True
+            if time.monotonic() >= circuit.open_until and not circuit.probing:
+                circuit.probing = True
+                return True
+            self.stats['rejected'] += 1
+            return False
+
+    def record_success(self, host: str):
+        with self._lock:
+            circuit = self._hosts.pop(host, None)
+        if circuit and circuit.failures >= self.max_consecutive_errors > 0:
+            logger.info(f"Devre kapandı: {host}")
+
+    def record_failure(self, host: str):
+        if self.max_consecutive_errors <= 0:
+            return
+        with self._lock:
+            circuit = self._hosts.setdefault(host, _HostCircuit())
+            circuit.failures += 1
+            circuit.probing = False
+            if circuit.failures < self.max_consecutive_errors:
+                return
+            circuit.open_until = time.monotonic() + self.cooldown_seconds
+            self.stats['opened'] += 1
+        logger.warning(f"Devre açıldı: {host} ({circuit.failures} ardışık hata, "
+                       f"{self.cooldown_seconds} sn bekleniyor)")
+
+
+def create_session(headers: Optional[Dict[str, str]] = None, pool_connections: int = 10,
+                   pool_maxsize: int = 10, max_retries: int = 3, backoff_factor: float = 0.5,
+                   backoff_jitter: float = 0.5) -> requests.Session:
+    """Bağlantı havuzlu ve yeniden denemeli requests.Session
+
+    pool_connections: bağlantısı saklanan host sayısı; pool_maxsize: host başına
+    açık tutulan bağlantı (eşzamanlı istek sayısından küçükse bağlantılar atılır).
+    Bekleme süresi backoff_factor * 2^(deneme-1) + [0, backoff_jitter) saniyedir.
+    """
+    retry = Retry(
+        total=max_retries,
+        connect=max_retries,
+        read=max_retries,
+        status=max_retries,
+        status_forcelist=RETRY_STATUS_CODES,
+        allowed_methods=RETRY_METHODS,
+        backoff_factor=backoff_factor,
+        backoff_jitter=backoff_jitter,
+        respect_retry_after_header=False,
+        raise_on_status=False,  # Son yanıt çağırana döner
+    )
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=retry)
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    if headers:
+        session.headers.update(headers)
+    return session
+
+
+class HttpClient:
+    """Havuzlu oturum + host başına devre kesici
+
+    ``get`` requests.Response döndürür (``with`` ile kullanılabilir). Bağlantı
+    hataları, zaman aşımları ve yeniden denemelerden sonra kalan 5xx yanıtları
+    (503 dahil) host'un hata sayacını artırır; diğer yanıtlar sıfırlar.
+    """
+
+    def __init__(self, session: requests.Session, timeout: float = 30,
+                 breaker: Optional[CircuitBreaker] = None):
+        self.session = session
+        self.timeout = timeout
+        self.breaker = breaker or CircuitBreaker(0)
+
+    @property
+    def headers(self):
+        return self.session.headers
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        host = urlparse(url).netloc
+        if not self.breaker.allow(host):
+            raise CircuitOpenError(f"Devre açık, istek gönderilmedi: {host}")
+        kwargs.setdefault('timeout', self.timeout)
+        try:
+            response = self.session.get(url, **kwargs)
+        except requests.RequestException:
+            self.breaker.record_failure(host)
+            raise
+        if response.status_code >= 500:
+            self.breaker.record_failure(host)
+        else:
+            self.breaker.record_success(host)
+        return response
+
+    def close(self):
+        self.session.close()
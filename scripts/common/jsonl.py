@@ -0,0 +1,122 @@
+"""
+JSONL Kayıt Akışı - AI Overview Projesi
+Sayfa kayıtlarını tamamlandıkça satır satır (isteğe bağlı gzip/zstd ile) yazar
+ve hem JSONL hem eski JSON dizisi dosyalarını akış halinde okur.
+"""
+
+import codecs
+import json
+import re
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterable, Iterator, Optional
+
+from .compression import codec_for_name, compressing_writer, decompressing_reader
+
+READ_CHUNK_SIZE = 64 * 1024
+
+
+class JsonlWriter:
+    """Her kaydı tek satır JSON olarak akışa yazar; bellekte kayıt tutmaz"""
+
+    def __init__(self, stream: BinaryIO, codec: Optional[str] = None):
+        self._stream = compressing_writer(stream, codec)
+        self.count = 0
+        self.bytes_written = 0  # Sıkıştırılmamış boyut
+
+    def write(self, record: Dict):
+        line = json.dumps(record, ensure_ascii=False).encode('utf-8') + b'\n'
+        self._stream.write(line)
+        self.count += 1
+        self.bytes_written += len(line)
+
+    def write_all(self, records: Iterable[Dict]) -> int:
+        for record in records:
+            self.write(record)
+        return self.count
+
+    def close(self):
+        self._stream.close()
+
+    def __enter__(self) -> 'JsonlWriter':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def open_jsonl_writer(path: Path) -> JsonlWriter:
+    """Sıkıştırma biçimini dosya sonekinden (.gz / .zst) seçen JSONL yazıcı açar"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return JsonlWriter(open(path, 'wb'), codec_for_name(path))
+
+
+def _iter_lines(head: bytes, stream: BinaryIO) -> Iterator[bytes]:
+    buffer = head
+    while True:
+        *lines, buffer = buffer.split(b'\n')
+        yield from lines
+        chunk = stream.read(READ_CHUNK_SIZE)
+        if not chunk:
+            break
+        buffer += chunk
+    if buffer:
+        yield buffer
+
+
+_ARRAY_SEPARATORS = re.compile(r'[\s,]*')
+
+
+def _iter_array_items(head: bytes, stream: BinaryIO) -> Iterator[Dict]:
+    """JSON dizisinin öğelerini parça parça çözer; bellekte yalnızca okunmakta olan öğe tutulur"""
+    decoder = json.JSONDecoder()
+    text = codecs.getincrementaldecoder('utf-8')()
+    buffer = text.decode(head).lstrip()[1:]  # '[' atlanır
+    pos = 0
+    eof = False
+    read_size = READ_CHUNK_SIZE
+    while True:
+        pos = _ARRAY_SEPARATORS.match(buffer, pos).end()
+        if pos < len(buffer) and buffer[pos] == ']':
+            return
+        try:
+            item, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            end = None
+        # Öğe parçanın sonunda bittiyse (ör. sayı) devamı gelebilir
+        if end is None or (end == len(buffer) and not eof):
+            if eof:
+                raise ValueError("JSON dizisi eksik ya da bozuk")
+            chunk = stream.read(read_size)
+            eof = not chunk
+            buffer = buffer[pos:] + text.decode(chunk, final=eof)
+            pos = 0
+            # Büyük öğelerde okuma boyu katlanır: öğe başına çözme denemesi logaritmik kalır
+            read_size *= 2
+            continue
+        pos = end
+        read_size = READ_CHUNK_SIZE
+        yield item
+
+
+def iter_records(stream: BinaryIO) -> Iterator[Dict]:
+    """JSONL (ya da eski biçim JSON dizisi) akışındaki kayıtlar; gzip/zstd otomatik açılır
+
+    JSONL satır satır, JSON dizisi öğe öğe okunur; dosya boyutundan bağımsız
+    olarak bellekte yalnızca bir okuma parçası ve o anki kayıt bulunur.
+    """
+    stream = decompressing_reader(stream)
+    head = stream.read(READ_CHUNK_SIZE)
+    if head.lstrip()[:1] == b'[':
+        yield from _iter_array_items(head, stream)
+        return
+
+    for line in _iter_lines(head, stream):
+        if line.strip():
+            yield json.loads(line)
+
+
+def read_records(path: Path) -> Iterator[Dict]:
+    """Yerel kayıt dosyasını akış halinde okur"""
+    with open(path, 'rb') as f:
+        yield from iter_records(f)
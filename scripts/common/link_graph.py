@@ -0,0 +1,192 @@
+"""
+Site İçi Bağlantı Grafı - AI Overview Projesi
+Tarama sırasında site içi bağlantıları URL'leri tamsayı kimliklere çevirerek
+(interning) sıkı dizilerde biriktirir; CSR biçiminde NumPy ile vektörel
+PageRank ve gelen bağlantı (in-degree) analizi yapar.
+"""
+
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # Opsiyonel bağımlılık: graf toplanır, analiz için numpy gerekir
+    np = None
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("Bağlantı grafı analizi için numpy gerekli: pip install numpy")
+
+
+class UrlInterner:
+    """URL <-> ardışık tamsayı kimlik eşlemesi; her URL metni bir kez saklanır"""
+
+    def __init__(self, urls: Iterable[str] = ()):
+        self._ids: Dict[str, int] = {}
+        self.urls: List[str] = []
+        for url in urls:
+            self.intern(url)
+
+    def intern(self, url: str) -> int:
+        node = self._ids.get(url)
+        if node is None:
+            node = self._ids[url] = len(self.urls)
+            self.urls.append(url)
+        return node
+
+    def get(self, url: str) -> Optional[int]:
+        return self._ids.get(url)
+
+    def __len__(self) -> int:
+        return len(self.urls)
+
+
+class LinkGraph:
+    """Yönlü site içi bağlantı grafı
+
+    ``add_page`` taranan sayfanın bağlantılarını ekler (sayfa içi tekrarlar ve
+    kendine bağlantılar atlanır). Kenarlar eklenirken 32 bitlik dizilerde
+    tutulur; ``to_csr`` bunları kaynağa göre sıralı (indptr, indices) çiftine
+    çevirir. Taranmamış (yalnızca bağlantı verilen) URL'ler de düğümdür.
+    """
+
+    def __init__(self):
+        self.urls = UrlInterner()
+        self._sources = array('I')  # add_page başına kaynak kimliği
+        self._lengths = array('I')  # add_page başına kenar sayısı
+        self._targets = array('I')
+        self._crawled = bytearray()  # Kimlik -> taranmış mı
+        self._csr: Optional[Tuple] = None
+
+    def add_page(self, url: str, links: Iterable[str]):
+        source = self.urls.intern(url)
+        targets = [self.urls.intern(link) for link in dict.fromkeys(links) if link != url]
+        self._sources.append(source)
+        self._lengths.append(len(targets))
+        self._targets.extend(targets)
+        if len(self._crawled) < len(self.urls):
+            self._crawled.extend(bytes(len(self.urls) - len(self._crawled)))
+        self._crawled[source] = 1
+        self._csr = None
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.urls)
+
+    @property
+    def num_links(self) -> int:
+        return len(self._targets)
+
+    def to_csr(self) -> Tuple['np.ndarray', 'np.ndarray']:
+        """(indptr, indices): i düğümünün bağlantıları indices[indptr[i]:indptr[i+1]]"""
+        _require_numpy()
+        if self._csr is None:
+            n = self.num_nodes
+            sources = np.frombuffer(self._sources, dtype=np.uint32)
+            lengths = np.frombuffer(self._lengths, dtype=np.uint32)
+            targets = np.frombuffer(self._targets, dtype=np.uint32)
+            edge_sources = np.repeat(sources, lengths)
+            order = np.argsort(edge_sources, kind='stable')
+            indptr = np.zeros(n + 1, dtype=np.int64)
+            np.cumsum(np.bincount(edge_sources, minlength=n), out=indptr[1:])
+            self._csr = (indptr, targets[order].astype(np.int32))
+        return self._csr
+
+    def crawled_mask(self) -> 'np.ndarray':
+        _require_numpy()
+        mask = np.zeros(self.num_nodes, dtype=bool)
+        mask[:len(self._crawled)] = np.frombuffer(bytes(self._crawled), dtype=np.uint8).astype(bool)
+        return mask
+
+    def in_degree(self) -> 'np.ndarray':
+        """Her düğüme bağlantı veren farklı sayfa sayısı"""
+        _, indices = self.to_csr()
+        return np.bincount(indices, minlength=self.num_nodes)
+
+    def out_degree(self) -> 'np.ndarray':
+        indptr, _ = self.to_csr()
+        return np.diff(indptr)
+
+    def pagerank(self, damping: float = 0.85, tol: float = 1e-6, max_iter: int = 100) -> 'np.ndarray':
+        """Güç yinelemesiyle PageRank; bağlantısız düğümlerin puanı tüm düğümlere dağıtılır"""
+        indptr, indices = self.to_csr()
+        n = self.num_nodes
+        if n == 0:
+            return np.zeros(0)
+        out_degree = np.diff(indptr)
+        edge_sources = np.repeat(np.arange(n), out_degree)
+        edge_weights = 1.0 / out_degree[edge_sources]
+        dangling = out_degree == 0
+
+        rank = np.full(n, 1.0 / n)
+        for _ in range(max_iter):
+            spread = np.bincount(indices, weights=rank[edge_sources] * edge_weights, minlength=n)
+            updated = (1.0 - damping) / n + damping * (spread + rank[dangling].sum() / n)
+            converged = np.abs(updated - rank).sum() < tol
+            rank = updated
+            if converged:
+                break
+        return rank
+
+    def analyze(self, top_n: int = 20, weak_in_links: int = 1) -> Dict:
+        """Taranan sayfalar için iç bağlantı özeti
+
+        top_pages: PageRank'i en yüksek sayfalar; weakly_linked: en fazla
+        weak_in_links sayfadan bağlantı alanlar (0 ise yetim); dead_ends: site
+        içine hiç bağlantı vermeyenler. Listeler top_n ile sınırlıdır.
+        """
+        rank = self.pagerank()
+        in_degree = self.in_degree()
+        out_degree = self.out_degree()
+        crawled = self.crawled_mask()
+        urls = self.urls.urls
+
+        def pages(mask: 'np.ndarray', key: 'np.ndarray') -> List[Dict]:
+            nodes = np.flatnonzero(mask)
+            nodes = nodes[np.argsort(key[nodes], kind='stable')][:top_n]
+            return [{'url': urls[i], 'pagerank': round(float(rank[i]), 6),
+                     'in_links': int(in_degree[i]), 'out_links': int(out_degree[i])} for i in nodes]
+
+        weak = crawled & (in_degree <= weak_in_links)
+        dead_ends = crawled & (out_degree == 0)
+        return {
+            'pages_crawled': int(crawled.sum()),
+            'urls_linked': self.num_nodes,
+            'internal_links': self.num_links,
+            'top_pages': pages(crawled, -rank),
+            'orphan_count': int((crawled & (in_degree == 0)).sum()),
+            'weakly_linked_count': int(weak.sum()),
+            'weakly_linked': pages(weak, rank),
+            'dead_end_count': int(dead_ends.sum()),
+            'dead_ends': pages(dead_ends, -rank),
+        }
+
+    def save(self, path: Path):
+        """CSR dizilerini, taranma bilgisini ve URL'leri tek .npz dosyasına yazar"""
+        indptr, indices = self.to_csr()
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez_compressed(
+            path,
+            indptr=indptr,
+            indices=indices,
+            crawled=self.crawled_mask(),
+            urls=np.frombuffer('\n'.join(self.urls.urls).encode('utf-8'), dtype=np.uint8),
+        )
+
+    @classmethod
+    def load(cls, path: Path) -> 'LinkGraph':
+        _require_numpy()
+        with np.load(path) as data:
+            graph = cls()
+            urls = data['urls'].tobytes().decode('utf-8')
+            graph.urls = UrlInterner(urls.split('\n') if urls else [])
+            indptr, indices = data['indptr'], data['indices']
+            lengths = np.diff(indptr)
+            graph._sources = array('I', np.flatnonzero(lengths).astype(np.uint32).tobytes())
+            graph._lengths = array('I', lengths[lengths > 0].astype(np.uint32).tobytes())
+            graph._targets = array('I', indices.astype(np.uint32).tobytes())
+            graph._crawled = bytearray(data['crawled'].astype(np.uint8).tobytes())
+        return graph
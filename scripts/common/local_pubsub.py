@@ -0,0 +1,69 @@
+"""
+Süreç İçi Pub/Sub - AI Overview Projesi
+pubsub_v1.PublisherClient yerine geçen kuyruk: yayınlanan mesajlar Cloud
+Function'lardaki gibi CloudEvent biçiminde abonelere teslim edilir. Parçalı
+taramanın yerelde tek süreçte çalıştırılması ve test edilmesi için.
+"""
+
+import base64
+import json
+import logging
+from collections import deque
+from concurrent.futures import Future
+from types import SimpleNamespace
+from typing import Callable, Dict, List
+
+logger = logging.getLogger(__name__)
+
+
+def to_cloud_event(data: bytes, attributes: Dict[str, str] = None):
+    """Pub/Sub tetiklemeli fonksiyonların aldığı cloud_event biçimi"""
+    return SimpleNamespace(data={'message': {
+        'data': base64.b64encode(data).decode('ascii'),
+        'attributes': attributes or {},
+    }})
+
+
+def decode_cloud_event(cloud_event) -> Dict:
+    """cloud_event içindeki JSON mesaj"""
+    return json.loads(base64.b64decode(cloud_event.data['message']['data']).decode('utf-8'))
+
+
+class InProcessPubSub:
+    """Tek topic'li süreç içi Pub/Sub
+
+    Her abone ayrı bir subscription gibi her mesajı alır. ``run()`` kuyruk
+    boşalana kadar mesajları yayın sırasıyla teslim eder; teslim sırasında
+    yayınlanan mesajlar kuyruğun sonuna eklenir.
+    """
+
+    def __init__(self):
+        self._queue = deque()
+        self._subscribers: List[Callable] = []
+        self.published = 0
+        self.delivered = 0
+
+    def topic_path(self, project: str, topic: str) -> str:
+        return f"projects/{project}/topics/{topic}"
+
+    def publish(self, topic_path: str, data: bytes, **attributes) -> Future:
+        self.published += 1
+        self._queue.append((data, attributes))
+        future = Future()
+        future.set_result(str(self.published))  # Mesaj kimliği
+        return future
+
+    def subscribe(self, callback: Callable):
+        """callback(cloud_event) her mesaj için çağrılır"""
+        self._subscribers.append(callback)
+
+    def run(self, max_messages: int = 0) -> int:
+        """Kuyruk boşalana (ya da max_messages teslim edilene) kadar mesajları teslim eder"""
+        delivered = 0
+        while self._queue and (not max_messages or delivered < max_messages):
+            data, attributes = self._queue.popleft()
+            for callback in self._subscribers:
+                callback(to_cloud_event(data, attributes))
+            delivered += 1
+        self.delivered += delivered
+        return delivered
@@ -0,0 +1,124 @@
+"""
+Yakın Kopya Tespiti - AI Overview Projesi
+Sayfa içeriklerinin kelime shingle'larından MinHash imzası çıkarır ve LSH bant
+indeksiyle neredeyse aynı sayfaları (sayfalama, print, etiket sayfaları) tüm
+kayıtlarla karşılaştırmadan bulur.
+"""
+
+import random
+import re
+import zlib
+from collections import defaultdict
+from typing import Dict, List, Optional, Set
+
+try:
+    import numpy as np
+except ImportError:  # Opsiyonel bağımlılık: yoksa imzalar saf Python ile hesaplanır
+    np = None
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_TOKEN_PATTERN = re.compile(r'\w+', re.UNICODE)
+
+
+def shingles(text: str, size: int = 3) -> Set[int]:
+    """Küçük harfli kelime n-gram'larının 32 bitlik hash kümesi"""
+    tokens = _TOKEN_PATTERN.findall(text.lower())
+    if len(tokens) < size:
+        size = 1
+    return {zlib.crc32(' '.join(tokens[i:i + size]).encode('utf-8'))
+            for i in range(len(tokens) - size + 1)}
+
+
+class MinHasher:
+    """num_perm adet (a*x + b) mod p permütasyonuyla MinHash imzası üretir"""
+
+    def __init__(self, num_perm: int = 128, seed: int = 1):
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self._a = [rng.randrange(1, _MAX_HASH) for _ in range(num_perm)]
+        self._b = [rng.randrange(0, _MAX_HASH) for _ in range(num_perm)]
+        if np is not None:
+            self._a_array = np.array(self._a, dtype=np.uint64)
+            self._b_array = np.array(self._b, dtype=np.uint64)
+
+    def signature(self, features: Set[int]) -> tuple:
+        if not features:
+            return (_MAX_HASH,) * self.num_perm
+        if np is not None:
+            values = np.fromiter(features, dtype=np.uint64, count=len(features))[:, None]
+            # a, x < 2^32 olduğundan a*x + b taşmaz
+            permuted = (values * self._a_array + self._b_array) % np.uint64(_MERSENNE_PRIME) \
+                & np.uint64(_MAX_HASH)
+            return tuple(permuted.min(axis=0).tolist())
+        return tuple(min(((a * x + b) % _MERSENNE_PRIME) & _MAX_HASH for x in features)
+                     for a, b in zip(self._a, self._b))
+
+
+def estimated_similarity(signature_a: tuple, signature_b: tuple) -> float:
+    """İki imzadan Jaccard benzerliği tahmini"""
+    matches = sum(1 for a, b in zip(signature_a, signature_b) if a == b)
+    return matches / len(signature_a)
+
+
+class NearDuplicateIndex:
+    """MinHash imzaları için LSH bant indeksi
+
+    İmza ``bands`` banda bölünür; en az bir bandı birebir aynı olan kayıtlar
+    aday sayılır ve yalnızca onların benzerliği hesaplanır. Jaccard benzerliği
+    eşiğin üzerindeki sayfalar yüksek olasılıkla aday olur, ilgisiz sayfalar
+    neredeyse hiç olmaz; sayfa başına karşılaştırma sayısı kayıt sayısından
+    bağımsız kalır.
+    """
+
+    def __init__(self, threshold: float = 0.8, num_perm: int = 128, bands: int = 16,
+                 shingle_size: int = 3):
+        if num_perm % bands:
+            raise ValueError("num_perm, bands'e tam bölünmeli")
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.hasher = MinHasher(num_perm)
+        self._buckets: List[Dict[tuple, List[int]]] = [defaultdict(list) for _ in range(bands)]
+        self._signatures: List[tuple] = []
+        self._keys: List[str] = []
+        self.stats = {'indexed': 0, 'near_duplicates': 0, 'comparisons': 0}
+
+    def _band_keys(self, signature: tuple):
+        for band in range(self.bands):
+            yield band, signature[band * self.rows:(band + 1) * self.rows]
+
+    def find(self, signature: tuple) -> Optional[str]:
+        """Benzerliği eşiğin üzerinde olan ilk kaydın anahtarı"""
+        checked = set()
+        for band, band_key in self._band_keys(signature):
+            for position in self._buckets[band].get(band_key, ()):
+                if position in checked:
+                    continue
+                checked.add(position)
+                self.stats['comparisons'] += 1
+                if estimated_similarity(signature, self._signatures[position]) >= self.threshold:
+                    return self._keys[position]
+        return None
+
+    def add(self, signature: tuple, key: str):
+        position = len(self._signatures)
+        self._signatures.append(signature)
+        self._keys.append(key)
+        for band, band_key in self._band_keys(signature):
+            self._buckets[band][band_key].append(position)
+        self.stats['indexed'] += 1
+
+    def check(self, text: str, key: str) -> Optional[str]:
+        """Metin daha önce eklenen bir kaydın yakın kopyasıysa onun anahtarını döndürür
+
+        Yakın kopya değilse metin indekse eklenir ve None döner.
+        """
+        signature = self.hasher.signature(shingles(text, self.shingle_size))
+        original = self.find(signature)
+        if original is not None:
+            self.stats['near_duplicates'] += 1
+            return original
+        self.add(signature, key)
+        return None
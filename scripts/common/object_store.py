@@ -0,0 +1,100 @@
+"""
+Nesne Deposu - AI Overview Projesi
+Parçalı taramanın durum ve çıktı dosyaları için küçük depo arayüzü. Cloud
+Function'lar Cloud Storage, yerel çalıştırma ve testler dizin tabanlı depo kullanır.
+"""
+
+import os
+import shutil
+from pathlib import Path
+from typing import BinaryIO, List, Optional
+
+
+class ObjectStore:
+    """Nesne deposu arayüzü; adlar '/' ile ayrılmış yollardır"""
+
+    def read(self, name: str) -> Optional[bytes]:
+        """Nesnenin içeriği; yoksa None"""
+        raise NotImplementedError
+
+    def write(self, name: str, data: bytes):
+        """Nesneyi yazar (varsa üzerine)"""
+        raise NotImplementedError
+
+    def create(self, name: str, data: bytes) -> bool:
+        """Nesne yoksa atomik olarak oluşturur; zaten varsa False
+
+        Aynı anda birden çok çağrı denerse yalnızca biri başarılı olur
+        (koordinatör seçimi için).
+        """
+        raise NotImplementedError
+
+    def list(self, prefix: str) -> List[str]:
+        """Adı prefix ile başlayan nesneler, sıralı"""
+        raise NotImplementedError
+
+    def open_read(self, name: str) -> BinaryIO:
+        raise NotImplementedError
+
+    def open_write(self, name: str) -> BinaryIO:
+        """Akış halinde yazma; nesne close() ile tamamlanır"""
+        raise NotImplementedError
+
+    def delete_prefix(self, prefix: str):
+        raise NotImplementedError
+
+
+class LocalObjectStore(ObjectStore):
+    """Dizin tabanlı depo"""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+
+    def _path(self, name: str) -> Path:
+        return self.root / name
+
+    def read(self, name: str) -> Optional[bytes]:
+        path = self._path(name)
+        return path.read_bytes() if path.exists() else None
+
+    def write(self, name: str, data: bytes):
+        path = self._path(name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(path.name + '.tmp')
+        temp_path.write_bytes(data)
+        os.replace(temp_path, path)
+
+    def create(self, name: str, data: bytes) -> bool:
+        path = self._path(name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL)
+        except FileExistsError:
+            return False
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        return True
+
+    def list(self, prefix: str) -> List[str]:
+        directory = self._path(prefix).parent if not prefix.endswith('/') else self._path(prefix)
+        if not directory.exists():
+            return []
+        names = (path.relative_to(self.root).as_posix() for path in directory.rglob('*')
+                 if path.is_file() and not path.name.endswith('.tmp'))
+        return sorted(name for name in names if name.startswith(prefix))
+
+    def open_read(self, name: str) -> BinaryIO:
+        return open(self._path(name), 'rb')
+
+    def open_write(self, name: str) -> BinaryIO:
+        path = self._path(name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return open(path, 'wb')
+
+    def delete_prefix(self, prefix: str):
+        path = self._path(prefix)
+        if path.is_dir():
+            shutil.rmtree(path)
+        else:
+            for name in self.list(prefix):
+                self._path(name).unlink()
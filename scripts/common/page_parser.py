@@ -0,0 +1,340 @@
+"""
+Sayfa Parser Backend'leri - AI Overview Projesi
+HTML'den sayfa kaydını ve keşif bağlantılarını çıkarır. 'bs4' referans
+uygulamadır; 'lxml' aynı kaydı tek ağaç dolaşımında, çok daha hızlı üretir.
+"""
+
+import logging
+import re
+import time
+from typing import AbstractSet, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup, UnicodeDammit
+
+from .boilerplate import bs4_block_fingerprints, lxml_block_fingerprints, template_blocks
+from .text_stats import count_words
+
+try:
+    import lxml.html
+except ImportError:  # Opsiyonel bağımlılık: yoksa bs4 backend'i kullanılır
+    lxml = None
+
+logger = logging.getLogger(__name__)
+
+# Ana içerik için sırayla denenen seçiciler
+CONTENT_SELECTORS = [
+    'article', 'main', '.content', '#content',
+    '.post-content', '.entry-content', '.article-content'
+]
+
+# Ana içerik bulunamazsa body'den çıkarılan etiketler
+FALLBACK_REMOVED_TAGS = ('nav', 'footer', 'header', 'aside', 'script', 'style')
+
+HEADING_TAGS = {f'h{i}': i for i in range(1, 7)}
+
+
+def build_record(url: str, title: str, description: str, content: str,
+                 headings: List[Dict], canonical_url: Optional[str] = None) -> Dict:
+    """Tüm backend'lerin ürettiği ortak sayfa kaydı
+
+    Bağlantılar kayda yazılmaz; keşif bağlantıları ayrıca döner ve site içi
+    bağlantı grafında (link_graph) toplanır.
+    """
+    return {
+        'url': url,
+        'canonical_url': canonical_url,
+        'title': title,
+        'meta_description': description,
+        'content': content,
+        'headings': headings,
+        'word_count': count_words(content),
+        'extracted_at': time.strftime('%Y-%m-%d %H:%M:%S')
+    }
+
+
+def is_canonical_rel(rel_values: List[str]) -> bool:
+    """<link rel="..."> değerlerinden biri 'canonical' mı?"""
+    return any(value.lower() == 'canonical' for value in rel_values)
+
+
+class ParserBackend:
+    """Parser backend arayüzü"""
+
+    name = ''
+
+    def parse(self, url: str, html: bytes,
+              boilerplate: Optional[AbstractSet[str]] = None) -> Tuple[Dict, List[str]]:
+        """(sayfa kaydı, keşif bağlantıları) döndürür
+
+        boilerplate: sitenin şablon blok izleri; ana içerik seçicisi bulunamayıp
+        body'ye dönülen sayfalarda bu bloklar içerik ve başlıklardan çıkarılır.
+        """
+        raise NotImplementedError
+
+    def block_fingerprints(self, html: bytes) -> List[str]:
+        """Sayfanın body'sindeki blokların parmak izleri (şablon öğrenimi için)"""
+        raise NotImplementedError
+
+
+class Bs4Backend(ParserBackend):
+    """BeautifulSoup (html.parser) referans backend'i"""
+
+    name = 'bs4'
+
+    def parse(self, url: str, html: bytes,
+              boilerplate: Optional[AbstractSet[str]] = None) -> Tuple[Dict, List[str]]:
+        soup = BeautifulSoup(html, 'html.parser')
+
+        # Keşif bağlantıları: decompose öncesi tüm sayfadaki href'ler
+        crawl_links = [urljoin(url, link['href']) for link in soup.find_all('a', href=True)]
+
+        # Meta bilgileri çıkar
+        title = soup.find('title')
+        title_text = title.get_text().strip() if title else ""
+
+        meta_description = soup.find('meta', attrs={'name': 'description'})
+        description = meta_description.get('content', '') if meta_description else ""
+
+        canonical_url = None
+        for link in soup.find_all('link', rel=True, href=True):
+            if is_canonical_rel(link['rel']):
+                canonical_url = urljoin(url, link['href'])
+                break
+
+        # Ana içeriği çıkar - yaygın HTML etiketlerini kullan
+        content = ""
+        for selector in CONTENT_SELECTORS:
+            content_element = soup.select_one(selector)
+            if content_element:
+                content = content_element.get_text(separator=' ', strip=True)
+                break
+
+        # Eğer ana içerik bulunamazsa, body'den çıkar
+        if not content:
+            body = soup.find('body')
+            if body:
+                # Site şablonu blokları (menü, çerez bildirimi vb.) ile navigasyon, footer gibi öğeleri kaldır
+                if boilerplate:
+                    for block in template_blocks(bs4_block_fingerprints(body), boilerplate, _bs4_parent):
+                        block.decompose()
+                for tag in body(list(FALLBACK_REMOVED_TAGS)):
+                    tag.decompose()
+                content = body.get_text(separator=' ', strip=True)
+
+        # Başlıkları çıkar
+        headings = []
+        for i in range(1, 7):  # h1-h6
+            for heading in soup.find_all(f'h{i}'):
+                headings.append({
+                    'level': i,
+                    'text': heading.get_text().strip()
+                })
+
+        record = build_record(url, title_text, description, content, headings, canonical_url)
+        return record, crawl_links
+
+    def block_fingerprints(self, html: bytes) -> List[str]:
+        soup = BeautifulSoup(html, 'html.parser')
+        return [fingerprint for _, fingerprint in bs4_block_fingerprints(soup.find('body') or soup)]
+
+
+def _bs4_parent(element):
+    return element.parent
+
+
+def _lxml_parent(element):
+    return element.getparent()
+
+
+# bs4 get_text'in atladığı içerikler
+_NON_TEXT_TAGS = {'script', 'style', 'template'}
+_XML_DECLARATION = re.compile(r'^\s*<\?xml[^>]*\?>')
+_BODY_TAG = re.compile(r'<body[\s>/]', re.IGNORECASE)
+
+
+def _iter_strings(root, excluded=frozenset()) -> Iterator[str]:
+    """Element altındaki metin parçaları, bs4 get_text ile aynı sırada
+
+    Yorumlar, script/style içerikleri ve excluded alt ağaçları atlanır; atlanan
+    elemanların tail metni (kardeş metin) korunur. Özyinelemesizdir.
+    """
+    if root.text and root.tag not in _NON_TEXT_TAGS:
+        yield root.text
+
+    stack = [(root, iter(root))]
+    while stack:
+        parent, children = stack[-1]
+        child = next(children, None)
+        if child is None:
+            stack.pop()
+            if stack and parent.tail:
+                yield parent.tail
+            continue
+
+        if isinstance(child.tag, str) and child.tag not in _NON_TEXT_TAGS and child not in excluded:
+            if child.text:
+                yield child.text
+            stack.append((child, iter(child)))
+        elif child.tail:
+            yield child.tail
+
+
+def _text(element, excluded=frozenset()) -> str:
+    """get_text().strip() karşılığı"""
+    return ''.join(_iter_strings(element, excluded)).strip()
+
+
+def _separated_text(element, excluded=frozenset()) -> str:
+    """get_text(separator=' ', strip=True) karşılığı"""
+    return ' '.join(part for part in (s.strip() for s in _iter_strings(element, excluded)) if part)
+
+
+class LxmlBackend(ParserBackend):
+    """lxml hızlı yolu: başlık, meta, seçiciler, başlıklar ve bağlantılar tek dolaşımda"""
+
+    name = 'lxml'
+
+    def __init__(self):
+        if lxml is None:
+            raise ImportError("lxml backend'i için lxml gerekli: pip install lxml")
+        self._fallback = Bs4Backend()
+
+    @staticmethod
+    def _document(html: bytes):
+        """(metin, kök eleman); belge boş/bozuksa kök None"""
+        # bs4 ile aynı karakter kodlaması tespiti
+        markup = UnicodeDammit(html, is_html=True).unicode_markup or ''
+        try:
+            return markup, lxml.html.document_fromstring(_XML_DECLARATION.sub('', markup, count=1))
+        except Exception:
+            return markup, None
+
+    def parse(self, url: str, html: bytes,
+              boilerplate: Optional[AbstractSet[str]] = None) -> Tuple[Dict, List[str]]:
+        markup, root = self._document(html)
+        if root is None:
+            # Boş/bozuk belge: referans backend'e bırak
+            return self._fallback.parse(url, html, boilerplate)
+
+        title_element = None
+        description = None
+        canonical_url = None
+        body = None
+        selector_matches = [None] * len(CONTENT_SELECTORS)
+        headings_by_level = [[] for _ in range(6)]
+        anchors = []
+
+        for element in root.iter():
+            tag = element.tag
+            if not isinstance(tag, str):  # Yorum ve işleme talimatları
+                continue
+
+            if tag == 'a':
+                if element.get('href') is not None:
+                    anchors.append(element)
+            elif tag in HEADING_TAGS:
+                headings_by_level[HEADING_TAGS[tag] - 1].append(element)
+            elif tag == 'title':
+                if title_element is None:
+                    title_element = element
+            elif tag == 'meta':
+                if description is None and element.get('name') == 'description':
+                    description = element.get('content', '')
+            elif tag == 'link':
+                if canonical_url is None and element.get('href') is not None \
+                        and is_canonical_rel(element.get('rel', '').split()):
+                    canonical_url = urljoin(url, element.get('href'))
+            elif tag == 'body':
+                if body is None:
+                    body = element
+            elif tag == 'article':
+                if selector_matches[0] is None:
+                    selector_matches[0] = element
+            elif tag == 'main':
+                if selector_matches[1] is None:
+                    selector_matches[1] = element
+
+            self._match_attribute_selectors(element, selector_matches)
+
+        # Ana içerik: listede ilk eşleşen seçici
+        content = ""
+        for match in selector_matches:
+            if match is not None:
+                content = _separated_text(match)
+                break
+
+        # Eğer ana içerik bulunamazsa, body'den çıkar; kaldırılan öğeler
+        # başlık ve bağlantılardan da düşer (bs4'teki decompose gibi)
+        removed = frozenset()
+        # lxml eksik body'yi kendisi ekler; html.parser eklemez
+        if body is not None and not _BODY_TAG.search(markup):
+            body = None
+        if not content and body is not None:
+            removed = set(body.iter(*FALLBACK_REMOVED_TAGS))
+            if boilerplate:
+                # Site şablonu blokları (menü, çerez bildirimi vb.)
+                removed.update(template_blocks(lxml_block_fingerprints(body), boilerplate, _lxml_parent))
+            removed = frozenset(removed)
+            content = _separated_text(body, removed)
+
+        headings = []
+        for level, elements in enumerate(headings_by_level, 1):
+            for heading in elements:
+                if removed and self._is_removed(heading, removed, body):
+                    continue
+                headings.append({'level': level, 'text': _text(heading, removed)})
+
+        crawl_links = [urljoin(url, anchor.get('href')) for anchor in anchors]
+
+        title_text = _text(title_element) if title_element is not None else ""
+        record = build_record(url, title_text, description or "", content, headings, canonical_url)
+        return record, crawl_links
+
+    def block_fingerprints(self, html: bytes) -> List[str]:
+        markup, root = self._document(html)
+        if root is None:
+            return self._fallback.block_fingerprints(html)
+        body = root.find('body') if _BODY_TAG.search(markup) else None
+        return [fingerprint for _, fingerprint in lxml_block_fingerprints(body if body is not None else root)]
+
+    @staticmethod
+    def _match_attribute_selectors(element, selector_matches: List):
+        """'.content', '#content', '.post-content' vb. seçiciler"""
+        classes = element.get('class')
+        if classes:
+            tokens = classes.split()
+            for index, class_name in ((2, 'content'), (4, 'post-content'),
+                                      (5, 'entry-content'), (6, 'article-content')):
+                if selector_matches[index] is None and class_name in tokens:
+                    selector_matches[index] = element
+        if selector_matches[3] is None and element.get('id') == 'content':
+            selector_matches[3] = element
+
+    @staticmethod
+    def _is_removed(element, removed: frozenset, body) -> bool:
+        if element in removed:
+            return True
+        for ancestor in element.iterancestors():
+            if ancestor is body:
+                return False
+            if ancestor in removed:
+                return True
+        return False
+
+
+PARSER_BACKENDS = {
+    Bs4Backend.name: Bs4Backend,
+    LxmlBackend.name: LxmlBackend,
+}
+
+
+def get_parser_backend(name: Optional[str] = None) -> ParserBackend:
+    """İsimle backend oluşturur; lxml kurulu değilse bs4'e düşer"""
+    backend_class = PARSER_BACKENDS.get(name or 'bs4')
+    if backend_class is None:
+        raise ValueError(f"Bilinmeyen parser backend: {name} (seçenekler: {', '.join(PARSER_BACKENDS)})")
+    if backend_class is LxmlBackend and lxml is None:
+        logger.warning("lxml bulunamadı, bs4 parser backend'i kullanılıyor")
+        backend_class = Bs4Backend
+    return backend_class()
@@ -0,0 +1,83 @@
+"""
+Paralel Parse Havuzu - AI Overview Projesi
+HTML parse işini ağ I/O'sundan ayırır: indirilen ham baytlar işlem havuzuna
+gönderilir, parse CPU çekirdekleri arasında paylaştırılır.
+"""
+
+import asyncio
+import logging
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import AbstractSet, Callable, Dict, List, Optional, Tuple
+
+from .page_parser import get_parser_backend
+
+logger = logging.getLogger(__name__)
+
+# Her işçi işlemde bir kez oluşturulan parser backend'i
+_worker_parser = None
+
+
+def _init_worker(backend_name: Optional[str]):
+    global _worker_parser
+    _worker_parser = get_parser_backend(backend_name)
+
+
+def _parse_in_worker(url: str, html: bytes,
+                     boilerplate: Optional[AbstractSet[str]] = None) -> Tuple[Dict, List[str]]:
+    return _worker_parser.parse(url, html, boilerplate)
+
+
+class PendingParse:
+    """Havuzda parse edilmekte olan sayfa
+
+    ``result()`` sonucu bekler; ``on_done`` (ör. önbelleğe yazma) işçi
+    işlemde değil, sonucu alan thread'de çalışır.
+    """
+
+    def __init__(self, future: Future,
+                 on_done: Optional[Callable[[Dict, List[str]], None]] = None):
+        self._future = future
+        self._on_done = on_done
+
+    def result(self) -> Tuple[Dict, List[str]]:
+        record, links = self._future.result()
+        if self._on_done:
+            self._on_done(record, links)
+        return record, links
+
+
+class ParsePool:
+    """ProcessPoolExecutor üzerinde parse aşaması
+
+    ``max_pending`` aynı anda havuza verilmiş (bekleyen + parse edilen) sayfa
+    sınırıdır; tarama hattı indirmeyi bu pencere dolunca durdurur, böylece
+    bellekteki ham HTML miktarı sınırlı kalır.
+    """
+
+    def __init__(self, backend_name: Optional[str] = None, workers: int = 0, max_pending: int = 0):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending or self.workers * 2
+        self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                             initargs=(backend_name,))
+        logger.info(f"Parse havuzu başlatıldı: {self.workers} işlem, en fazla {self.max_pending} bekleyen sayfa")
+
+    def submit(self, url: str, html: bytes,
+               on_done: Optional[Callable[[Dict, List[str]], None]] = None,
+               boilerplate: Optional[AbstractSet[str]] = None) -> PendingParse:
+        """boilerplate: sitenin şablon blok izleri (şablon öğrenildikçe görev başına iletilir)"""
+        return PendingParse(self._executor.submit(_parse_in_worker, url, html, boilerplate), on_done)
+
+    async def async_parse(self, url: str, html: bytes,
+                          boilerplate: Optional[AbstractSet[str]] = None) -> Tuple[Dict, List[str]]:
+        """Event loop'u bloklamadan havuzda parse eder"""
+        return await asyncio.wrap_future(self._executor.submit(_parse_in_worker, url, html, boilerplate))
+
+    def close(self):
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self) -> 'ParsePool':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
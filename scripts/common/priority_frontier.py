@@ -0,0 +1,202 @@
+"""
+Öncelikli Tarama Sınırı - AI Overview Projesi
+max_pages bütçesini en değerli sayfalara harcamak için heap tabanlı frontier:
+URL'ler derinlik, site içi gelen bağlantı sayısı, sitemap önceliği ve URL
+kalıplarına göre puanlanır; puan değişince heap'e yeni girdi eklenir (lazy update).
+"""
+
+import heapq
+import math
+import re
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Pattern, Sequence, Tuple
+
+from .frontier import UrlSeenIndex
+
+# Bütçeyi tüketip az içerik getiren sayfa türleri (etiket, arşiv, sayfalama, ...)
+DEFAULT_LOW_VALUE_PATTERNS = [
+    r'/(tag|tags|etiket|category|categories|kategori|author|yazar)/',
+    r'/(archive|archives|arsiv)(/|$)',
+    r'/page/\d+/?$',
+    r'[?&](page|p|sayfa)=\d+',
+    r'/\d{4}/\d{2}(/\d{2})?/?$',  # Tarih arşivleri
+    r'/(feed|rss|atom)/?$',
+    r'[?&](sort|order|orderby|filter|replytocom)=',
+    r'/(search|arama)(/|\?|$)',
+]
+
+DEFAULT_WEIGHTS = {
+    'depth': 1.0,           # Başlangıçtan her bağlantı adımı
+    'inlinks': 1.0,         # log(1 + gelen bağlantı) başına
+    'sitemap': 2.0,         # Sitemap <priority> (0-1) başına; sitemap'te olmayan 0
+    'low_value': 3.0,       # Düşük değerli URL kalıbı cezası
+}
+
+
+class UrlScorer:
+    """URL puanı: küçük puan önce taranır
+
+    sitemap_priorities: kanonik URL -> sitemap <priority> (belirtilmemişse None,
+    sitemap_default_priority sayılır); sitemap'te olmayan URL'ler bonus almaz.
+    """
+
+    def __init__(self, weights: Optional[Dict[str, float]] = None,
+                 low_value_patterns: Sequence[str] = DEFAULT_LOW_VALUE_PATTERNS,
+                 sitemap_priorities: Optional[Dict[str, Optional[float]]] = None,
+                 sitemap_default_priority: float = 0.5):
+        self.weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+        self._low_value: List[Pattern] = [re.compile(p, re.IGNORECASE) for p in low_value_patterns]
+        self.sitemap_priorities = sitemap_priorities or {}
+        self.sitemap_default_priority = sitemap_default_priority
+
+    def url_score(self, url: str) -> float:
+        """Yalnızca URL'e bağlı kısım (kalıp cezası ve sitemap önceliği); URL başına bir kez hesaplanır"""
+        score = 0.0
+        if any(pattern.search(url) for pattern in self._low_value):
+            score += self.weights['low_value']
+        if url in self.sitemap_priorities:
+            priority = self.sitemap_priorities[url]
+            score -= self.weights['sitemap'] * (self.sitemap_default_priority if priority is None else priority)
+        return score
+
+    def score(self, base: float, depth: int, inlinks: int) -> float:
+        return base + self.weights['depth'] * depth - self.weights['inlinks'] * math.log1p(inlinks)
+
+
+class _Entry:
+    __slots__ = ('depth', 'inlinks', 'base', 'score')
+
+    def __init__(self, depth: int, base: float):
+        self.depth = depth
+        self.inlinks = 0
+        self.base = base
+        self.score = 0.0
+
+
+class PriorityFrontier:
+    """Heap tabanlı öncelikli tarama kuyruğu (CrawlFrontier ile aynı arayüz)
+
+    ``add(url, parent)`` ile eklenen URL'in derinliği üst sayfanınkinden bir
+    fazladır. Kuyrukta bekleyen bir URL'e yeni bağlantı bulununca gelen
+    bağlantı sayısı artar ve URL yeni puanıyla heap'e tekrar eklenir; eski
+    girdi pop sırasında puanı tutmadığı için atlanır. Eşit puanlılar ekleme
+    sırasıyla (BFS) çıkar. Tüm kuyruk bellekte tutulur.
+    """
+
+    def __init__(self, start_urls: Iterable[str] = (), scorer: Optional[UrlScorer] = None):
+        self.scorer = scorer or UrlScorer()
+        self.seen = UrlSeenIndex()
+        self._entries: Dict[str, _Entry] = {}  # Kuyrukta bekleyenler
+        self._heap: List[Tuple[float, int, str]] = []
+        self._counter = 0
+        self._in_progress: Dict[str, _Entry] = {}  # Pop edilmiş URL'ler
+
+        for url in start_urls:
+            self.add(url)
+
+    def add(self, url: str, parent: Optional[str] = None) -> bool:
+        """URL yeni ise kuyruğa ekler; kuyrukta bekliyorsa gelen bağlantısını sayar"""
+        if not self.seen.add(url):
+            entry = self._entries.get(url)
+            if entry is not None and parent is not None and parent != url:
+                entry.inlinks += 1
+                self._push(url, entry)
+            return False
+        parent_entry = self._in_progress.get(parent) if parent is not None else None
+        depth = parent_entry.depth + 1 if parent_entry is not None else 0
+        self._push(url, _Entry(depth, self.scorer.url_score(url)))
+        return True
+
+    def _push(self, url: str, entry: _Entry):
+        entry.score = self.scorer.score(entry.base, entry.depth, entry.inlinks)
+        self._entries[url] = entry
+        self._counter += 1
+        heapq.heappush(self._heap, (entry.score, self._counter, url))
+        # Eskimiş girdiler canlıların iki katını aşarsa heap yeniden kurulur
+        if len(self._heap) > 2 * len(self._entries) + 64:
+            self._compact()
+
+    def _compact(self):
+        self._heap = [item for item in self._heap
+                      if item[2] in self._entries and self._entries[item[2]].score == item[0]]
+        heapq.heapify(self._heap)
+
+    @classmethod
+    def from_state(cls, pending: Iterable[str], seen: UrlSeenIndex, max_memory_urls: int = 0,
+                   spill_dir: Optional[Path] = None, entries: Optional[Dict[str, List[int]]] = None,
+                   scorer: Optional[UrlScorer] = None) -> 'PriorityFrontier':
+        """Checkpoint'ten geri yükler
+
+        entries (export_entries çıktısı) URL'lerin derinlik ve gelen bağlantı
+        sayılarını taşır; yoksa bekleyen URL'ler derinlik 1 ile eklenir.
+        """
+        frontier = cls(scorer=scorer)
+        frontier.seen = seen
+        entries = entries or {}
+        for url in pending:
+            if url in frontier._entries:
+                continue
+            depth, inlinks = entries.get(url, (1, 0))
+            entry = _Entry(depth, frontier.scorer.url_score(url))
+            entry.inlinks = inlinks
+            frontier._push(url, entry)
+        return frontier
+
+    def export_entries(self) -> Dict[str, List[int]]:
+        """Bekleyen ve işlenmekte olan URL'lerin [derinlik, gelen bağlantı] değerleri (checkpoint için)"""
+        return {url: [entry.depth, entry.inlinks]
+                for entries in (self._in_progress, self._entries) for url, entry in entries.items()}
+
+    def pending_urls(self) -> Iterator[str]:
+        """Kuyruktaki URL'ler öncelik sırasıyla, kuyruğu tüketmeden"""
+        for _, _, url in sorted(self._live_items()):
+            yield url
+
+    def _live_items(self) -> Iterator[Tuple[float, int, str]]:
+        for item in self._heap:
+            entry = self._entries.get(item[2])
+            if entry is not None and entry.score == item[0]:
+                yield item
+
+    def mark_seen(self, url: str) -> bool:
+        """URL'i kuyruğa eklemeden görülmüş sayar"""
+        return self.seen.add(url)
+
+    def pop(self) -> str:
+        """En yüksek öncelikli URL'i döndürür; kuyruk boşsa IndexError"""
+        while self._heap:
+            score, _, url = heapq.heappop(self._heap)
+            entry = self._entries.get(url)
+            if entry is None or entry.score != score:
+                continue  # Eskimiş girdi
+            del self._entries[url]
+            self._in_progress[url] = entry
+            return url
+        raise IndexError('pop from an empty frontier')
+
+    def depth(self, url: str) -> Optional[int]:
+        """İşlenmekte olan ya da kuyruktaki URL'in derinliği"""
+        entry = self._in_progress.get(url) or self._entries.get(url)
+        return entry.depth if entry else None
+
+    def done(self, url: str):
+        """Pop edilen URL'in işlenmesi bitti (başarılı ya da değil)"""
+        self._in_progress.pop(url, None)
+
+    @property
+    def in_progress(self) -> List[str]:
+        """Pop edilmiş ama henüz tamamlanmamış URL'ler, pop sırasıyla"""
+        return list(self._in_progress)
+
+    def __contains__(self, url: str) -> bool:
+        return url in self.seen
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __bool__(self) -> bool:
+        return bool(self._entries)
+
+    def close(self):
+        self._heap.clear()
+        self._entries.clear()
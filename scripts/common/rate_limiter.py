@@ -0,0 +1,117 @@
+"""
+Hız Sınırlayıcı - AI Overview Projesi
+Host başına token bucket; sadece host'un istek bütçesi tükendiğinde bekletir.
+"""
+
+import asyncio
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+
+class _Bucket:
+    """Tek bir host'un token bucket durumu"""
+
+    __slots__ = ('tokens', 'capacity', 'interval', 'updated_at', 'blocked_until')
+
+    def __init__(self, capacity: float, interval: float, now: float):
+        self.tokens = capacity
+        self.capacity = capacity
+        self.interval = interval  # Bir token'ın dolma süresi (saniye)
+        self.updated_at = now
+        self.blocked_until = 0.0
+
+
+class HostRateLimiter:
+    """Host başına token bucket hız sınırlayıcı
+
+    Her host ``window_seconds`` içinde en fazla ``requests_per_window`` istek
+    alır; ``burst`` kadar istek beklemeden gönderilebilir. robots.txt
+    Crawl-delay'i ve Retry-After yanıtları host bazında uygulanır.
+    Thread-safe'tir; async kod ``async_wait`` kullanır.
+    """
+
+    def __init__(self, requests_per_window: int = 100, window_seconds: float = 60,
+                 burst: Optional[int] = None):
+        self.default_interval = window_seconds / max(1, requests_per_window)
+        self.default_capacity = float(burst or requests_per_window)
+        self._buckets: Dict[str, _Bucket] = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, host: str, now: float) -> _Bucket:
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = _Bucket(self.default_capacity, self.default_interval, now)
+            self._buckets[host] = bucket
+        return bucket
+
+    def reserve(self, host: str) -> float:
+        """Host için bir istek hakkı ayırır ve beklenmesi gereken süreyi döndürür
+
+        Token varsa 0 döner. Yoksa token negatife düşer; bu sayede ardışık
+        çağrılar sıraya girer ve her biri kendi slotunu bekler.
+        """
+        with self._lock:
+            now = time.monotonic()
+            bucket = self._bucket(host, now)
+
+            elapsed = now - bucket.updated_at
+            bucket.tokens = min(bucket.capacity, bucket.tokens + elapsed / bucket.interval)
+            bucket.updated_at = now
+            bucket.tokens -= 1
+
+            wait = -bucket.tokens * bucket.interval if bucket.tokens < 0 else 0.0
+            return max(wait, bucket.blocked_until - now)
+
+    def wait(self, host: str) -> float:
+        """Gerekirse bekler; beklenen süreyi döndürür"""
+        delay = self.reserve(host)
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    async def async_wait(self, host: str) -> float:
+        """wait() ile aynı, event loop'u bloklamadan bekler"""
+        delay = self.reserve(host)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+    def set_crawl_delay(self, host: str, delay: float):
+        """robots.txt Crawl-delay: host'a en fazla delay saniyede bir istek"""
+        if not delay or delay <= 0:
+            return
+        with self._lock:
+            bucket = self._bucket(host, time.monotonic())
+            if delay > bucket.interval:
+                bucket.interval = delay
+                bucket.capacity = 1.0
+                bucket.tokens = min(bucket.tokens, 1.0)
+
+    def penalize(self, host: str, seconds: float):
+        """Retry-After: host'a verilen süre boyunca istek gönderme"""
+        if not seconds or seconds <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            bucket = self._bucket(host, now)
+            bucket.blocked_until = max(bucket.blocked_until, now + seconds)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After başlığını saniyeye çevirir (saniye ya da HTTP tarihi)"""
+    if not value:
+        return None
+
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at is None:
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
@@ -0,0 +1,75 @@
+"""
+Yanıt Kapısı - AI Overview Projesi
+Gövdeyi indirmeden önce Content-Type ve Content-Length başlıklarını kontrol eder,
+gövdeyi parça parça okuyarak bayt sınırını aşan yanıtları keser.
+"""
+
+import logging
+from typing import AsyncIterable, Iterable, Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+def media_type(content_type: Optional[str]) -> str:
+    """'text/html; charset=utf-8' -> 'text/html'"""
+    return (content_type or '').split(';', 1)[0].strip().lower()
+
+
+class ResponseGate:
+    """Desteklenmeyen ya da çok büyük yanıtları parse öncesi eler
+
+    Content-Type başlığı olmayan yanıtlar kabul edilir. Atlanan yanıtlar
+    ``stats`` sözlüğünde sayılır.
+    """
+
+    def __init__(self, supported_types: Iterable[str], max_bytes: int,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self.supported_types = frozenset(media_type(value) for value in supported_types)
+        self.max_bytes = max_bytes
+        self.chunk_size = chunk_size
+        self.stats = {'unsupported_content_type': 0, 'too_large': 0}
+
+    def accepts_headers(self, url: str, headers: Mapping[str, str]) -> bool:
+        """Gövde okunmadan önce başlıkları kontrol eder"""
+        content_type = media_type(headers.get('Content-Type'))
+        if content_type and content_type not in self.supported_types:
+            self.stats['unsupported_content_type'] += 1
+            logger.info(f"Desteklenmeyen içerik türü atlandı ({content_type}): {url}")
+            return False
+
+        content_length = headers.get('Content-Length')
+        if content_length and content_length.isdigit() and int(content_length) > self.max_bytes:
+            self._too_large(url)
+            return False
+        return True
+
+    def read_body(self, url: str, chunks: Iterable[bytes]) -> Optional[bytes]:
+        """Gövdeyi max_bytes'a kadar okur; sınır aşılırsa None"""
+        body = bytearray()
+        for chunk in chunks:
+            body += chunk
+            if len(body) > self.max_bytes:
+                self._too_large(url)
+                return None
+        return bytes(body)
+
+    async def async_read_body(self, url: str, chunks: AsyncIterable[bytes]) -> Optional[bytes]:
+        body = bytearray()
+        async for chunk in chunks:
+            body += chunk
+            if len(body) > self.max_bytes:
+                self._too_large(url)
+                return None
+        return bytes(body)
+
+    def read_requests_response(self, url: str, response) -> Optional[bytes]:
+        """stream=True ile açılmış requests yanıtı için başlık + gövde kontrolü"""
+        if not self.accepts_headers(url, response.headers):
+            return None
+        return self.read_body(url, response.iter_content(self.chunk_size))
+
+    def _too_large(self, url: str):
+        self.stats['too_large'] += 1
+        logger.info(f"Yanıt boyut sınırını ({self.max_bytes} bayt) aştı, atlandı: {url}")
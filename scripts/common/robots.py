@@ -0,0 +1,61 @@
+"""
+robots.txt Önbelleği - AI Overview Projesi
+Host başına robots.txt'i bir kez indirir; Crawl-delay ve erişim kurallarını sunar.
+"""
+
+import logging
+import threading
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlparse
+from urllib.robotparser import RobotFileParser
+
+logger = logging.getLogger(__name__)
+
+# robots.txt URL'i -> metin (yoksa ya da indirilemezse None)
+FetchText = Callable[[str], Optional[str]]
+
+
+class RobotsCache:
+    """Host başına ayrıştırılmış robots.txt önbelleği"""
+
+    def __init__(self, fetch_text: FetchText, user_agent: str = '*'):
+        self.fetch_text = fetch_text
+        self.user_agent = user_agent
+        self._parsers: Dict[str, RobotFileParser] = {}
+        self._lock = threading.Lock()
+
+    def get(self, url: str) -> RobotFileParser:
+        """URL'in host'u için robots.txt parser'ını döndürür"""
+        parsed = urlparse(url)
+        origin = f"{parsed.scheme}://{parsed.netloc}"
+
+        with self._lock:
+            parser = self._parsers.get(origin)
+        if parser is not None:
+            return parser
+
+        robots_url = f"{origin}/robots.txt"
+        parser = RobotFileParser(robots_url)
+        try:
+            text = self.fetch_text(robots_url)
+        except Exception as e:
+            logger.warning(f"robots.txt okunamadı {robots_url}: {str(e)}")
+            text = None
+        # robots.txt yoksa her şeye izin verilir
+        parser.parse(text.splitlines() if text else [])
+
+        with self._lock:
+            return self._parsers.setdefault(origin, parser)
+
+    def crawl_delay(self, url: str) -> Optional[float]:
+        """Host için tanımlı Crawl-delay (saniye)"""
+        parser = self.get(url)
+        delay = parser.crawl_delay(self.user_agent)
+        return float(delay) if delay is not None else None
+
+    def can_fetch(self, url: str) -> bool:
+        return self.get(url).can_fetch(self.user_agent, url)
+
+    def sitemaps(self, url: str) -> List[str]:
+        """robots.txt'deki Sitemap: satırları"""
+        return self.get(url).site_maps() or []
@@ -0,0 +1,302 @@
+"""
+Parçalı (Sharded) Tarama - AI Overview Projesi
+Büyük siteleri tek bir fonksiyon çağrısının süre sınırına takılmadan tarar.
+Frontier URL hash'ine göre parçalara bölünür; her turda her parçanın iş öğesi
+Pub/Sub'a yayınlanır ve ayrı çağrılarda işlenir. Turu son bitiren çağrı
+koordinatör olur: sonraki turu planlar ya da parça çıktılarını tek ham
+dosyada birleştirir.
+"""
+
+import json
+import logging
+import time
+import zlib
+from collections import defaultdict
+from typing import Callable, Dict, Iterator, List, Optional
+from urllib.parse import urlparse
+
+from .compression import codec_for_name
+from .crawl_pipeline import CachedPage, FetchFunc, ParseFunc
+from .frontier import UrlSeenIndex
+from .jsonl import JsonlWriter, iter_records
+from .object_store import ObjectStore
+from .parse_pool import PendingParse
+from .url_canonicalizer import canonicalize_url, resolve_page_url
+
+logger = logging.getLogger(__name__)
+
+STEP_CRAWL_SHARD = 'crawl-shard'
+STEP_MERGE_SHARDS = 'merge-shards'
+
+STATE_PREFIX = 'crawl_state'
+
+
+def shard_for_url(url: str, num_shards: int) -> int:
+    """URL'in parçası; süreçler arasında kararlı (crc32)"""
+    return zlib.crc32(url.encode('utf-8')) % num_shards
+
+
+def urls_within_time(requests_per_window: int, window_seconds: float, seconds: float,
+                     burst: int = 0) -> int:
+    """Host hız sınırıyla seconds saniyede indirilebilecek URL sayısı (en az 1)
+
+    Token bucket: burst kadar istek hemen, kalanlar requests_per_window /
+    window_seconds hızıyla gönderilir.
+    """
+    rate = max(1, requests_per_window) / window_seconds
+    return max(1, int(burst + seconds * rate))
+
+
+def allocate_round(pending: Dict[int, List[str]], limit: int, per_shard: int) -> Dict[int, List[str]]:
+    """Parça kuyruklarının başından, parça başına per_shard ve toplam limit URL seçer
+
+    URL'ler parçalar arasında sırayla (round-robin) alınır; bütçe azsa tüm
+    parçalar eşit ilerler. Seçilenler pending'den çıkarılır.
+    """
+    items = defaultdict(list)
+    total = 0
+    for position in range(per_shard):
+        progressed = False
+        for shard in sorted(pending):
+            if total >= limit:
+                break
+            if position < len(pending[shard]):
+                items[shard].append(pending[shard][position])
+                total += 1
+                progressed = True
+        if total >= limit or not progressed:
+            break
+    for shard, urls in items.items():
+        del pending[shard][:len(urls)]
+    return dict(items)
+
+
+class ShardedCrawl:
+    """Tur tabanlı parçalı tarama
+
+    Durum, depodaki ``crawl_state/<crawl_id>/`` altında tutulur:
+
+    - ``manifest.json``: başlangıç URL'i, sayfa bütçesi, parça sayısı, çıktı adı
+    - ``state/<tur>.json`` + ``seen/<tur>.bin`` + ``emitted/<tur>.bin``: tur
+      planlandıktan sonra kalan parça kuyrukları, tamamlanan sayfa sayısı,
+      görülmüş URL indeksi ve üretilmiş (canonical) sayfa indeksi
+    - ``rounds/<tur>.json``: turun iş öğeleri; oluşturulması koordinatör seçimidir
+    - ``results/<tur>/<parça>.json`` ve ``records/<tur>-<parça>.jsonl.gz``
+
+    Tarama, diğer tarayıcılar gibi başlangıç URL'inin host'uyla sınırlıdır;
+    ``link_filter`` ek olarak dışlama kurallarını uygular.
+
+    Kopya eleme turlar arasında koordinatörde yapılır; parçalar yalnızca
+    kendilerine verilen URL'leri indirir ve parse eder. Sayfa bütçesi canonical
+    kopyalar elendikten sonra sayılır, eksik kalan bütçe sonraki turda dolar. Aynı iş öğesinin
+    yeniden teslimi aynı dosyaların üzerine yazar.
+    """
+
+    def __init__(self, store: ObjectStore, publish: Callable[[Dict], None],
+                 fetch_page: FetchFunc, parse_page: ParseFunc,
+                 link_filter: Optional[Callable[[str], bool]] = None,
+                 canonicalize: Callable[[str], str] = canonicalize_url,
+                 max_urls_per_shard: int = 100):
+        self.store = store
+        self.publish = publish
+        self.fetch_page = fetch_page
+        self.parse_page = parse_page
+        self.link_filter = link_filter
+        self.canonicalize = canonicalize
+        self.max_urls_per_shard = max(1, max_urls_per_shard)
+
+    @staticmethod
+    def _path(crawl_id: str, name: str) -> str:
+        return f"{STATE_PREFIX}/{crawl_id}/{name}"
+
+    def _read_json(self, crawl_id: str, name: str) -> Optional[Dict]:
+        data = self.store.read(self._path(crawl_id, name))
+        return json.loads(data) if data is not None else None
+
+    def _write_json(self, crawl_id: str, name: str, value: Dict):
+        self.store.write(self._path(crawl_id, name), json.dumps(value, ensure_ascii=False).encode('utf-8'))
+
+    def _scope(self, manifest: Dict) -> Callable[[str], bool]:
+        domain = urlparse(manifest['start_url']).netloc
+
+        def in_scope(url: str) -> bool:
+            return urlparse(url).netloc == domain and (self.link_filter is None or self.link_filter(url))
+        return in_scope
+
+    def manifest(self, crawl_id: str) -> Dict:
+        manifest = self._read_json(crawl_id, 'manifest.json')
+        if manifest is None:
+            raise FileNotFoundError(f"Parçalı tarama bulunamadı: {crawl_id}")
+        return manifest
+
+    def start(self, start_url: str, max_pages: int, num_shards: int, output: str,
+              crawl_id: Optional[str] = None) -> str:
+        """Taramayı başlatır ve ilk turun iş öğelerini yayınlar; crawl_id döndürür"""
+        crawl_id = crawl_id or time.strftime('%Y%m%d_%H%M%S')
+        start_url = self.canonicalize(start_url)
+        manifest = {
+            'start_url': start_url,
+            'max_pages': max_pages,
+            'num_shards': max(1, num_shards),
+            'output': output,
+            'created_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+        }
+        self._write_json(crawl_id, 'manifest.json', manifest)
+        seen = UrlSeenIndex()
+        seen.add(start_url)
+        pending = {shard_for_url(start_url, manifest['num_shards']): [start_url]}
+        self._plan_round(crawl_id, 0, pending, seen, UrlSeenIndex(), pages_done=0, manifest=manifest)
+        logger.info(f"Parçalı tarama başlatıldı: {crawl_id} ({num_shards} parça, en fazla {max_pages} sayfa)")
+        return crawl_id
+
+    def handle(self, message: Dict) -> Optional[Dict]:
+        """Pub/Sub mesajını işler; birleştirme adımında özet döndürür
+
+        Temizlenmiş (bitmiş) bir taramanın yeniden teslim edilen mesajı
+        FileNotFoundError yükseltir.
+        """
+        step = message.get('step')
+        if step == STEP_CRAWL_SHARD:
+            self.process_shard(message['crawl_id'], message['round'], message['shard'])
+        elif step == STEP_MERGE_SHARDS:
+            return self.merge(message['crawl_id'])
+        return None
+
+    # Parça işleme
+
+    def process_shard(self, crawl_id: str, round_index: int, shard: int):
+        """Turun bu parçaya düşen URL'lerini indirir, parse eder ve sonuçları yazar"""
+        manifest = self.manifest(crawl_id)
+        result_name = f"results/{round_index:05d}/{shard:03d}.json"
+        if self._read_json(crawl_id, result_name) is None:
+            plan = self._read_json(crawl_id, f"rounds/{round_index:05d}.json")
+            urls = plan['items'].get(str(shard), [])
+            in_scope = self._scope(manifest)
+            result = self._crawl_urls(crawl_id, round_index, shard, urls, in_scope)
+            self._write_json(crawl_id, result_name, result)
+            logger.info(f"Parça tamamlandı: tur {round_index}, parça {shard} "
+                        f"({result['pages']}/{len(urls)} sayfa, {len(result['links'])} bağlantı)")
+        else:
+            logger.info(f"Parça zaten tamamlanmış (yeniden teslim): tur {round_index}, parça {shard}")
+        self._maybe_advance(crawl_id, round_index, manifest)
+
+    def _crawl_urls(self, crawl_id: str, round_index: int, shard: int, urls: List[str],
+                    in_scope: Callable[[str], bool]) -> Dict:
+        page_urls = []
+        links = []
+        canonical_urls = []
+        link_seen = set()
+        records_name = self._path(crawl_id, f"records/{round_index:05d}-{shard:03d}.jsonl.gz")
+        with JsonlWriter(self.store.open_write(records_name), codec_for_name(records_name)) as writer:
+            for url in urls:
+                content = self.fetch_page(url)
+                if content is None:
+                    continue
+                if isinstance(content, CachedPage):
+                    record, page_links = content
+                else:
+                    try:
+                        parsed = self.parse_page(url, content)
+                        record, page_links = parsed.result() if isinstance(parsed, PendingParse) else parsed
+                    except Exception as e:
+                        logger.error(f"Sayfa parse hatası {url}: {str(e)}")
+                        continue
+
+                page_url = resolve_page_url(url, record.get('canonical_url') if record else None,
+                                            self.canonicalize, in_scope)
+                if page_url != url:
+                    canonical_urls.append(page_url)
+                if record:
+                    record['url'] = page_url
+                    writer.write(record)
+                page_urls.append(page_url)
+
+                for link in map(self.canonicalize, page_links):
+                    if link in link_seen or not in_scope(link):
+                        continue
+                    link_seen.add(link)
+                    links.append(link)
+        return {'pages': len(page_urls), 'page_urls': page_urls, 'links': links, 'canonical_urls': canonical_urls}
+
+    # Koordinasyon
+
+    def _maybe_advance(self, crawl_id: str, round_index: int, manifest: Dict):
+        """Turun tüm parçaları bittiyse sonraki turu planlar (yalnızca bir çağrı başarır)"""
+        plan = self._read_json(crawl_id, f"rounds/{round_index:05d}.json")
+        finished = self.store.list(self._path(crawl_id, f"results/{round_index:05d}/"))
+        if len(finished) < len(plan['items']):
+            return
+
+        state = self._read_json(crawl_id, f"state/{round_index:05d}.json")
+        seen = UrlSeenIndex.from_bytes(self.store.read(self._path(crawl_id, f"seen/{round_index:05d}.bin")))
+        emitted = UrlSeenIndex.from_bytes(
+            self.store.read(self._path(crawl_id, f"emitted/{round_index:05d}.bin")) or b'')
+        pending = {int(shard): urls for shard, urls in state['pending'].items()}
+
+        pages_done = state['pages_done']
+        for name in finished:
+            result = json.loads(self.store.read(name))
+            # Aynı canonical sayfaya çıkan kopyalar (parçalar arası da) bütçeden düşülmez
+            pages_done += sum(emitted.add(url) for url in result['page_urls'])
+            for url in result['canonical_urls']:
+                seen.add(url)
+            for link in result['links']:
+                if seen.add(link):
+                    pending.setdefault(shard_for_url(link, manifest['num_shards']), []).append(link)
+
+        self._plan_round(crawl_id, round_index + 1, pending, seen, emitted, pages_done, manifest)
+
+    def _plan_round(self, crawl_id: str, round_index: int, pending: Dict[int, List[str]],
+                    seen: UrlSeenIndex, emitted: UrlSeenIndex, pages_done: int, manifest: Dict):
+        max_pages = manifest['max_pages']
+        remaining = max_pages - pages_done
+        items = allocate_round(pending, remaining, self.max_urls_per_shard) if remaining > 0 else {}
+
+        # Durum, seçimden önce yazılır: içerik her adayda aynıdır, kazanan çökse de kaybolmaz
+        self._write_json(crawl_id, f"state/{round_index:05d}.json", {
+            'pages_done': pages_done,
+            'pending': {str(shard): urls for shard, urls in pending.items() if urls},
+        })
+        self.store.write(self._path(crawl_id, f"seen/{round_index:05d}.bin"), seen.to_bytes())
+        self.store.write(self._path(crawl_id, f"emitted/{round_index:05d}.bin"), emitted.to_bytes())
+
+        plan = {'items': {str(shard): urls for shard, urls in items.items()}, 'merge': not items}
+        if not self.store.create(self._path(crawl_id, f"rounds/{round_index:05d}.json"),
+                                 json.dumps(plan, ensure_ascii=False).encode('utf-8')):
+            return  # Başka bir çağrı koordinatör oldu
+
+        if not items:
+            logger.info(f"Parçalı tarama bitti ({pages_done} sayfa), çıktılar birleştiriliyor: {crawl_id}")
+            self.publish({'step': STEP_MERGE_SHARDS, 'crawl_id': crawl_id})
+            return
+
+        logger.info(f"Tur {round_index}: {sum(map(len, items.values()))} URL, {len(items)} parça "
+                    f"({pages_done}/{max_pages} sayfa tamamlandı)")
+        for shard in sorted(items):
+            self.publish({'step': STEP_CRAWL_SHARD, 'crawl_id': crawl_id, 'round': round_index,
+                          'shard': shard, 'shards': manifest['num_shards']})
+
+    # Birleştirme
+
+    def iter_merged_records(self, crawl_id: str) -> Iterator[Dict]:
+        """Parça kayıtları tur ve parça sırasıyla; canonical kopyaları elenir"""
+        emitted = UrlSeenIndex()
+        for name in self.store.list(self._path(crawl_id, 'records/')):
+            with self.store.open_read(name) as stream:
+                for record in iter_records(stream):
+                    if emitted.add(record['url']):
+                        yield record
+
+    def merge(self, crawl_id: str) -> Dict:
+        """Parça çıktılarını manifest'teki tek ham dosyada birleştirir"""
+        manifest = self.manifest(crawl_id)
+        output = manifest['output']
+        with JsonlWriter(self.store.open_write(output), codec_for_name(output)) as writer:
+            writer.write_all(self.iter_merged_records(crawl_id))
+        logger.info(f"Parça çıktıları birleştirildi: {output} ({writer.count} kayıt)")
+        return {'crawl_id': crawl_id, 'output': output, 'pages_processed': writer.count,
+                'start_url': manifest['start_url']}
+
+    def cleanup(self, crawl_id: str):
+        """Tarama durumunu ve parça çıktılarını siler (birleştirilmiş dosya kalır)"""
+        self.store.delete_prefix(f"{STATE_PREFIX}/{crawl_id}/")
@@ -0,0 +1,134 @@
+"""
+Sitemap Okuyucu - AI Overview Projesi
+Sitemap ve sitemap index dosyalarını (gzip dahil) belleğe tamamen yüklemeden akış
+halinde okur; her URL'i lastmod ve priority bilgisiyle üretir.
+"""
+
+import logging
+import xml.etree.ElementTree as ET
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import BinaryIO, Callable, ContextManager, Iterable, Iterator, NamedTuple, Optional
+
+from .compression import decompressing_reader
+
+logger = logging.getLogger(__name__)
+
+
+class SitemapUrl(NamedTuple):
+    """Sitemap'teki tek bir <url> girdisi"""
+    loc: str
+    lastmod: Optional[datetime]
+    priority: Optional[float]
+
+
+# sitemap URL'i -> okunabilir ikili akış (context manager)
+OpenStream = Callable[[str], ContextManager[BinaryIO]]
+
+
+def parse_lastmod(value: Optional[str]) -> Optional[datetime]:
+    """W3C datetime (YYYY-MM-DD ya da tam zaman damgası) -> UTC datetime"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.strip().replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit('}', 1)[-1]
+
+
+def _child_text(element: ET.Element, name: str) -> Optional[str]:
+    for child in element:
+        if _local_name(child.tag) == name:
+            return (child.text or '').strip() or None
+    return None
+
+
+def iter_sitemap_entries(stream: BinaryIO) -> Iterator[tuple]:
+    """Tek bir sitemap akışını ayrıştırır
+
+    ('url', SitemapUrl) ya da ('sitemap', loc) çiftleri üretir. İşlenen
+    elemanlar hemen silinir; bellek kullanımı dosya boyutundan bağımsızdır.
+    """
+    root = None
+    for event, element in ET.iterparse(decompressing_reader(stream), events=('start', 'end')):
+        if event == 'start':
+            if root is None:
+                root = element
+            continue
+
+        name = _local_name(element.tag)
+        if name == 'url':
+            loc = _child_text(element, 'loc')
+            if loc:
+                priority = _child_text(element, 'priority')
+                try:
+                    priority = float(priority) if priority else None
+                except ValueError:
+                    priority = None
+                yield 'url', SitemapUrl(loc, parse_lastmod(_child_text(element, 'lastmod')), priority)
+            root.clear()
+        elif name == 'sitemap':
+            loc = _child_text(element, 'loc')
+            if loc:
+                yield 'sitemap', loc
+            root.clear()
+
+
+class SitemapReader:
+    """Sitemap index'leri takip ederek tüm URL girdilerini akış halinde üretir
+
+    ``complete``: son okuma hatasız ve max_sitemaps sınırına takılmadan bitti mi
+    (eksik okunan sitemap'e göre sayfa silinmemesi için).
+    """
+
+    def __init__(self, open_stream: OpenStream, max_sitemaps: int = 1000):
+        self.open_stream = open_stream
+        self.max_sitemaps = max_sitemaps
+        self.complete = False
+
+    def iter_urls(self, sitemap_urls: Iterable[str]) -> Iterator[SitemapUrl]:
+        pending = deque(sitemap_urls)
+        visited = set()
+        self.complete = False
+        errors = 0
+
+        while pending and len(visited) < self.max_sitemaps:
+            sitemap_url = pending.popleft()
+            if sitemap_url in visited:
+                continue
+            visited.add(sitemap_url)
+
+            logger.info(f"Sitemap okunuyor: {sitemap_url}")
+            try:
+                with self.open_stream(sitemap_url) as stream:
+                    for kind, value in iter_sitemap_entries(stream):
+                        if kind == 'sitemap':
+                            pending.append(value)
+                        else:
+                            yield value
+            except Exception as e:
+                errors += 1
+                logger.warning(f"Sitemap okunamadı {sitemap_url}: {str(e)}")
+
+        self.complete = not errors and not pending
+
+
+@contextmanager
+def open_requests_stream(session, url: str, timeout: float = 30):
+    """requests ile sitemap'i gövdeyi belleğe almadan açar"""
+    response = session.get(url, timeout=timeout, stream=True)
+    try:
+        response.raise_for_status()
+        # Content-Encoding: gzip ise urllib3 açar; .gz dosyaları decompressing_reader açar
+        response.raw.decode_content = True
+        yield response.raw
+    finally:
+        response.close()
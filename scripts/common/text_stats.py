@@ -0,0 +1,109 @@
+"""
+Metin İstatistikleri - AI Overview Projesi
+Temizleme, kısaltma ve kelime sayımı için ortak çekirdek: metin bir kez
+taranır; kelime sayısı, kısaltma noktası ve meta açıklama özeti birlikte döner.
+Kelimeler str.split() ile aynı tanımlanır (boşluklarla ayrılmış parçalar).
+"""
+
+import re
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+
+def _is_single_spaced(text: str) -> bool:
+    """Metindeki tek boşluk karakteri ' ' mi ve kelimeler arasında tam bir boşluk mu var?
+
+    isprintable(), ' ' dışındaki tüm boşluk karakterlerinde (\\n, \\t, \\xa0,
+    Unicode boşlukları) False döner. Parser çıktısı çoğunlukla bu biçimdedir.
+    """
+    return (text.isprintable() and '  ' not in text
+            and not text.startswith(' ') and not text.endswith(' '))
+
+
+def _count_words(text: str, single_spaced: bool) -> int:
+    if not text:
+        return 0
+    if single_spaced:
+        return text.count(' ') + 1
+    return len(text.split())
+
+
+def count_words(text: str) -> int:
+    """len(text.split()) ile aynı sonuç; tek boşluklu metinde liste oluşturmadan sayar"""
+    return _count_words(text, _is_single_spaced(text))
+
+
+@lru_cache(maxsize=8)
+def _first_words_pattern(max_words: int):
+    return re.compile(r'\s*(?:\S+\s+){%d}\S+' % (max_words - 1))
+
+
+def _nth_space(text: str, n: int, word_count: int) -> int:
+    """Tek boşluklu metinde n. boşluğun konumu (n < word_count)
+
+    Konum kelime oranından tahmin edilir, tahmine kadarki boşluklar sayılır
+    (str.count) ve kalan fark find/rfind ile kapatılır.
+    """
+    guess = len(text) * n // word_count
+    found = text.count(' ', 0, guess)
+    position = guess
+    if found < n:
+        position -= 1
+        for _ in range(n - found):
+            position = text.find(' ', position + 1)
+    else:
+        for _ in range(found - n + 1):
+            position = text.rfind(' ', 0, position)
+    return position
+
+
+def word_boundary(text: str, max_words: int) -> int:
+    """İlk max_words kelimenin bittiği karakter konumu (metin daha kısaysa len(text))"""
+    if max_words <= 0:
+        return 0
+    match = _first_words_pattern(max_words).match(text)
+    return match.end() if match else len(text)
+
+
+class TextStats(NamedTuple):
+    word_count: int                # Metnin tamamındaki kelime sayısı
+    kept_word_count: int           # Kısaltmadan sonra kalan kelime sayısı
+    truncate_at: Optional[int]     # max_words aşıldıysa kesme noktası (karakter), aşılmadıysa None
+    excerpt: str                   # Kısaltılmış metnin ilk excerpt_chars karakteri
+
+    @property
+    def truncated(self) -> bool:
+        return self.truncate_at is not None
+
+    def apply(self, text: str) -> str:
+        """Metni kesme noktasından kısaltır (aradaki boşluklar korunur)"""
+        return text if self.truncate_at is None else text[:self.truncate_at]
+
+
+def analyze_text(text: str, max_words: Optional[int] = None, excerpt_chars: int = 0) -> TextStats:
+    """Kelime sayısı, max_words'e göre kesme noktası ve özet
+
+    Özet, kısaltılmış metnin ilk excerpt_chars karakteridir; metin daha uzunsa
+    sonuna "..." eklenir. excerpt_chars 0 ise özet boş döner.
+    """
+    single_spaced = _is_single_spaced(text)
+    word_count = _count_words(text, single_spaced)
+
+    truncate_at = None
+    end = len(text)
+    if max_words is not None and word_count > max_words:
+        if single_spaced and max_words > 0:
+            truncate_at = end = _nth_space(text, max_words, word_count)
+        else:
+            truncate_at = end = word_boundary(text, max_words)
+
+    excerpt = ''
+    if excerpt_chars:
+        excerpt = text[:excerpt_chars] + "..." if end > excerpt_chars else text[:end]
+
+    return TextStats(
+        word_count=word_count,
+        kept_word_count=word_count if truncate_at is None else max_words,
+        truncate_at=truncate_at,
+        excerpt=excerpt,
+    )
@@ -0,0 +1,77 @@
+"""
+URL Kanonikleştirme - AI Overview Projesi
+Aynı mantıksal sayfayı gösteren URL varyantlarını (büyük harfli host, fragment,
+izleme parametreleri, sondaki '/', parametre sırası) tek bir biçime indirger.
+"""
+
+from functools import lru_cache
+from typing import Callable, Optional
+from urllib.parse import unquote, urlsplit, urlunsplit
+
+# Sayfa içeriğini değiştirmeyen izleme parametreleri
+TRACKING_PARAMS = frozenset({
+    'gclid', 'gclsrc', 'dclid', 'fbclid', 'msclkid', 'yclid', 'twclid', 'igshid',
+    'mc_cid', 'mc_eid', '_ga', '_gl', '_hsenc', '_hsmi', 'ref_src', 'srsltid',
+})
+TRACKING_PARAM_PREFIXES = ('utm_', 'pk_', 'hsa_')
+
+DEFAULT_PORTS = {'http': '80', 'https': '443'}
+
+
+def _is_tracking_param(name: str) -> bool:
+    name = unquote(name).lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PARAM_PREFIXES)
+
+
+@lru_cache(maxsize=100000)
+def canonicalize_url(url: str) -> str:
+    """URL'in kanonik biçimi
+
+    Şema ve host küçük harfe çevrilir, varsayılan port ve fragment atılır,
+    izleme parametreleri silinip kalanlar sıralanır, kök dışındaki yollarda
+    sondaki '/' kaldırılır. Parametreler yeniden kodlanmaz.
+    """
+    try:
+        parts = urlsplit(url.strip())
+        port = parts.port
+    except ValueError:
+        return url
+    scheme = parts.scheme.lower()
+    if scheme not in DEFAULT_PORTS or not parts.hostname:
+        return url
+
+    netloc = parts.hostname.rstrip('.')
+    if ':' in netloc:  # IPv6
+        netloc = f'[{netloc}]'
+    if port is not None and str(port) != DEFAULT_PORTS[scheme]:
+        netloc = f'{netloc}:{port}'
+    if parts.username or parts.password:
+        userinfo = parts.username or ''
+        if parts.password:
+            userinfo += f':{parts.password}'
+        netloc = f'{userinfo}@{netloc}'
+
+    path = parts.path or '/'
+    if len(path) > 1 and path.endswith('/'):
+        path = path.rstrip('/') or '/'
+
+    params = sorted(param for param in parts.query.split('&')
+                    if param and not _is_tracking_param(param.split('=', 1)[0]))
+
+    return urlunsplit((scheme, netloc, path, '&'.join(params), ''))
+
+
+def resolve_page_url(url: str, declared_url: Optional[str],
+                     canonicalize: Callable[[str], str] = canonicalize_url,
+                     link_filter: Optional[Callable[[str], bool]] = None) -> str:
+    """Sayfanın kanonik URL'i: taranabilir bir <link rel=canonical> varsa o
+
+    Tarama kapsamı dışındaki (başka domain, filtrelenen) canonical
+    bildirimleri yok sayılır ve indirilen URL kullanılır.
+    """
+    if not declared_url:
+        return url
+    declared = canonicalize(declared_url)
+    if declared == url or (link_filter and not link_filter(declared)):
+        return url
+    return declared
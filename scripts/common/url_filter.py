@@ -0,0 +1,72 @@
+"""
+URL Filtresi - AI Overview Projesi
+INCLUDE_PATTERNS / EXCLUDE_PATTERNS listelerini bir kez derleyip tek eşleştiricide
+birleştirir. Uzantı desenleri küme aramasıyla, sonuçlar URL başına önbellekle sunulur.
+"""
+
+import re
+from functools import lru_cache
+from typing import FrozenSet, Iterable, List, Optional, Tuple
+
+# '.*\.(pdf|doc|docx)$' biçimindeki salt uzantı desenleri
+_EXTENSION_PATTERN = re.compile(r'^\.\*\\\.\(([A-Za-z0-9|]+)\)\$$')
+
+# Her şeyi kabul eden include deseni: regex çalıştırmaya gerek yok
+_MATCH_ALL_PATTERNS = {'.*', '.+', '^.*$', '.*$'}
+
+
+def _split_extension_patterns(patterns: Iterable[str]) -> Tuple[FrozenSet[str], List[str]]:
+    """Desenleri uzantı kümesi ve kalan regex'ler olarak ayırır"""
+    extensions = set()
+    remaining = []
+    for pattern in patterns:
+        match = _EXTENSION_PATTERN.match(pattern)
+        if match:
+            extensions.update(ext.lower() for ext in match.group(1).split('|'))
+        else:
+            remaining.append(pattern)
+    return frozenset(extensions), remaining
+
+
+def _combine(patterns: List[str]) -> Optional[re.Pattern]:
+    """Desenleri tek bir alternasyonda derler (re.match semantiği korunur)"""
+    if not patterns:
+        return None
+    return re.compile('|'.join(f'(?:{pattern})' for pattern in patterns), re.IGNORECASE)
+
+
+class UrlFilter:
+    """Derlenmiş include/exclude URL filtresi
+
+    Bir URL, include desenlerinden biriyle eşleşiyor ve hiçbir exclude
+    deseniyle eşleşmiyorsa kabul edilir. Desenler re.match ile ve büyük/küçük
+    harf duyarsız uygulanır.
+    """
+
+    def __init__(self, include_patterns: Iterable[str] = ('.*',),
+                 exclude_patterns: Iterable[str] = (), cache_size: int = 100000):
+        include_patterns = list(include_patterns)
+        self._include_all = any(pattern in _MATCH_ALL_PATTERNS for pattern in include_patterns)
+        self._include = None if self._include_all else _combine(include_patterns)
+        self._excluded_extensions, exclude_regexes = _split_extension_patterns(exclude_patterns)
+        self._exclude = _combine(exclude_regexes)
+        self._cached_allows = lru_cache(maxsize=cache_size)(self._evaluate)
+
+    def allows(self, url: str) -> bool:
+        """URL taranabilir mi?"""
+        return self._cached_allows(url)
+
+    def excludes(self, url: str) -> bool:
+        return not self._cached_allows(url)
+
+    def cache_info(self):
+        return self._cached_allows.cache_info()
+
+    def _evaluate(self, url: str) -> bool:
+        if self._excluded_extensions and url.rsplit('.', 1)[-1].lower() in self._excluded_extensions:
+            return False
+        if self._exclude is not None and self._exclude.match(url):
+            return False
+        if self._include_all:
+            return True
+        return self._include is not None and self._include.match(url) is not None
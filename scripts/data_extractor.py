@@ -4,20 +4,44 @@ Web sitelerinden içerik çıkarır ve yapılandırır.
 """
 
 import os
+import re
 import sys
-import requests
 import json
 import time
+from datetime import datetime
 from pathlib import Path
 from urllib.parse import urljoin, urlparse
-from bs4 import BeautifulSoup
-from typing import List, Dict, Optional
+from functools import partial
+from typing import Iterable, Iterator, List, Dict, Optional, Tuple, Union
 import logging
 from tqdm import tqdm
 
 # Proje kök dizinini sys.path'e ekle
 sys.path.append(str(Path(__file__).parent.parent))
 from config.settings import *
+from scripts.common.async_crawler import AsyncCrawler
+from scripts.common.boilerplate import BoilerplateLearner
+from scripts.common.checkpoint import CrawlCheckpoint
+from scripts.common.crawl_pipeline import CachedPage, CrawlResult, crawl_and_extract
+from scripts.common.frontier import CrawlFrontier, UrlSeenIndex
+from scripts.common.host_concurrency import AimdHostConcurrency
+from scripts.common.http_cache import CacheEntry, HttpCache, body_digest
+from scripts.common.http_client import CircuitBreaker, HttpClient, create_session
+from scripts.common.compression import CODEC_SUFFIXES, codec_for_name, with_codec_suffix
+from scripts.common.jsonl import open_jsonl_writer
+from scripts.common.link_graph import LinkGraph
+from scripts.common.local_pubsub import InProcessPubSub, decode_cloud_event
+from scripts.common.object_store import LocalObjectStore
+from scripts.common.page_parser import PARSER_BACKENDS, get_parser_backend
+from scripts.common.parse_pool import ParsePool
+from scripts.common.priority_frontier import PriorityFrontier, UrlScorer
+from scripts.common.rate_limiter import HostRateLimiter, parse_retry_after
+from scripts.common.response_gate import ResponseGate
+from scripts.common.robots import RobotsCache
+from scripts.common.sharded_crawl import STEP_MERGE_SHARDS, ShardedCrawl
+from scripts.common.sitemap import SitemapReader, open_requests_stream, parse_lastmod
+from scripts.common.url_canonicalizer import canonicalize_url, resolve_page_url
+from scripts.common.url_filter import UrlFilter
 
 # Loglama konfigürasyonu
 logging.basicConfig(level=LOG_LEVEL, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -26,170 +50,591 @@ logger = logging.getLogger(__name__)
 class WebsiteDataExtractor:
     """Web sitesi veri çıkarma sınıfı"""
     
-    def __init__(self, base_url: str, max_pages: int = 100):
+    def __init__(self, base_url: str, max_pages: int = 100, use_cache: bool = True,
+                 parser_backend: str = None, parse_workers: int = None):
         self.base_url = base_url
         self.max_pages = max_pages
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
+        self.parser_backend = parser_backend or HTML_PARSER_BACKEND
+        self.parser = get_parser_backend(self.parser_backend)
+        # 1'den fazla işlemde parse, indirmeyle paralel yürür
+        self.parse_workers = (PARSE_WORKERS if parse_workers is None else parse_workers) or os.cpu_count() or 1
+        self.url_filter = UrlFilter(INCLUDE_PATTERNS, EXCLUDE_PATTERNS)
+        # Keep-alive bağlantı havuzu, 5xx/zaman aşımında yeniden deneme, host başına devre kesici
+        self.session = create_session(
+            {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'},
+            pool_connections=HTTP_POOL_CONNECTIONS,
+            pool_maxsize=HTTP_POOL_MAXSIZE,
+            max_retries=MAX_RETRIES,
+            backoff_factor=RETRY_BACKOFF_FACTOR if ERROR_HANDLING['retry_exponential_backoff'] else 0,
+            backoff_jitter=RETRY_BACKOFF_JITTER
+        )
+        self.circuit_breaker = CircuitBreaker(ERROR_HANDLING['max_consecutive_errors'],
+                                              ERROR_HANDLING['error_cooldown_seconds'])
+        self.http = HttpClient(self.session, REQUEST_TIMEOUT, self.circuit_breaker)
         self.extracted_data = []
+        self.rate_limiter = HostRateLimiter(RATE_LIMIT_REQUESTS, RATE_LIMIT_WINDOW, RATE_LIMIT_BURST)
+        self.robots = RobotsCache(self._fetch_text, self.session.headers['User-Agent'])
+        self._robots_checked_hosts = set()
+        # HTML olmayan ya da çok büyük yanıtlar parse edilmeden atlanır
+        self.response_gate = ResponseGate(SUPPORTED_CONTENT_TYPES, MAX_RESPONSE_BYTES)
+        
+        # Koşullu GET önbelleği: değişmeyen sayfalar yeniden indirilmez/parse edilmez
+        self.http_cache = None
+        if ENABLE_CACHE and use_cache:
+            self.http_cache = HttpCache(HTTP_CACHE_PATH, CACHE_TTL, CACHE_MAX_SIZE)
+        self._pending_validators = {}
+        self.sitemap_lastmods = {}  # url -> sitemap <lastmod>
+        self.sitemap_priorities = None  # url -> sitemap <priority>; öncelikli frontier için bir kez okunur
+        self.crawl_stats = {}  # Son taramanın istatistikleri (ör. host eşzamanlılık kararları)
+        # Artımlı mod: yalnızca kesin kaldırılan sayfalar silinir (bkz. ManifestDelta)
+        self.gone_urls = set()  # 404/410 dönen URL'ler
+        self.discovered_urls = None  # Son keşif eksiksiz bittiyse listelediği URL'ler
+        self.fetch_failures = 0  # Geçici indirme hataları (zaman aşımı, 5xx, 429, devre kesici)
+        # Bağlantı taramasında site içi bağlantılar tamsayı kimliklerle toplanır
+        self.link_graph = LinkGraph() if LINK_GRAPH_ENABLED else None
+        # Site şablonu: ilk sayfalardan öğrenilir ya da önceki taramadan yüklenir
+        self.boilerplate = None
+        if BOILERPLATE_DETECTION:
+            self.boilerplate = BoilerplateLearner.load(
+                self._boilerplate_path(), BOILERPLATE_MAX_AGE_DAYS * 86400,
+                BOILERPLATE_SAMPLE_PAGES, BOILERPLATE_MIN_PAGE_RATIO
+            )
+        
+    def _fetch_text(self, url: str) -> Optional[str]:
+        """Küçük metin kaynaklarını (robots.txt vb.) indirir"""
+        response = self.http.get(url)
+        return response.text if response.status_code == 200 else None
+    
+    def _apply_crawl_delay(self, url: str):
+        """Host'un robots.txt Crawl-delay değerini hız sınırlayıcıya bir kez uygular"""
+        host = urlparse(url).netloc
+        if not SECURITY_SETTINGS['respect_robots_txt'] or host in self._robots_checked_hosts:
+            return
+        self._robots_checked_hosts.add(host)
+        
+        delay = self.robots.crawl_delay(url)
+        if delay:
+            logger.info(f"robots.txt Crawl-delay uygulanıyor: {host} ({delay} sn)")
+            self.rate_limiter.set_crawl_delay(host, delay)
+    
+    def fetch_page(self, url: str) -> Union[bytes, CachedPage, None]:
+        """Sayfayı indirir, hata durumunda None döndürür
+        
+        Önbellekteki sayfa değişmediyse (TTL içinde, 304 ya da aynı gövde)
+        parse gerektirmeyen CachedPage döner.
+        """
+        host = urlparse(url).netloc
+        entry = self.http_cache.lookup(url) if self.http_cache else None
+        if entry and entry.is_fresh:
+            return CachedPage(entry.record, entry.links)
         
-    def get_page_content(self, url: str) -> Optional[Dict]:
-        """Tek bir sayfadan içerik çıkarır"""
         try:
-            time.sleep(REQUEST_DELAY)  # Rate limiting
-            response = self.session.get(url, timeout=TIMEOUT)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Meta bilgileri çıkar
-            title = soup.find('title')
-            title_text = title.get_text().strip() if title else ""
-            
-            meta_description = soup.find('meta', attrs={'name': 'description'})
-            description = meta_description.get('content', '') if meta_description else ""
-            
-            # Ana içeriği çıkar - yaygın HTML etiketlerini kullan
-            content_selectors = [
-                'article', 'main', '.content', '#content', 
-                '.post-content', '.entry-content', '.article-content'
-            ]
-            
-            content = ""
-            for selector in content_selectors:
-                content_element = soup.select_one(selector)
-                if content_element:
-                    content = content_element.get_text(separator=' ', strip=True)
-                    break
+            # Sadece host'un istek bütçesi tükendiyse bekler
+            self._apply_crawl_delay(url)
+            self.rate_limiter.wait(host)
             
-            # Eğer ana içerik bulunamazsa, body'den çıkar
-            if not content:
-                body = soup.find('body')
-                if body:
-                    # Navigasyon, footer gibi öğeleri kaldır
-                    for tag in body(['nav', 'footer', 'header', 'aside', 'script', 'style']):
-                        tag.decompose()
-                    content = body.get_text(separator=' ', strip=True)
-            
-            # Başlıkları çıkar
-            headings = []
-            for i in range(1, 7):  # h1-h6
-                for heading in soup.find_all(f'h{i}'):
-                    headings.append({
-                        'level': i,
-                        'text': heading.get_text().strip()
-                    })
-            
-            # Bağlantıları çıkar
-            links = []
-            for link in soup.find_all('a', href=True):
-                href = link['href']
-                if href.startswith('http') or href.startswith('/'):
-                    absolute_url = urljoin(url, href)
-                    links.append({
-                        'url': absolute_url,
-                        'text': link.get_text().strip()
-                    })
-            
-            return {
-                'url': url,
-                'title': title_text,
-                'meta_description': description,
-                'content': content,
-                'headings': headings,
-                'links': links,
-                'word_count': len(content.split()),
-                'extracted_at': time.strftime('%Y-%m-%d %H:%M:%S')
-            }
+            logger.info(f"Sayfa indiriliyor: {url}")
+            headers = entry.conditional_headers() if entry else None
+            # Gövde, başlıklar kontrol edildikten sonra parça parça okunur
+            with self.http.get(url, headers=headers, stream=True) as response:
+                if response.status_code == 304 and entry:
+                    entry = self.http_cache.revalidated(entry)
+                    return CachedPage(entry.record, entry.links)
+                if response.status_code in (429, 503):
+                    retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                    self.rate_limiter.penalize(host, retry_after or REQUEST_DELAY)
+                if response.status_code in (404, 410):
+                    self.gone_urls.add(url)
+                    logger.info(f"Sayfa kaldırılmış ({response.status_code}): {url}")
+                    return None
+                response.raise_for_status()
+                
+                content = self.response_gate.read_requests_response(url, response)
+            if content is None:
+                return None
+            if self.http_cache:
+                digest = body_digest(content)
+                if entry and entry.digest == digest:
+                    entry = self.http_cache.revalidated(entry, not_modified=False)
+                    return CachedPage(entry.record, entry.links)
+                # Parse sonrası önbelleğe yazmak için doğrulayıcıları sakla
+                self._pending_validators[url] = (response.headers, digest)
+            return content
             
+        except Exception as e:
+            self.fetch_failures += 1
+            logger.error(f"Sayfa indirme hatası {url}: {str(e)}")
+            return None
+    
+    def get_page_content(self, url: str) -> Optional[Dict]:
+        """Tek bir sayfadan içerik çıkarır"""
+        content = self.fetch_page(url)
+        if content is None:
+            return None
+        if isinstance(content, CachedPage):
+            return content.record
+        
+        try:
+            record, _ = self._parse_and_cache(url, content)
+            return record
         except Exception as e:
             logger.error(f"Sayfa çıkarma hatası {url}: {str(e)}")
             return None
     
+    def parse_page_content(self, url: str, content: bytes) -> Dict:
+        """İndirilmiş HTML'den sayfa kaydını oluşturur"""
+        record, _ = self._parse_page(url, content)
+        return record
+    
+    def _parse_and_cache(self, url: str, html: bytes) -> Tuple[Dict, List[str]]:
+        """Sayfayı parse eder ve sonucu HTTP önbelleğine yazar"""
+        record, links = self._parse_page(url, html)
+        self._store_parsed(url, record, links)
+        return record, links
+    
+    def _store_parsed(self, url: str, record: Dict, links: List[str]):
+        """Parse sonucunu, indirmede saklanan doğrulayıcılarla önbelleğe yazar"""
+        validators = self._pending_validators.pop(url, None)
+        if self.http_cache and validators:
+            headers, digest = validators
+            self.http_cache.store(url, headers, digest, record, links)
+    
+    def _open_parse_pool(self) -> Optional[ParsePool]:
+        """parse_workers > 1 ise işlem havuzu; değilse None (parse aynı işlemde)"""
+        if self.parse_workers <= 1:
+            return None
+        return ParsePool(self.parser_backend, self.parse_workers, PARSE_QUEUE_SIZE)
+    
+    def _parse_page(self, url: str, html: bytes) -> Tuple[Dict, List[str]]:
+        """HTML'i bir kez parse eder; sayfa kaydını ve keşif bağlantılarını döndürür"""
+        return self.parser.parse(url, html, self._boilerplate_template(html))
+    
+    def _boilerplate_path(self) -> Path:
+        name = re.sub(r'[^A-Za-z0-9._-]+', '_', urlparse(self.base_url).netloc) or 'site'
+        return BOILERPLATE_DIR / f"{name}.json"
+    
+    def _boilerplate_template(self, html: bytes) -> Optional[frozenset]:
+        """Şablon öğrenilirken sayfanın bloklarını örnekler; öğrenildiyse şablonu döndürür"""
+        learner = self.boilerplate
+        if learner is None:
+            return None
+        if not learner.ready:
+            learner.observe(self.parser.block_fingerprints(html))
+            if learner.ready:
+                learner.save(self._boilerplate_path())
+        return learner.template
+    
+    def _is_crawlable_link(self, url: str, domain: str) -> bool:
+        """Bağlantı aynı domain'de ve INCLUDE/EXCLUDE_PATTERNS'e uygun mu?"""
+        return urlparse(url).netloc == domain and self.url_filter.allows(url)
+    
+    def crawl_pages(self, start_url: str, frontier: Optional[CrawlFrontier] = None,
+                    emitted: Optional[UrlSeenIndex] = None,
+                    completed_pages: int = 0) -> Iterator[CrawlResult]:
+        """Siteyi tek geçişte tarar: her URL bir kez indirilir ve bir kez parse edilir
+        
+        Parse işlem havuzu açıksa sonraki sayfalar, öncekiler parse edilirken
+        indirilir; sonuç sırası ve kayıtlar değişmez.
+        """
+        domain = urlparse(start_url).netloc
+        link_filter = lambda link: self._is_crawlable_link(link, domain)
+        if frontier is None:
+            frontier = self._new_frontier()
+        self.discovered_urls = None
+        failures_before = self.fetch_failures
+        
+        parse_pool = self._open_parse_pool()
+        if parse_pool:
+            def parse_page(url, html):
+                return parse_pool.submit(url, html, on_done=partial(self._store_parsed, url),
+                                         boilerplate=self._boilerplate_template(html))
+        else:
+            parse_page = self._parse_and_cache
+        
+        try:
+            for result in crawl_and_extract(
+                start_url,
+                self.max_pages,
+                fetch_page=self.fetch_page,
+                parse_page=parse_page,
+                link_filter=link_filter,
+                frontier=frontier,
+                emitted=emitted,
+                completed_pages=completed_pages,
+                parse_window=parse_pool.max_pending if parse_pool else 1
+            ):
+                if self.link_graph is not None:
+                    self.link_graph.add_page(result.url, filter(link_filter, result.links))
+                yield result
+            # Kuyruk tükendi ve hiçbir sayfa geçici hatayla kaçmadıysa bağlantı kümesi eksiksizdir
+            if not frontier and self.fetch_failures == failures_before:
+                self.discovered_urls = frontier.seen
+        finally:
+            if parse_pool:
+                parse_pool.close()
+    
+    def _new_frontier(self):
+        """FRONTIER_STRATEGY'ye göre boş tarama kuyruğu"""
+        if FRONTIER_STRATEGY == 'priority':
+            return PriorityFrontier(scorer=self._url_scorer())
+        return CrawlFrontier(max_memory_urls=FRONTIER_MEMORY_LIMIT, spill_dir=FRONTIER_SPILL_DIR)
+    
+    def _frontier_factory(self):
+        """Checkpoint'ten kuyruğu aynı stratejiyle geri yükleyen fonksiyon"""
+        if FRONTIER_STRATEGY == 'priority':
+            return partial(PriorityFrontier.from_state, scorer=self._url_scorer())
+        return CrawlFrontier.from_state
+    
+    def _url_scorer(self) -> UrlScorer:
+        return UrlScorer(FRONTIER_PRIORITY_WEIGHTS, sitemap_priorities=self._load_sitemap_priorities())
+    
+    def _load_sitemap_priorities(self) -> Dict[str, Optional[float]]:
+        """Sitemap'teki URL'lerin <priority> değerleri (bir kez okunur)"""
+        if self.sitemap_priorities is None:
+            self.sitemap_priorities = {}
+            if FRONTIER_SITEMAP_PRIORITY:
+                domain = urlparse(self.base_url).netloc
+                sitemap_urls = self.robots.sitemaps(self.base_url) or [urljoin(self.base_url, '/sitemap.xml')]
+                for entry in SitemapReader(self._open_sitemap).iter_urls(sitemap_urls):
+                    if len(self.sitemap_priorities) >= FRONTIER_SITEMAP_MAX_URLS:
+                        break
+                    loc = canonicalize_url(entry.loc)
+                    if urlparse(loc).netloc == domain:
+                        self.sitemap_priorities[loc] = entry.priority
+                logger.info(f"Tarama önceliği için sitemap'ten {len(self.sitemap_priorities)} URL okundu")
+        return self.sitemap_priorities
+    
     def discover_pages(self, start_url: str) -> List[str]:
         """Web sitesindeki sayfaları keşfeder"""
-        discovered_urls = set()
-        to_crawl = [start_url]
-        crawled = set()
+        return [result.url for result in self.crawl_pages(start_url)]
+    
+    def _open_sitemap(self, url: str):
+        """Sitemap'i hız sınırına uyarak akış halinde açar"""
+        self.rate_limiter.wait(urlparse(url).netloc)
+        return open_requests_stream(self.http, url, timeout=REQUEST_TIMEOUT)
+    
+    def discover_urls(self, since: Optional[datetime] = None) -> Optional[List[str]]:
+        """URL'leri sitemap'ten keşfeder; sitemap'te URL yoksa None döner
         
-        domain = urlparse(start_url).netloc
+        robots.txt'deki Sitemap: satırları (yoksa /sitemap.xml) ve sitemap
+        index'leri akış halinde okunur. since verilirse lastmod'u bu tarihten
+        eski olan URL'ler değişmemiş sayılıp atlanır. None dönerse çağıran
+        iter_website_data ile taramalıdır: keşif ve içerik aynı indirmeden
+        çıkar, sayfalar iki kez indirilmez.
+        """
+        domain = urlparse(self.base_url).netloc
+        sitemap_urls = self.robots.sitemaps(self.base_url) or [urljoin(self.base_url, '/sitemap.xml')]
+        reader = SitemapReader(self._open_sitemap)
         
-        while to_crawl and len(discovered_urls) < self.max_pages:
-            current_url = to_crawl.pop(0)
-            
-            if current_url in crawled:
+        seen = UrlSeenIndex()
+        urls = []
+        skipped = 0
+        truncated = False
+        self.discovered_urls = None
+        for entry in reader.iter_urls(sitemap_urls):
+            if len(urls) >= self.max_pages:
+                truncated = True
+                break
+            loc = canonicalize_url(entry.loc)
+            if not self._is_crawlable_link(loc, domain) or not seen.add(loc):
+                continue
+            if since and entry.lastmod and entry.lastmod < since:
+                skipped += 1
+                continue
+            urls.append(loc)
+            if entry.lastmod:
+                self.sitemap_lastmods[loc] = entry.lastmod
+        
+        if skipped:
+            logger.info(f"lastmod'a göre değişmemiş {skipped} URL atlandı")
+        if not urls and not skipped:
+            logger.info("Sitemap'te URL bulunamadı, bağlantı taramasına geçiliyor")
+            self.sitemap_priorities = self.sitemap_priorities or {}  # Sitemap tekrar okunmasın
+            return None
+        
+        if reader.complete and not truncated:
+            self.discovered_urls = seen
+        logger.info(f"Sitemap'ten {len(urls)} URL keşfedildi")
+        return urls
+    
+    def _cached_if_unchanged(self, url: str) -> Optional[CacheEntry]:
+        """Sitemap lastmod'u son indirmeden eskiyse önbellekteki kaydı döndürür"""
+        lastmod = self.sitemap_lastmods.get(url)
+        if not self.http_cache or not lastmod:
+            return None
+        entry = self.http_cache.lookup(url)
+        if entry and entry.fetched_at >= lastmod.timestamp():
+            return entry
+        return None
+    
+    def extract_content_from_urls(self, urls: List[str]) -> List[Dict]:
+        """Verilen URL listesinden içerik çıkarır"""
+        return list(self.iter_content_from_urls(urls))
+    
+    def iter_content_from_urls(self, urls: List[str]) -> Iterator[Dict]:
+        """Verilen URL listesinden içerik çıkarır; kayıtları tamamlandıkça üretir
+        
+        Sitemap'e göre değişmemiş sayfalar istek gönderilmeden önbellekten alınır.
+        Aynı canonical URL'i bildiren sayfalardan yalnızca ilki tutulur.
+        """
+        domain = urlparse(self.base_url).netloc
+        emitted = UrlSeenIndex()
+        extracted_count = 0
+        reused = 0
+        duplicates = 0
+        for url in tqdm(urls, desc="Sayfalar işleniyor"):
+            entry = self._cached_if_unchanged(url)
+            if entry:
+                page_data = entry.record
+                reused += 1
+            else:
+                page_data = self.get_page_content(url)
+            if not page_data:
                 continue
-                
-            crawled.add(current_url)
-            logger.info(f"Sayfa keşfediliyor: {current_url}")
             
-            try:
-                response = self.session.get(current_url, timeout=TIMEOUT)
-                response.raise_for_status()
-                
-                soup = BeautifulSoup(response.content, 'html.parser')
-                discovered_urls.add(current_url)
-                
-                # Aynı domain'deki bağlantıları bul
-                for link in soup.find_all('a', href=True):
-                    href = link['href']
-                    absolute_url = urljoin(current_url, href)
-                    parsed_url = urlparse(absolute_url)
-                    
-                    # Aynı domain ve desteklenen formatlar
-                    if (parsed_url.netloc == domain and 
-                        absolute_url not in crawled and 
-                        absolute_url not in to_crawl and
-                        len(discovered_urls) < self.max_pages):
-                        
-                        # PDF, dosya indirme linklerini filtrele
-                        if not any(absolute_url.lower().endswith(ext) 
-                                 for ext in ['.pdf', '.doc', '.zip', '.jpg', '.png']):
-                            to_crawl.append(absolute_url)
-                
-                time.sleep(REQUEST_DELAY)
-                
-            except Exception as e:
-                logger.error(f"Sayfa keşif hatası {current_url}: {str(e)}")
+            page_url = resolve_page_url(canonicalize_url(url), page_data.get('canonical_url'),
+                                        link_filter=lambda link: self._is_crawlable_link(link, domain))
+            if not emitted.add(page_url):
+                duplicates += 1
                 continue
+            page_data['url'] = page_url
+            extracted_count += 1
+            yield page_data
         
-        return list(discovered_urls)
+        logger.info(f"{extracted_count} sayfa başarıyla işlendi ({reused} sayfa lastmod'a göre önbellekten, "
+                    f"{duplicates} kopya sayfa atlandı)")
+        self._log_cache_stats()
+    
+    def checkpoint_for(self, start_url: str) -> CrawlCheckpoint:
+        """Başlangıç URL'ine özel checkpoint dosyaları"""
+        name = re.sub(r'[^A-Za-z0-9._-]+', '_', urlparse(start_url).netloc) or 'crawl'
+        return CrawlCheckpoint(CHECKPOINT_DIR / f"crawl_{name}.json", CHECKPOINT_INTERVAL)
     
-    def extract_website_data(self, start_url: str) -> List[Dict]:
+    def extract_website_data(self, start_url: str, resume: bool = False,
+                             checkpoint: bool = None) -> List[Dict]:
         """Tüm web sitesi verilerini çıkarır"""
+        return list(self.iter_website_data(start_url, resume, checkpoint))
+    
+    def iter_website_data(self, start_url: str, resume: bool = False,
+                          checkpoint: bool = None) -> Iterator[Dict]:
+        """Web sitesini tarar; sayfa kayıtlarını tamamlandıkça üretir
+        
+        checkpoint=True (varsayılan CHECKPOINT_ENABLED) ya da resume=True ise
+        ilerleme CHECKPOINT_INTERVAL sayfada bir diske yazılır; resume=True ise
+        yarıda kalan tarama tamamlanmış sayfalar yeniden indirilmeden sürdürülür.
+        """
         logger.info(f"Web sitesi veri çıkarma başlıyor: {start_url}")
         
-        # Sayfaları keşfet
-        urls = self.discover_pages(start_url)
-        logger.info(f"{len(urls)} sayfa keşfedildi")
+        checkpointing = resume or (CHECKPOINT_ENABLED if checkpoint is None else checkpoint)
+        checkpoint = self.checkpoint_for(start_url) if checkpointing else None
+        state = checkpoint.load(start_url, FRONTIER_MEMORY_LIMIT, FRONTIER_SPILL_DIR,
+                                self._frontier_factory()) if resume else None
+        if resume and state is None:
+            logger.info("Devam edilecek checkpoint bulunamadı, tarama baştan başlıyor")
+        if state and self.link_graph is not None:
+            # Geri yüklenen kayıtlarda bağlantı yok: graf checkpoint'ten sürdürülür, yoksa analiz atlanır
+            self.link_graph = state['link_graph']
+            if self.link_graph is None:
+                logger.warning("Checkpoint'te bağlantı grafı yok, iç bağlantı analizi yapılmayacak")
         
-        # Her sayfadan veri çıkar
-        extracted_data = []
-        for url in tqdm(urls, desc="Sayfalar işleniyor"):
-            page_data = self.get_page_content(url)
-            if page_data:
-                extracted_data.append(page_data)
+        extracted_count = 0
+        if state:
+            # Checkpoint'teki kayıtlar önce, dosyadan akış halinde verilir
+            for record in checkpoint.iter_saved_records():
+                extracted_count += 1
+                yield record
+        if checkpoint:
+            checkpoint.open(resume=state is not None)
+        completed_pages = state['completed_pages'] if state else 0
+        frontier = state['frontier'] if state else self._new_frontier()
+        emitted = state['emitted'] if state else UrlSeenIndex()
+        
+        # Keşif ve içerik çıkarma aynı indirme üzerinden yapılır
+        results = self.crawl_pages(start_url, frontier, emitted, completed_pages)
+        try:
+            for result in tqdm(results, total=self.max_pages, initial=completed_pages,
+                               desc="Sayfalar işleniyor"):
+                completed_pages += 1
+                if checkpoint:
+                    checkpoint.record_page(result.record)
+                    checkpoint.maybe_save(start_url, frontier, emitted, completed_pages, self.link_graph)
+                if result.record:
+                    extracted_count += 1
+                    yield result.record
+        except BaseException:
+            # Kesinti (hata, Ctrl+C): o ana kadarki ilerlemeyi kaydet
+            if checkpoint:
+                checkpoint.save(start_url, frontier, emitted, completed_pages, self.link_graph)
+                checkpoint.close()
+                logger.info("Tarama yarıda kaldı; --resume ile devam edilebilir")
+            raise
+        
+        if checkpoint:
+            checkpoint.clear()
+        frontier.close()
+        logger.info(f"{extracted_count} sayfa başarıyla işlendi")
+        self._log_cache_stats()
+    
+    def iter_website_data_sharded(self, start_url: str, num_shards: int = None) -> Iterator[Dict]:
+        """Parçalı taramayı Cloud Function akışıyla aynı adımlarla tek süreçte çalıştırır
+        
+        İş öğeleri süreç içi Pub/Sub'dan teslim edilir, durum SHARD_STATE_DIR'de
+        tutulur; kayıtlar parça çıktıları birleştirilerek üretilir.
+        """
+        num_shards = num_shards or CRAWL_SHARDS
+        logger.info(f"Parçalı veri çıkarma başlıyor: {start_url} ({num_shards} parça)")
+        
+        bus = InProcessPubSub()
+        topic_path = bus.topic_path(GCP_PROJECT_ID, 'ai-overview-pipeline')
+        crawl = ShardedCrawl(
+            LocalObjectStore(SHARD_STATE_DIR),
+            lambda message: bus.publish(topic_path, json.dumps(message).encode('utf-8'), step=message['step']),
+            self.fetch_page,
+            self._parse_and_cache,
+            link_filter=self.url_filter.allows,
+            max_urls_per_shard=SHARD_MAX_URLS
+        )
+        
+        def on_message(cloud_event):
+            message = decode_cloud_event(cloud_event)
+            # Birleştirme adımı atlanır: kayıtlar dosyaya değil çağırana akar
+            if message['step'] != STEP_MERGE_SHARDS:
+                crawl.handle(message)
+        
+        bus.subscribe(on_message)
+        self._apply_crawl_delay(start_url)
+        crawl_id = crawl.start(start_url, self.max_pages, num_shards, output='')
+        bus.run()
+        
+        extracted_count = 0
+        for record in crawl.iter_merged_records(crawl_id):
+            extracted_count += 1
+            yield record
+        crawl.cleanup(crawl_id)
+        
+        logger.info(f"{extracted_count} sayfa başarıyla işlendi ({bus.delivered} iş öğesi)")
+        self._log_cache_stats()
+    
+    def _log_cache_stats(self):
+        if self.http_cache:
+            logger.info(f"HTTP önbellek istatistikleri: {self.http_cache.stats}")
+        logger.info(f"Atlanan yanıtlar: {self.response_gate.stats}")
+        if self.circuit_breaker.stats['opened']:
+            logger.info(f"Devre kesici: {self.circuit_breaker.stats}")
+    
+    def extract_website_data_async(self, start_url: str, max_concurrency: int = None,
+                                   per_host_concurrency: int = None, adaptive: bool = None) -> List[Dict]:
+        """Web sitesi verilerini asyncio ile, her sayfayı bir kez indirerek çıkarır
+        
+        adaptive=True (varsayılan ASYNC_ADAPTIVE_CONCURRENCY) ise host başına
+        eşzamanlılık per_host_concurrency'den başlar ve AIMD ile uyarlanır;
+        kararlar self.crawl_stats'a yazılır.
+        """
+        per_host_concurrency = per_host_concurrency or ASYNC_PER_HOST_CONCURRENCY
+        adaptive = ASYNC_ADAPTIVE_CONCURRENCY if adaptive is None else adaptive
+        host_concurrency = None
+        if adaptive:
+            host_concurrency = AimdHostConcurrency(
+                initial=per_host_concurrency,
+                max_limit=max(per_host_concurrency, ASYNC_PER_HOST_MAX_CONCURRENCY),
+                decrease_factor=AIMD_DECREASE_FACTOR,
+                latency_factor=AIMD_LATENCY_FACTOR
+            )
+        crawler = AsyncCrawler(
+            max_concurrency=max_concurrency or ASYNC_MAX_CONCURRENCY,
+            per_host_concurrency=per_host_concurrency,
+            rate_limiter=self.rate_limiter,
+            timeout=REQUEST_TIMEOUT,
+            headers=dict(self.session.headers),
+            default_retry_after=REQUEST_DELAY,
+            http_cache=self.http_cache,
+            response_gate=self.response_gate,
+            circuit_breaker=self.circuit_breaker,
+            host_concurrency=host_concurrency
+        )
+        # Sadece başlangıç domain'i taranır; Crawl-delay baştan uygulanır
+        self._apply_crawl_delay(start_url)
+        
+        logger.info(f"Async veri çıkarma başlıyor: {start_url} "
+                    f"(global: {crawler.max_concurrency}, host başına: {crawler.per_host_concurrency})")
+        
+        domain = urlparse(start_url).netloc
+        parse_pool = self._open_parse_pool()
+        try:
+            # Havuz varsa parse event loop'u bloklamadan ayrı işlemlerde yapılır
+            async def parse_in_pool(url, html):
+                return await parse_pool.async_parse(url, html, self._boilerplate_template(html))
+            
+            extracted_data = crawler.crawl(
+                start_url,
+                self.max_pages,
+                page_handler=parse_in_pool if parse_pool else self._parse_page,
+                link_filter=lambda link: self._is_crawlable_link(link, domain),
+                link_graph=self.link_graph
+            )
+        finally:
+            if parse_pool:
+                parse_pool.close()
+        
+        if host_concurrency:
+            self.crawl_stats['host_concurrency'] = host_concurrency.stats
+            self.crawl_stats['concurrency_decisions'] = host_concurrency.decisions
+            for host, stats in host_concurrency.stats.items():
+                logger.info(f"Host eşzamanlılığı {host}: son {stats['limit']}, en yüksek {stats['peak']} "
+                            f"({stats['increases']} artış, {stats['decreases']} azaltma, "
+                            f"ort. gecikme {stats['latency_avg']} sn)")
         
         logger.info(f"{len(extracted_data)} sayfa başarıyla işlendi")
+        self._log_cache_stats()
         return extracted_data
     
-    def save_raw_data(self, data: List[Dict], filename: str = None):
-        """Ham veriyi dosyaya kaydet"""
+    def save_raw_data(self, data: Iterable[Dict], filename: str = None,
+                      compression: Optional[str] = RAW_DATA_COMPRESSION):
+        """Ham veriyi JSONL olarak kaydeder
+        
+        data bir iterator olabilir: kayıtlar üretildikçe diske yazılır, bellekte
+        biriktirilmez. Dosya adı .gz / .zst ile bitiyorsa o biçim, bitmiyorsa
+        compression ('gzip', 'zstd' ya da None) kullanılır.
+        """
         if not filename:
             timestamp = time.strftime('%Y%m%d_%H%M%S')
-            filename = f"raw_website_data_{timestamp}.json"
+            filename = f"raw_website_data_{timestamp}.jsonl"
+        if not codec_for_name(filename):
+            filename = with_codec_suffix(filename, compression)
         
         filepath = RAW_DATA_DIR / filename
-        filepath.parent.mkdir(parents=True, exist_ok=True)
-        
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        with open_jsonl_writer(filepath) as writer:
+            writer.write_all(data)
         
-        logger.info(f"Ham veri kaydedildi: {filepath}")
+        logger.info(f"Ham veri kaydedildi: {filepath} ({writer.count} kayıt)")
         return filepath
 
+    def save_link_graph(self, filename: str = None) -> Optional[Path]:
+        """Bağlantı grafını (.npz) ve iç bağlantı analizini (.json) kaydeder; analiz dosyasını döndürür
+        
+        Graf yalnızca bağlantı taramasında (senkron ya da async) toplanır.
+        """
+        if not self.link_graph or not self.link_graph.num_nodes:
+            return None
+        if not filename:
+            filename = f"link_graph_{time.strftime('%Y%m%d_%H%M%S')}"
+        
+        graph_path = PROCESSED_DATA_DIR / f"{filename}.npz"
+        try:
+            self.link_graph.save(graph_path)
+            analysis = self.link_graph.analyze(LINK_GRAPH_TOP_N, LINK_GRAPH_WEAK_IN_LINKS)
+        except ImportError as e:
+            logger.warning(f"Bağlantı grafı kaydedilemedi: {str(e)}")
+            return None
+        
+        analysis_path = graph_path.with_suffix('.json')
+        with open(analysis_path, 'w', encoding='utf-8') as f:
+            json.dump(analysis, f, ensure_ascii=False, indent=2)
+        logger.info(f"İç bağlantı analizi kaydedildi: {analysis_path} ({analysis['pages_crawled']} sayfa, "
+                    f"{analysis['internal_links']} bağlantı, {analysis['orphan_count']} yetim, "
+                    f"{analysis['weakly_linked_count']} zayıf bağlantılı sayfa)")
+        return analysis_path
+
 def main():
     """Ana fonksiyon - komut satırından çalıştırma"""
     import argparse
@@ -198,24 +643,69 @@ def main():
     parser.add_argument('--url', required=True, help='Hedef web sitesi URL')
     parser.add_argument('--max-pages', type=int, default=100, help='Maksimum sayfa sayısı')
     parser.add_argument('--output', help='Çıktı dosya adı')
+    parser.add_argument('--async', dest='use_async', action='store_true', help='Asyncio tarama modunu kullan')
+    parser.add_argument('--concurrency', type=int, help=f'Global eşzamanlı istek sayısı (varsayılan: {ASYNC_MAX_CONCURRENCY})')
+    parser.add_argument('--per-host', type=int, help=f'Host başına eşzamanlı istek sayısı (varsayılan: {ASYNC_PER_HOST_CONCURRENCY})')
+    parser.add_argument('--fixed-concurrency', action='store_true',
+                        help='Host başına eşzamanlılığı uyarlama (AIMD), --per-host değerinde sabit tut')
+    parser.add_argument('--no-cache', action='store_true', help='HTTP önbelleğini kullanma (tüm sayfaları yeniden indir)')
+    parser.add_argument('--parser', choices=list(PARSER_BACKENDS), help=f'HTML parser backend (varsayılan: {HTML_PARSER_BACKEND})')
+    parser.add_argument('--parse-workers', type=int, help='Parse işlem sayısı (0: CPU çekirdeği sayısı, 1: havuz yok)')
+    parser.add_argument('--sitemap', action='store_true', help='URL\'leri sitemap\'ten keşfet (bağlantı taraması yerine)')
+    parser.add_argument('--since', help='Sitemap modunda lastmod\'u bu tarihten (YYYY-MM-DD) eski URL\'leri atla')
+    parser.add_argument('--no-checkpoint', action='store_true',
+                        help='İlerlemeyi diske yazma (yarıda kalan tarama --resume ile sürdürülemez)')
+    parser.add_argument('--resume', action='store_true', help='Yarıda kalan taramaya checkpoint\'ten devam et')
+    parser.add_argument('--shards', type=int, default=CRAWL_SHARDS,
+                        help=f'Parçalı tarama: frontier\'ı N parçaya böl (varsayılan: {CRAWL_SHARDS})')
+    parser.add_argument('--compress', choices=[*CODEC_SUFFIXES, 'none'], default=RAW_DATA_COMPRESSION or 'none',
+                        help=f'Çıktı sıkıştırması (varsayılan: {RAW_DATA_COMPRESSION or "none"})')
     
     args = parser.parse_args()
     
     # Veri çıkarma
-    extractor = WebsiteDataExtractor(args.url, args.max_pages)
-    data = extractor.extract_website_data(args.url)
+    extractor = WebsiteDataExtractor(args.url, args.max_pages, use_cache=not args.no_cache,
+                                     parser_backend=args.parser, parse_workers=args.parse_workers)
+    if args.resume and (args.sitemap or args.use_async or args.shards > 1):
+        logger.warning("--resume yalnızca senkron bağlantı taramasında desteklenir, yok sayılıyor")
+    if args.sitemap:
+        since = parse_lastmod(args.since) if args.since else None
+        urls = extractor.discover_urls(since)
+        if urls is None:
+            records = extractor.iter_website_data(args.url)
+        else:
+            records = extractor.iter_content_from_urls(urls)
+    elif args.use_async:
+        records = extractor.extract_website_data_async(args.url, args.concurrency, args.per_host,
+                                                       adaptive=False if args.fixed_concurrency else None)
+    elif args.shards > 1:
+        records = extractor.iter_website_data_sharded(args.url, args.shards)
+    else:
+        records = extractor.iter_website_data(args.url, resume=args.resume, checkpoint=False if args.no_checkpoint else None)
+    
+    # Özet istatistikler kayıtlar diske akarken toplanır
+    totals = {'pages': 0, 'words': 0}
+    
+    def counted(items):
+        for item in items:
+            totals['pages'] += 1
+            totals['words'] += item['word_count']
+            yield item
     
     # Kaydetme
-    output_file = extractor.save_raw_data(data, args.output)
+    compression = None if args.compress == 'none' else args.compress
+    output_file = extractor.save_raw_data(counted(records), args.output, compression)
+    link_analysis_file = extractor.save_link_graph()
     
     print(f"\n✅ Veri çıkarma tamamlandı!")
-    print(f"📊 İşlenen sayfa sayısı: {len(data)}")
+    print(f"📊 İşlenen sayfa sayısı: {totals['pages']}")
     print(f"💾 Çıktı dosyası: {output_file}")
+    if link_analysis_file:
+        print(f"🔗 İç bağlantı analizi: {link_analysis_file}")
     
-    # Özet istatistikler
-    total_words = sum(item['word_count'] for item in data)
+    total_words = totals['words']
     print(f"📝 Toplam kelime sayısı: {total_words:,}")
-    print(f"📄 Ortalama sayfa uzunluğu: {total_words // len(data) if data else 0} kelime")
+    print(f"📄 Ortalama sayfa uzunluğu: {total_words // totals['pages'] if totals['pages'] else 0} kelime")
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
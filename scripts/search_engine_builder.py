@@ -17,6 +17,7 @@ try:
     from google.cloud import discoveryengine
     from google.cloud import storage
     from google.auth import default
+    from google.api_core import exceptions as gcp_exceptions
 except ImportError as e:
     print("❌ Google Cloud kütüphaneleri bulunamadı. Lütfen requirements.txt'i yükleyin:")
     print("pip install -r requirements.txt")
@@ -37,6 +38,8 @@ except ImportError as e:
 # Proje kök dizinini sys.path'e ekle
 sys.path.append(str(Path(__file__).parent.parent))
 from config.settings import *
+from scripts.common.compression import import_object_name, upload_for_import
+from scripts.common.content_manifest import document_id
 
 # Loglama konfigürasyonu
 logging.basicConfig(level=LOG_LEVEL, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -86,13 +89,13 @@ class SearchEngineBuilder:
                 
                 # Dosyayı Cloud Storage'a yükle
                 bucket_name = STORAGE_BUCKET_NAME
-                blob_name = f"{STORAGE_BATCH_PREFIX}/{batch_file.name}"
+                blob_name = f"{STORAGE_BATCH_PREFIX}/{import_object_name(batch_file)}"
                 
                 bucket = self.storage_client.bucket(bucket_name)
                 blob = bucket.blob(blob_name)
                 
                 if not blob.exists():
-                    blob.upload_from_filename(str(batch_file))
+                    upload_for_import(blob, batch_file, gzip_encoding=VERTEX_UPLOAD_GZIP)
                     logger.info(f"Dosya yüklendi: gs://{bucket_name}/{blob_name}")
                 
                 # Import işlemi için request oluştur
@@ -122,6 +125,27 @@ class SearchEngineBuilder:
             logger.error(f"❌ Doküman import hatası: {str(e)}")
             return False
     
+    def delete_documents_from_datastore(self, data_store_id: str, urls: List[str]) -> bool:
+        """Silinen sayfaların dokümanlarını data store'dan siler (kimlik URL'den türetilir)"""
+        logger.info(f"{len(urls)} doküman data store'dan siliniyor: {data_store_id}")
+        
+        parent = f"projects/{self.project_id}/locations/{self.location}/collections/default_collection/dataStores/{data_store_id}/branches/default_branch"
+        failed = 0
+        for url in urls:
+            try:
+                self.document_client.delete_document(name=f"{parent}/documents/{document_id(url)}")
+            except gcp_exceptions.NotFound:
+                logger.info(f"Doküman zaten yok: {url}")
+            except Exception as e:
+                failed += 1
+                logger.error(f"Doküman silinemedi {url}: {str(e)}")
+        
+        if failed:
+            logger.error(f"❌ {failed} doküman silinemedi")
+            return False
+        logger.info(f"✅ {len(urls)} doküman silindi")
+        return True
+    
     def search_documents(self, engine_id: str, query: str, max_results: int = 10) -> List[Dict]:
         """Arama motoru üzerinde arama yapar"""
         logger.info(f"Arama yapılıyor: '{query}' (max {max_results} sonuç)")
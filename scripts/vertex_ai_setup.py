@@ -25,6 +25,7 @@ except ImportError as e:
 # Proje kök dizinini sys.path'e ekle
 sys.path.append(str(Path(__file__).parent.parent))
 from config.settings import *
+from scripts.common.compression import import_object_name, upload_for_import
 
 # Loglama konfigürasyonu
 logging.basicConfig(level=LOG_LEVEL, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -124,7 +125,7 @@ class VertexAISetup:
     def upload_batch_to_storage(self, batch_file: Path) -> Optional[str]:
         """Batch dosyasını Cloud Storage'a yükler"""
         bucket_name = STORAGE_BUCKET_NAME
-        blob_name = f"{STORAGE_BATCH_PREFIX}/{batch_file.name}"
+        blob_name = f"{STORAGE_BATCH_PREFIX}/{import_object_name(batch_file)}"
         
         logger.info(f"Dosya Cloud Storage'a yükleniyor: {batch_file.name}")
         
@@ -132,7 +133,7 @@ class VertexAISetup:
             bucket = self.storage_client.bucket(bucket_name)
             blob = bucket.blob(blob_name)
             
-            blob.upload_from_filename(str(batch_file))
+            upload_for_import(blob, batch_file, gzip_encoding=VERTEX_UPLOAD_GZIP)
             
             # Public URL oluştur
             public_url = f"gs://{bucket_name}/{blob_name}"